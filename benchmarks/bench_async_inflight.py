@@ -0,0 +1,41 @@
+import asyncio
+import logging
+import sys
+import threading
+from time import perf_counter
+
+from clients import OpenAIMockClient
+from models.openai import OpenAIRequest
+from utils.config import LLMConfig
+from utils.latency import LatencyDistribution, LatencyProfile
+
+IN_FLIGHT = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+TIME_TO_FIRST_TOKEN = 1.0
+
+REQUEST = OpenAIRequest(
+    messages=[{"role": "user", "content": "Hello!"}],
+    model="gpt-4o",
+    max_tokens=42
+)
+
+
+async def main():
+    profile = LatencyProfile(
+        time_to_first_token=LatencyDistribution(value=TIME_TO_FIRST_TOKEN),
+        time_per_token=LatencyDistribution(kind="lognormal", mu=-6, sigma=0.5)
+    )
+    config = LLMConfig(api_key="sk-key", model=REQUEST.model, latency={"*": profile})
+    client = OpenAIMockClient(config, logging.WARNING)
+
+    start = perf_counter()
+    responses = await asyncio.gather(*(client.aget_response(REQUEST) for _ in range(IN_FLIGHT)))
+    elapsed = perf_counter() - start
+
+    print(f"in-flight requests:  {len(responses)}")
+    print(f"threads:             {threading.active_count()}")
+    print(f"wall time:           {elapsed:.2f} s (time to first token {TIME_TO_FIRST_TOKEN:.2f} s)")
+    print(f"throughput:          {len(responses) / elapsed:.0f} requests/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
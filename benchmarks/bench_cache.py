@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import json
+from timeit import Timer
+
+import httpx
+
+import app as server
+from cache import ResponseCache
+
+CASES = {
+    "openai": ("/chat/completions", "gpt-4o"),
+    "anthropic": ("/claude/completions", "claude-3-5-sonnet-20241022"),
+    "embeddings": ("/embeddings", "text-embedding-3-small"),
+}
+
+
+def body(provider: str, model: str, messages: int) -> bytes:
+    if provider == "embeddings":
+        return json.dumps({
+            "model": model,
+            "input": [f"Document {i} of a large collection about mock servers." for i in range(messages)],
+            "encoding_format": "base64",
+        }).encode()
+    roles = ("user", "assistant")
+    return json.dumps({
+        "model": model,
+        "max_tokens": 16,
+        "messages": [
+            {"role": roles[i % 2], "content": f"Message {i} of a long conversation about mock servers."}
+            for i in range(messages)
+        ],
+    }).encode()
+
+
+def measure(fn, repeat: int) -> float:
+    timer = Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def report(name: str, messages: int, seconds: float, baseline: float) -> None:
+    print(f"{name:<16} {messages:>6} inputs {seconds * 1e6:12.1f} us {baseline / seconds:8.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare repeated requests with and without the response cache.")
+    parser.add_argument("--messages", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://benchmark")
+    headers = {"Content-Type": "application/json"}
+    server.cache = ResponseCache()
+
+    def post(url: str, content: bytes, cached: bool):
+        server.settings.response_cache = cached
+        loop.run_until_complete(client.post(url, content=content, headers=headers)).raise_for_status()
+
+    for provider, (url, model) in CASES.items():
+        print(f"{provider}:")
+        for messages in args.messages:
+            content = body(provider, model, messages)
+            computed = measure(lambda: post(url, content, False), args.repeat)
+            report("computed", messages, computed, computed)
+            report("cached", messages, measure(lambda: post(url, content, True), args.repeat), computed)
+    server.settings.response_cache = False
+    loop.run_until_complete(client.aclose())
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
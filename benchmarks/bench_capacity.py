@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+from statistics import quantiles
+from time import perf_counter
+
+import httpx
+
+import app as server
+from scheduler import BatchScheduler, Capacity
+from utils.latency import LatencyDistribution, LatencyProfile
+
+MODEL = "gpt-4"
+
+
+async def user(client: httpx.AsyncClient, body: dict, deadline: float, latencies: list, rejected: list) -> None:
+    while perf_counter() < deadline:
+        started = perf_counter()
+        response = await client.post("/chat/completions", json=body)
+        if response.status_code == 529:
+            rejected.append(1)
+            await asyncio.sleep(0.01)
+        else:
+            response.raise_for_status()
+            latencies.append(perf_counter() - started)
+
+
+async def run(concurrency: int, duration: float, body: dict):
+    latencies, rejected = [], []
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        deadline = perf_counter() + duration
+        await asyncio.gather(*(user(client, body, deadline, latencies, rejected) for _ in range(concurrency)))
+    return latencies, len(rejected)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Latency and throughput of a simulated continuous batch under load.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--max-queue", type=int, default=16)
+    parser.add_argument("--batch-slowdown", type=float, default=0.1)
+    parser.add_argument("--time-to-first-token", type=float, default=0.05)
+    parser.add_argument("--time-per-token", type=float, default=0.005)
+    parser.add_argument("--max-tokens", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+
+    client = server.registry.get("openai", MODEL)
+    client.scheduler = BatchScheduler(
+        Capacity(slots=args.slots, max_queue=args.max_queue, batch_slowdown=args.batch_slowdown)
+    )
+    client.latency = LatencyProfile(
+        time_to_first_token=LatencyDistribution(value=args.time_to_first_token),
+        time_per_token=LatencyDistribution(value=args.time_per_token),
+    )
+    body = {"model": MODEL, "max_tokens": args.max_tokens, "messages": [{"role": "user", "content": "Hello!"}]}
+    print(f"{args.slots} slots, queue of {args.max_queue}, slowdown {args.batch_slowdown} per extra sequence")
+    for concurrency in args.concurrency:
+        latencies, rejected = asyncio.run(run(concurrency, args.duration, body))
+        p50, p95 = (quantiles(latencies, n=20)[i] for i in (9, 18)) if len(latencies) > 1 else (0.0, 0.0)
+        print(
+            f"{concurrency:>4} users {len(latencies) / args.duration:8.1f} req/s {rejected / args.duration:8.1f} 529/s "
+            f"p50 {p50 * 1000:8.1f} ms p95 {p95 * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import logging
+from time import perf_counter
+
+from clients import ClientRegistry, OpenAIMockClient
+from models.openai import OpenAIRequest
+from utils.config import LLMConfig
+
+ITERATIONS = 5000
+LOG_LEVEL = logging.WARNING
+
+REQUEST = OpenAIRequest(
+    messages=[{"role": "user", "content": "Hello!"}],
+    model="gpt-4o",
+    max_tokens=42
+)
+
+
+def per_request_client():
+    config = LLMConfig(api_key="sk-key", model=REQUEST.model)
+    client = OpenAIMockClient(config=config, log_level=LOG_LEVEL)
+    return client.get_response(REQUEST)
+
+
+def registry_client(registry):
+    return registry.get("openai", REQUEST.model).get_response(REQUEST)
+
+
+def measure(name, fn, *args):
+    start = perf_counter()
+    for _ in range(ITERATIONS):
+        fn(*args)
+    elapsed = perf_counter() - start
+    print(f"{name:<20} {elapsed / ITERATIONS * 1e6:10.2f} us/request")
+    return elapsed
+
+
+if __name__ == "__main__":
+    registry = ClientRegistry(log_level=LOG_LEVEL)
+    before = measure("per-request client", per_request_client)
+    after = measure("client registry", registry_client, registry)
+    print(f"speedup: {before / after:.2f}x")
@@ -0,0 +1,54 @@
+import gzip
+import json
+from time import perf_counter, process_time
+
+from fastapi.testclient import TestClient
+
+from app import app
+from middleware.compression import zstandard
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+ITERATIONS = 50
+
+
+def payload(size: int) -> bytes:
+    sentence = "Please summarise the following conversation for the quarterly report. "
+    messages, total = [], 0
+    while total < size:
+        content = sentence * 20
+        messages.append({"role": "user" if len(messages) % 2 == 0 else "assistant", "content": content})
+        total += len(content)
+    return json.dumps({"messages": messages, "model": "gpt-4o", "max_tokens": 42}).encode()
+
+
+def encoders():
+    yield "identity", lambda body: body
+    yield "gzip", lambda body: gzip.compress(body, compresslevel=6)
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=3)
+        yield "zstd", compressor.compress
+
+
+def measure(client: TestClient, body: bytes, encoding: str):
+    headers = {"Content-Type": "application/json", "Accept-Encoding": encoding}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    wall, cpu = perf_counter(), process_time()
+    for _ in range(ITERATIONS):
+        with client.stream("POST", "/chat/completions", content=body, headers=headers) as response:
+            response.read()
+            assert response.status_code == 200, response.text
+            downloaded = response.num_bytes_downloaded
+    return (perf_counter() - wall) / ITERATIONS, (process_time() - cpu) / ITERATIONS, downloaded
+
+
+if __name__ == "__main__":
+    client = TestClient(app)
+    print(f"{'payload':>10} {'encoding':>9} {'request B':>11} {'response B':>11} {'wall ms':>9} {'cpu ms':>8}")
+    for size in SIZES:
+        body = payload(size)
+        for encoding, compress in encoders():
+            compressed = compress(body)
+            wall, cpu, downloaded = measure(client, compressed, encoding)
+            print(f"{len(body):>10} {encoding:>9} {len(compressed):>11} {downloaded:>11} {wall * 1e3:>9.2f} "
+                  f"{cpu * 1e3:>8.2f}")
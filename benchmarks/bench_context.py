@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import json
+import tracemalloc
+from time import perf_counter
+
+import httpx
+
+import app as server
+from models.openai import OpenAIRequest
+
+MODEL = "gpt-4o"
+
+
+def profile(name: str, fn, input_size: int):
+    started = perf_counter()
+    result = fn()
+    elapsed = perf_counter() - started
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<34} {elapsed * 1000:9.1f} ms  peak {peak / 1e6:8.1f} MB  {peak / input_size:6.2f}x input  -> {result}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Peak memory and latency of counting a huge prompt.")
+    parser.add_argument("--tokens", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    text = "token " * args.tokens
+    body = json.dumps({"model": MODEL, "max_tokens": 16, "messages": [{"role": "user", "content": text}]}).encode()
+    request = OpenAIRequest.model_validate_json(body)
+    client = server.registry.get("openai", MODEL)
+    print(f"{args.tokens:,} tokens, {len(body) / 1e6:.1f} MB body, context window {client.context_window:,}")
+
+    profile("len(text.split())", lambda: len(text.split()), len(body))
+    profile("tokenizer.count", lambda: client.tokenizer.count(text), len(body))
+    profile("prompt_tokens", lambda: client.prompt_tokens(request), len(body))
+    profile("check_context (stops early)", lambda: client.check_context(request)[0], len(body))
+
+    loop = asyncio.new_event_loop()
+    http = httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://benchmark")
+    headers = {"Content-Type": "application/json"}
+    for fast in (False, True):
+        server.settings.fast_requests = fast
+        profile(
+            f"POST /chat/completions fast={fast}",
+            lambda: loop.run_until_complete(http.post("/chat/completions", content=body, headers=headers)).status_code,
+            len(body)
+        )
+    loop.run_until_complete(http.aclose())
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
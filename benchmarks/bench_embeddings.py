@@ -0,0 +1,39 @@
+import argparse
+import logging
+from time import perf_counter
+
+from clients import ClientRegistry
+from models.openai import OpenAIEmbeddingsRequest
+from utils.responses import ModelResponse
+
+
+def build_request(size: int, dimensions: int, encoding_format: str) -> OpenAIEmbeddingsRequest:
+    return OpenAIEmbeddingsRequest(
+        input=[f"Document number {i}, a short paragraph about nothing in particular." for i in range(size)],
+        model="text-embedding-3-small",
+        dimensions=dimensions,
+        encoding_format=encoding_format,
+    )
+
+
+def measure(client, request, rounds: int) -> float:
+    ModelResponse(client.get_response(request)).body
+    start = perf_counter()
+    for _ in range(rounds):
+        ModelResponse(client.get_response(request)).body
+    return (perf_counter() - start) / rounds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vectors per second of the embeddings client, encoded to JSON.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 16, 256, 2048])
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    client = ClientRegistry(log_level=logging.WARNING).get("embeddings", "text-embedding-3-small")
+    print(f"vectors: {args.dimensions} dimensions")
+    for encoding_format in ("float", "base64"):
+        for size in args.sizes:
+            elapsed = measure(client, build_request(size, args.dimensions, encoding_format), args.rounds)
+            print(f"{encoding_format:<7} {size:>6} inputs {elapsed * 1000:10.2f} ms {size / elapsed:>12,.0f} vectors/s")
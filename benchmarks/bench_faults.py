@@ -0,0 +1,26 @@
+from timeit import Timer
+
+from faults import FaultInjector, FaultRule
+
+RULE_COUNTS = [0, 10, 100]
+MODELS = [f"model-{i}" for i in range(100)]
+
+
+def injector(rules: int) -> FaultInjector:
+    return FaultInjector(
+        [FaultRule(kind="error", models=[MODELS[i]], api_keys=["sk-chaos"], percentage=1) for i in range(rules)],
+        seed=0
+    )
+
+
+def measure(name, fn):
+    timer = Timer(fn)
+    number, _ = timer.autorange()
+    print(f"{name:<40} {min(timer.repeat(5, number)) / number * 1e9:8.0f} ns/request")
+
+
+if __name__ == "__main__":
+    for rules in RULE_COUNTS:
+        faults = injector(rules)
+        measure(f"rules={rules} unmatched model", lambda: faults.choose("/chat/completions", "gpt-4o", "sk-key"))
+        measure(f"rules={rules} matched model", lambda: faults.choose("/chat/completions", "model-0", "sk-chaos"))
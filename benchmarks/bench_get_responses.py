@@ -0,0 +1,61 @@
+import argparse
+import logging
+from time import perf_counter
+
+from clients import ClientRegistry
+from models.anthropic import AnthropicRequest
+from models.openai import OpenAIRequest
+from utils.responses import ModelResponse
+
+MODELS = {"openai": "gpt-4", "anthropic": "claude-3-5-sonnet-20241022"}
+REQUEST_TYPES = {"openai": OpenAIRequest, "anthropic": AnthropicRequest}
+
+
+def build_requests(provider: str, size: int):
+    return [
+        REQUEST_TYPES[provider](
+            model=MODELS[provider],
+            messages=[
+                {"role": "user", "content": f"Question number {i}, asked again and again."},
+                {"role": "assistant", "content": "An answer the user did not like."},
+                {"role": "user", "content": "Please try once more."},
+            ],
+            max_tokens=64,
+        )
+        for i in range(size)
+    ]
+
+
+def individual(client, requests):
+    return [ModelResponse(client.get_response(request)).body for request in requests]
+
+
+def batched(client, requests):
+    return ModelResponse(client.get_responses(requests)).body
+
+
+def measure(name, client, requests, fn, rounds):
+    fn(client, requests)
+    start = perf_counter()
+    for _ in range(rounds):
+        fn(client, requests)
+    elapsed = (perf_counter() - start) / rounds
+    print(f"{name:<12} {len(requests):>6} requests {elapsed * 1000:10.2f} ms {len(requests) / elapsed:>12,.0f} req/s")
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare N get_response calls with one get_responses call.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    registry = ClientRegistry(log_level=logging.WARNING)
+    for provider, model in MODELS.items():
+        client = registry.get(provider, model)
+        print(f"{provider}:")
+        for size in args.sizes:
+            requests = build_requests(provider, size)
+            single = measure("individual", client, requests, individual, args.rounds)
+            bulk = measure("batched", client, requests, batched, args.rounds)
+            print(f"{'':<12} speedup {single / bulk:.2f}x")
@@ -0,0 +1,35 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from ratelimit import MemoryStore, RateLimit, RateLimiter, SharedMemoryStore
+
+KEYS = [10, 1_000, 50_000]
+ITERATIONS = 100_000
+THREADS = 8
+LIMIT = RateLimit(rpm=600, tpm=100_000)
+
+
+def hammer(limiter, keys, iterations):
+    for i in range(iterations):
+        limiter.acquire(f"sk-{i % keys}", "gpt-4o", LIMIT, 50)
+
+
+def measure(name, limiter, keys):
+    start = perf_counter()
+    with ThreadPoolExecutor(THREADS) as pool:
+        for _ in range(THREADS):
+            pool.submit(hammer, limiter, keys, ITERATIONS // THREADS)
+    elapsed = perf_counter() - start
+    print(f"{name:<8} keys={keys:<7} {elapsed / ITERATIONS * 1e6:8.2f} us/acquire")
+
+
+if __name__ == "__main__":
+    path = os.path.join(tempfile.gettempdir(), "bench_ratelimit")
+    for keys in KEYS:
+        measure("memory", RateLimiter(MemoryStore(max_keys_per_shard=1024)), keys)
+        store = SharedMemoryStore(path)
+        measure("shared", RateLimiter(store), keys)
+        store.close()
+        os.remove(path)
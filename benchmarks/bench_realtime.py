@@ -0,0 +1,95 @@
+import argparse
+import asyncio
+import json
+import resource
+import threading
+from time import perf_counter, sleep
+
+import uvicorn
+from websockets.asyncio.client import connect
+
+from app import app
+
+ITEM = json.dumps({
+    "type": "conversation.item.create",
+    "item": {"role": "user", "content": [{"type": "input_text", "text": "Hello there!"}]}
+})
+RESPONSE = json.dumps({"type": "response.create"})
+
+
+def raise_file_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+def serve(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning", ws_max_queue=32, backlog=4096))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        sleep(0.05)
+    return server
+
+
+async def session(url: str, rounds: int, handshakes: asyncio.Semaphore, opened: asyncio.Event, connected: list,
+                  received: list):
+    async with handshakes:
+        websocket = await connect(url, max_queue=32)
+        await websocket.recv()
+    connected.append(websocket)
+    try:
+        await opened.wait()
+        count = 0
+        for _ in range(rounds):
+            await websocket.send(ITEM)
+            await websocket.send(RESPONSE)
+            while True:
+                count += 1
+                if json.loads(await websocket.recv())["type"] == "response.done":
+                    break
+        received.append(count)
+    finally:
+        await websocket.close()
+
+
+async def main(url: str, connections: int, rounds: int, concurrency: int):
+    handshakes, opened, connected, received = asyncio.Semaphore(concurrency), asyncio.Event(), [], []
+
+    start = perf_counter()
+    tasks = [
+        asyncio.create_task(session(url, rounds, handshakes, opened, connected, received)) for _ in range(connections)
+    ]
+    while len(connected) < connections:
+        failed = [task for task in tasks if task.done()]
+        if failed:
+            raise failed[0].exception()
+        await asyncio.sleep(0.05)
+    connect_time = perf_counter() - start
+
+    start = perf_counter()
+    opened.set()
+    await asyncio.gather(*tasks)
+    elapsed = perf_counter() - start
+
+    messages = sum(received)
+    print(f"connections:         {len(connected)} open at once (opened in {connect_time:.2f} s)")
+    print(f"rounds per socket:   {rounds}")
+    print(f"server events:       {messages} in {elapsed:.2f} s")
+    print(f"message rate:        {messages / elapsed:,.0f} events/s, {connections * rounds / elapsed:,.0f} responses/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test of the realtime WebSocket endpoint.")
+    parser.add_argument("--url", help="A running server, e.g. ws://host:8000/v1/realtime?model=gpt-4o-realtime-preview")
+    parser.add_argument("--port", type=int, default=8765, help="Port of the in-process server started without --url.")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=200, help="Simultaneous handshakes.")
+    args = parser.parse_args()
+
+    print(f"file descriptor limit: {raise_file_limit()}")
+    url = args.url
+    if url is None:
+        serve(args.port)
+        url = f"ws://127.0.0.1:{args.port}/v1/realtime?model=gpt-4o-realtime-preview"
+    asyncio.run(main(url, args.connections, args.rounds, args.concurrency))
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import json
+from timeit import Timer
+
+import httpx
+
+import app as server
+from models.anthropic import AnthropicFastRequest, AnthropicRequest
+from models.openai import OpenAIFastRequest, OpenAIRequest
+from utils.responses import adapter
+
+CASES = {
+    "openai": ("/chat/completions", OpenAIRequest, OpenAIFastRequest, "gpt-4"),
+    "anthropic": ("/claude/completions", AnthropicRequest, AnthropicFastRequest, "claude-3-5-sonnet-20241022"),
+}
+
+
+def body(model: str, messages: int) -> bytes:
+    roles = ("user", "assistant")
+    return json.dumps({
+        "model": model,
+        "max_tokens": 16,
+        "messages": [
+            {"role": roles[i % 2], "content": f"Message {i} of a long conversation about mock servers."}
+            for i in range(messages)
+        ],
+    }).encode()
+
+
+def measure(fn, repeat: int) -> float:
+    timer = Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def report(name: str, messages: int, seconds: float, baseline: float) -> None:
+    print(f"{name:<28} {messages:>6} messages {seconds * 1e6:12.1f} us {baseline / seconds:8.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare FastAPI body parsing with one-pass fast request validation.")
+    parser.add_argument("--messages", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://benchmark")
+    headers = {"Content-Type": "application/json"}
+
+    def post(url: str, content: bytes, fast: bool):
+        server.settings.fast_requests = fast
+        loop.run_until_complete(client.post(url, content=content, headers=headers)).raise_for_status()
+
+    for provider, (url, model, fast_model, name) in CASES.items():
+        print(f"{provider}:")
+        for messages in args.messages:
+            content = body(name, messages)
+            parsed = measure(lambda: adapter(model).validate_python(json.loads(content)), args.repeat)
+            report("json.loads + validate", messages, parsed, parsed)
+            report("validate_json", messages, measure(lambda: adapter(model).validate_json(content), args.repeat),
+                   parsed)
+            report("validate_json, views", messages,
+                   measure(lambda: adapter(fast_model).validate_json(content), args.repeat), parsed)
+            endpoint = measure(lambda: post(url, content, False), args.repeat)
+            report("endpoint", messages, endpoint, endpoint)
+            report("endpoint, fast_requests", messages, measure(lambda: post(url, content, True), args.repeat),
+                   endpoint)
+    server.settings.fast_requests = False
+    loop.run_until_complete(client.aclose())
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
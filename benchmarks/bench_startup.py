@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+from time import perf_counter, sleep
+
+import httpx
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+BODY = {"messages": [{"role": "user", "content": "Hello!"}], "model": "gpt-4o", "max_tokens": 42}
+
+
+def in_process() -> None:
+    started = perf_counter()
+    import app as server
+    imported = perf_counter()
+    from fastapi.testclient import TestClient
+
+    with TestClient(server.app) as client:
+        ready = perf_counter()
+        client.post("/chat/completions", json=BODY).raise_for_status()
+        answered = perf_counter()
+        client.get("/openapi.json").raise_for_status()
+        documented = perf_counter()
+    print(json.dumps({
+        "import": imported - started,
+        "startup": ready - imported,
+        "first response": answered - ready,
+        "openapi": documented - answered,
+    }))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve(env: dict) -> float:
+    port = free_port()
+    started = perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"], cwd=SRC, env=env
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as http:
+            while True:
+                try:
+                    http.post("/chat/completions", json=BODY).raise_for_status()
+                    return perf_counter() - started
+                except httpx.TransportError:
+                    if process.poll() is not None:
+                        raise RuntimeError("The server exited before answering")
+                    sleep(0.005)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report import time and time to first response of a cold server.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", action="store_true", help="Sets SERVER_WARMUP to build everything at startup.")
+    parser.add_argument("--in-process", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.in_process:
+        in_process()
+        return
+
+    env = {**os.environ, "SERVER_LOG_LEVEL": "WARNING"}
+    if args.warmup:
+        env["SERVER_WARMUP"] = "true"
+    runs = [
+        json.loads(subprocess.check_output([sys.executable, __file__, "--in-process"], cwd=SRC, env=env))
+        for _ in range(args.runs)
+    ]
+    for name in runs[0]:
+        print(f"{name:<24} {median(run[name] for run in runs) * 1000:8.1f} ms")
+    print(f"{'uvicorn to first reply':<24} {median(serve(env) for _ in range(args.runs)) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import random
+from pathlib import Path
+from time import perf_counter
+
+from tokenization import BPETokenizer, WhitespaceTokenizer, load_ranks, train_ranks
+
+WORDS = (
+    "the of and to in is that for it as was with be by on not he this are or his from at which but have an they "
+    "you were her she there been one all we their has would when if so no will what out can more who up said about "
+    "tokenizer latency throughput completion assistant streaming benchmark request response conversation"
+).split()
+
+
+def synthetic_corpus(size: int, seed: int = 0):
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 40)))
+        lines.append(f"{sentence.capitalize()}, {rng.randint(0, 99999)} times!")
+    return lines
+
+
+def measure(name, tokenizer, texts, fn):
+    start = perf_counter()
+    tokens = fn(tokenizer, texts)
+    elapsed = perf_counter() - start
+    print(f"{name:<28} {tokens:>10} tokens {elapsed:8.3f} s {tokens / elapsed:>14,.0f} tokens/s")
+
+
+def encode(tokenizer, texts):
+    return sum(len(tokenizer.encode(text)) for text in texts)
+
+
+def encode_batch(tokenizer, texts):
+    return sum(len(tokens) for tokens in tokenizer.encode_batch(texts))
+
+
+def count(tokenizer, texts):
+    return sum(tokenizer.count_batch(texts))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report tokenizer throughput on a large corpus.")
+    parser.add_argument("--merges", help="A tiktoken-style merge table, trained on the corpus when omitted.")
+    parser.add_argument("--corpus", help="A text file, one document per line; synthetic when omitted.")
+    parser.add_argument("--lines", type=int, default=50000, help="Size of the synthetic corpus.")
+    parser.add_argument("--train-merges", type=int, default=300)
+    args = parser.parse_args()
+
+    corpus = Path(args.corpus).read_text().splitlines() if args.corpus else synthetic_corpus(args.lines)
+    ranks = load_ranks(args.merges) if args.merges else train_ranks(corpus[:2000], args.train_merges)
+    print(f"corpus: {len(corpus)} lines, {sum(map(len, corpus)) / 1e6:.1f} MB, vocabulary: {len(ranks)}")
+
+    bpe = BPETokenizer(ranks)
+    measure("bpe encode (cold cache)", bpe, corpus, encode)
+    measure("bpe encode (warm cache)", bpe, corpus, encode)
+    measure("bpe encode_batch", bpe, corpus, encode_batch)
+    measure("bpe count_batch", bpe, corpus, count)
+    measure("bpe encode (no cache)", BPETokenizer(ranks, cache_size=0), corpus, encode)
+    measure("whitespace count_batch", WhitespaceTokenizer(), corpus, count)
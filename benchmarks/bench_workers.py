@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+from multiprocessing import Pool
+from pathlib import Path
+from time import perf_counter, sleep
+
+import httpx
+
+LAUNCHER = Path(__file__).resolve().parent.parent / "src" / "launcher.py"
+BODY = {"messages": [{"role": "user", "content": "Hello!"}], "model": "gpt-4o", "max_tokens": 42}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start(workers: int, port: int) -> subprocess.Popen:
+    env = {**os.environ, "SERVER_LOG_LEVEL": "WARNING"}
+    process = subprocess.Popen(
+        [sys.executable, str(LAUNCHER), "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)], env=env
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/metrics").raise_for_status()
+            return process
+        except httpx.HTTPError:
+            sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"The server with {workers} workers did not start")
+
+
+async def load(port: int, concurrency: int, duration: float) -> int:
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits) as client:
+        deadline = perf_counter() + duration
+        completed = 0
+
+        async def user():
+            nonlocal completed
+            while perf_counter() < deadline:
+                (await client.post("/chat/completions", json=BODY)).raise_for_status()
+                completed += 1
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        return completed
+
+
+def load_process(args) -> int:
+    return asyncio.run(load(*args))
+
+
+def measure(workers: int, clients: int, concurrency: int, duration: float) -> float:
+    port = free_port()
+    process = start(workers, port)
+    try:
+        with Pool(clients) as pool:
+            completed = sum(pool.map(load_process, [(port, concurrency, duration)] * clients))
+    finally:
+        process.terminate()
+        process.wait()
+    return completed / duration
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Throughput of the pre-forked server by number of workers.")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[n for n in (1, 2, 4, 8, 16, 32) if n < cores] + [cores]
+    )
+    parser.add_argument("--clients", type=int, default=cores, help="Load generating processes.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent requests per load process.")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of load per measurement.")
+    args = parser.parse_args()
+
+    baseline = None
+    for workers in args.workers:
+        throughput = measure(workers, args.clients, args.concurrency, args.duration)
+        baseline = baseline or throughput
+        efficiency = throughput / (baseline * workers)
+        print(f"workers={workers:<3} {throughput:10.0f} requests/s  speedup {throughput / baseline:5.2f}x  "
+              f"efficiency {efficiency:.0%}")
+
+
+if __name__ == "__main__":
+    main()
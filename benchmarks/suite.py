@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from timeit import Timer
+from typing import Callable, Dict, Iterator, Tuple
+
+import httpx
+from fastapi.routing import serialize_response
+from starlette.responses import JSONResponse
+
+import app as server
+from clients import AnthropicMockClient, OpenAIMockClient
+from models.anthropic import AnthropicRequest
+from models.openai import OpenAIRequest
+from utils.config import LLMConfig
+from utils.metrics import ServerMetrics
+from utils.responses import ModelResponse
+
+LOG_LEVEL = logging.WARNING
+MESSAGE_COUNTS = [1, 10, 100]
+CONTENT_SIZES = [100, 10_000]
+QUICK_MESSAGE_COUNTS = [1, 10]
+QUICK_CONTENT_SIZES = [100]
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+Case = Tuple[str, Callable[[], object]]
+
+metrics = ServerMetrics()
+
+
+def conversation(messages: int, size: int):
+    content = ("lorem ipsum dolor sit amet " * (size // 27 + 1))[:size]
+    return [{"role": "user" if i % 2 == 0 else "assistant", "content": content} for i in range(messages)]
+
+
+def record(observed, usage):
+    observed.finish(observed.start(), *usage)
+
+
+def openai_cases(messages: int, size: int, http: "AsgiClient") -> Iterator[Case]:
+    payload = {"messages": conversation(messages, size), "model": "gpt-4o", "max_tokens": 42}
+    body = json.dumps(payload).encode()
+    client = OpenAIMockClient(LLMConfig(api_key="sk-key", model="gpt-4o"), LOG_LEVEL)
+    request = OpenAIRequest.model_validate(payload)
+    answer = client.generate_answer(request)
+    response = client.get_response(request)
+
+    yield "validation", lambda: OpenAIRequest.model_validate(payload)
+    yield "validation_json", lambda: OpenAIRequest.model_validate_json(body)
+    yield "usage", lambda: client.calculate_usage(request.messages, answer)
+    yield "response", lambda: client.get_response(request)
+    yield "serialization", lambda: response.model_dump_json()
+    yield "render", lambda: ModelResponse(response)
+    yield "render_validated", lambda: http.render_validated("/chat/completions", response)
+    yield "metrics", lambda: record(metrics.route("/chat/completions", request.model), client.usage_tokens(response))
+    yield "asgi", lambda: http.post("/chat/completions", body)
+    yield "asgi_validated", lambda: http.post("/chat/completions", body, fast_responses=False)
+
+
+def anthropic_cases(messages: int, size: int, http: "AsgiClient") -> Iterator[Case]:
+    model = "claude-3-5-sonnet-20241022"
+    payload = {"messages": conversation(messages, size), "model": model, "max_tokens": 42}
+    body = json.dumps(payload).encode()
+    client = AnthropicMockClient(LLMConfig(api_key="cl-key", model=model), LOG_LEVEL)
+    request = AnthropicRequest.model_validate(payload)
+    answer = client.generate_answer(request)
+    response = client.get_response(request)
+
+    yield "validation", lambda: AnthropicRequest.model_validate(payload)
+    yield "validation_json", lambda: AnthropicRequest.model_validate_json(body)
+    yield "usage", lambda: client.calculate_usage(request.messages, [answer], request.system)
+    yield "response", lambda: client.get_response(request)
+    yield "serialization", lambda: response.model_dump_json()
+    yield "render", lambda: ModelResponse(response)
+    yield "render_validated", lambda: http.render_validated("/claude/completions", response)
+    yield "metrics", lambda: record(metrics.route("/claude/completions", request.model), client.usage_tokens(response))
+    yield "asgi", lambda: http.post("/claude/completions", body)
+    yield "asgi_validated", lambda: http.post("/claude/completions", body, fast_responses=False)
+
+
+PROVIDERS = {
+    "openai": openai_cases,
+    "anthropic": anthropic_cases,
+}
+
+
+class AsgiClient:
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://benchmark")
+        self.fields = {
+            route.path: route.response_field for route in server.app.routes if hasattr(route, "response_field")
+        }
+
+    def post(self, url: str, body: bytes, fast_responses: bool = True) -> httpx.Response:
+        server.settings.fast_responses = fast_responses
+        try:
+            response = self.loop.run_until_complete(
+                self.client.post(url, content=body, headers={"Content-Type": "application/json"})
+            )
+        finally:
+            server.settings.fast_responses = True
+        response.raise_for_status()
+        return response
+
+    def render_validated(self, url: str, response) -> JSONResponse:
+        content = self.loop.run_until_complete(
+            serialize_response(field=self.fields[url], response_content=response.model_dump())
+        )
+        return JSONResponse(content)
+
+    def close(self):
+        self.loop.run_until_complete(self.client.aclose())
+        self.loop.close()
+
+
+def measure(fn: Callable[[], object], repeat: int) -> float:
+    timer = Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(quick: bool, repeat: int, selection: str) -> Dict[str, float]:
+    message_counts = QUICK_MESSAGE_COUNTS if quick else MESSAGE_COUNTS
+    content_sizes = QUICK_CONTENT_SIZES if quick else CONTENT_SIZES
+    http = AsgiClient()
+    results = {}
+    try:
+        for provider, cases in PROVIDERS.items():
+            for messages in message_counts:
+                for size in content_sizes:
+                    for stage, fn in cases(messages, size, http):
+                        name = f"{provider}/{stage}/messages={messages},size={size}"
+                        if selection not in name:
+                            continue
+                        results[name] = measure(fn, repeat) * 1e6
+                        print(f"{name:<55} {results[name]:>12.2f} us")
+    finally:
+        http.close()
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> int:
+    regressions = 0
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        change = value / baseline[name] - 1
+        if change > threshold:
+            regressions += 1
+            print(f"REGRESSION {name}: {baseline[name]:.2f} -> {value:.2f} us ({change:+.0%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-stage benchmarks of the mock server and clients.")
+    parser.add_argument("--quick", action="store_true", help="Run a reduced grid of payload sizes.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions, the best one is kept.")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this string.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Results to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown, 0.25 means 25%%.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline.")
+    args = parser.parse_args()
+
+    results = run(args.quick, args.repeat, args.filter)
+    document = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "unit": "us",
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(document, indent=2))
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(document, indent=2))
+        return 0
+
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}, skipping the regression check.")
+        return 0
+    regressions = compare(results, json.loads(baseline_path.read_text())["results"], args.threshold)
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
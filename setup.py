@@ -5,8 +5,24 @@ setup(
     version='0.1.0',
     packages=find_packages(where='src'),
     package_dir={'': 'src'},
+    py_modules=['app', 'launcher'],
     install_requires=[
-        'pydantic>=1.8',
+        'fastapi>=0.115,<0.116',
+        'httpx>=0.27',
+        'numpy>=1.24',
+        'pydantic>=2',
+        'pydantic-settings>=2',
+        'python-multipart>=0.0.9',
+        'uvicorn>=0.30',
+        'websockets>=12',
     ],
+    extras_require={
+        'zstd': ['zstandard>=0.22'],
+    },
     include_package_data=True,
+    entry_points={
+        'console_scripts': [
+            'llm-test-server = launcher:main',
+        ],
+    },
 )
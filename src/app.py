@@ -1,15 +1,91 @@
-import logging
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, List, Literal, Optional
 
-import uvicorn
-from fastapi import FastAPI
-from starlette.responses import RedirectResponse
+from fastapi import (
+    Depends, FastAPI, File, Form, Header, HTTPException, Request, Response, UploadFile, WebSocket, WebSocketDisconnect
+)
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
+from starlette.requests import ClientDisconnect
+from starlette.responses import FileResponse, JSONResponse, PlainTextResponse, RedirectResponse, StreamingResponse
 
-from clients import OpenAIMockClient, AnthropicMockClient
-from models.anthropic import AnthropicResponse, AnthropicRequest
-from models.openai import OpenAIResponse, OpenAIRequest
-from utils.config import LLMConfig
+from batch import BatchManager, FileStore
+from cache import IdempotencyMismatch, ResponseCache, request_fingerprint, request_key
+from clients import ClientRegistry, RealtimeSession
+from faults import MESSAGES, STREAM_FAULTS, FaultInjector, dropped, load_rules
+from middleware import CompressionMiddleware
+from models.anthropic import AnthropicFastRequest, AnthropicResponse, AnthropicRequest
+from models.base import build_models
+from models.openai import (
+    OpenAIFastRequest, OpenAIResponse, OpenAIRequest, OpenAIFile, OpenAIBatch, OpenAIBatchCreate, REALTIME_MODELS,
+    OpenAIEmbeddingsRequest, OpenAIEmbeddingsResponse
+)
+from ratelimit import MemoryStore, RateLimiter, SharedMemoryStore
+from scheduler import Overloaded
+from utils import sse
+from utils.config import ServerConfig
+from utils.metrics import CONTENT_TYPE, ServerMetrics
+from utils.requests import fast_body_route
+from utils.responses import ClosingStreamingResponse, ModelResponse
 
-app = FastAPI()
+MAX_BULK_REQUESTS = 2048
+IDEMPOTENCY_MISMATCH = (
+    "Keys for idempotent requests can only be used with the same parameters they were first used with."
+)
+
+settings = ServerConfig()
+registry = ClientRegistry(log_level=settings.log_level)
+metrics = ServerMetrics()
+files = FileStore(settings.data_dir)
+batches = BatchManager(files, settings.batch_workers, settings.batch_chunk_size, settings.log_level)
+if settings.rate_limit_store == "shared":
+    limiter = RateLimiter(SharedMemoryStore(
+        settings.rate_limit_path, settings.rate_limit_shards, settings.rate_limit_keys_per_shard
+    ))
+else:
+    limiter = RateLimiter(MemoryStore(settings.rate_limit_shards, settings.rate_limit_keys_per_shard))
+faults = FaultInjector(
+    settings.faults + (load_rules(settings.faults_path) if settings.faults_path else []), settings.fault_seed
+)
+cache = ResponseCache(settings.response_cache_entries, settings.response_cache_bytes, settings.response_cache_ttl)
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    if settings.warmup:
+        build_models()
+        application.openapi()
+    yield
+    batches.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+app.router.route_class = fast_body_route(
+    {OpenAIRequest: OpenAIFastRequest, AnthropicRequest: AnthropicFastRequest}, lambda: settings.fast_requests
+)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_min_size,
+    gzip_level=settings.gzip_level,
+    zstd_level=settings.zstd_level,
+    max_body_size=settings.max_request_body_size
+)
+
+
+def render(response, headers: Dict[str, str], http: Response):
+    if settings.fast_responses:
+        return ModelResponse(response, headers=headers)
+    http.headers.update(headers)
+    if isinstance(response, list):
+        return [item.model_dump() for item in response]
+    return response.model_dump()
+
+
+def caller(authorization: Optional[str] = Header(None), x_api_key: Optional[str] = Header(None)) -> str:
+    if authorization and authorization.lower().startswith("bearer "):
+        return authorization[7:].strip()
+    return x_api_key or "anonymous"
 
 
 @app.get("/", summary="Root", include_in_schema=False)
@@ -17,23 +93,314 @@ def root():
     return RedirectResponse(url="/docs")
 
 
+async def admit(client, observed, count: int = 1) -> None:
+    observed.queue_depth.inc(count)
+    try:
+        waited = await client.scheduler.acquire(count)
+    finally:
+        observed.queue_depth.dec(count)
+    for _ in range(count):
+        observed.queue_wait.observe(waited)
+
+
+async def generate(client, observed, request):
+    await admit(client, observed)
+    try:
+        return await client.aget_response(request=request)
+    finally:
+        client.scheduler.release()
+
+
+async def encode(client, observed, request):
+    response = await generate(client, observed, request)
+    return ModelResponse(response).body, client.usage_tokens(response)
+
+
+async def complete(provider: str, route: str, request, api_key: str, http: Response, named: bool = False,
+                   done: bool = False, idempotency_key: Optional[str] = None):
+    client = registry.get(provider, request.model)
+    observed = metrics.route(route, request.model)
+    headers = {}
+    if request.stream and not client.streams:
+        observed.error("StreamingUnsupported")
+        return JSONResponse(client.error_body(400, f"{request.model} does not support streaming."), 400)
+    cached = settings.response_cache and not request.stream
+    if cached:
+        key = request_key(provider, request, api_key, idempotency_key)
+        fingerprint = request_fingerprint(request) if idempotency_key else b""
+    if cached and idempotency_key:
+        try:
+            entry = cache.match(key, fingerprint)
+        except IdempotencyMismatch:
+            observed.error(IdempotencyMismatch)
+            return JSONResponse(client.error_body(422, IDEMPOTENCY_MISMATCH), 422)
+        if entry is not None:
+            observed.cached(True)
+            observed.finish(observed.start(), *entry.usage)
+            return Response(entry.body, media_type="application/json")
+    prompt_tokens, error = client.check_context(request)
+    if error is not None:
+        observed.error("ContextWindowExceeded")
+        return JSONResponse(error, 400)
+    if not client.rate_limit.is_unlimited:
+        if prompt_tokens is None:
+            prompt_tokens = client.prompt_tokens(request)
+        tokens = prompt_tokens + request.max_tokens
+        decision = limiter.acquire(api_key, request.model, client.rate_limit, tokens)
+        headers = client.rate_limit_headers(decision)
+        if not decision.allowed:
+            observed.error("RateLimitExceeded")
+            status, body = client.rate_limit_error(decision, request.model)
+            return JSONResponse(body, status, headers=headers)
+    fault = faults.choose(route, request.model, api_key)
+    if fault is not None:
+        if fault.kind == "error":
+            observed.error("FaultInjected")
+            body = client.error_body(fault.status, MESSAGES[fault.status])
+            return JSONResponse(body, fault.status, headers=headers)
+        if fault.kind == "latency" or (fault.kind == "stall" and not request.stream):
+            await asyncio.sleep(faults.delay(fault))
+    started = observed.start()
+    try:
+        if request.stream:
+            await admit(client, observed)
+            chunks = observed.stream(started, client.astream_response(request=request), client.chunk_usage_tokens)
+            events = sse.aencode(chunks, named=named, done=done)
+            if fault is not None and fault.kind in STREAM_FAULTS:
+                events = faults.stream(events, fault)
+
+            def close():
+                chunks.close(ClientDisconnect())
+                client.scheduler.release()
+
+            return ClosingStreamingResponse(events, close, media_type=sse.MEDIA_TYPE, headers=headers)
+        if cached:
+            entry, hit = await cache.fetch(key, lambda: encode(client, observed, request), fingerprint)
+            observed.cached(hit)
+            body, usage, response = entry.body, entry.usage, None
+        else:
+            response = await generate(client, observed, request)
+            body, usage = None, client.usage_tokens(response)
+    except Overloaded as e:
+        observed.fail(started, e)
+        return JSONResponse(client.error_body(529, MESSAGES[529]), 529, headers=headers)
+    except IdempotencyMismatch as e:
+        observed.fail(started, e)
+        return JSONResponse(client.error_body(422, IDEMPOTENCY_MISMATCH), 422, headers=headers)
+    except Exception as e:
+        observed.fail(started, e)
+        raise
+    if fault is not None and fault.kind in ("truncate", "disconnect"):
+        observed.fail(started, "FaultInjected")
+        if fault.kind == "disconnect":
+            return StreamingResponse(dropped(), media_type="application/json", headers=headers)
+        if body is None:
+            body = ModelResponse(response).body
+        return Response(body[:len(body) // 2], media_type="application/json", headers=headers)
+    observed.finish(started, *usage)
+    if body is not None:
+        return Response(body, media_type="application/json", headers=headers)
+    return render(response, headers, http)
+
+
+async def complete_bulk(provider: str, route: str, requests: list, api_key: str, http: Response):
+    if len(requests) > MAX_BULK_REQUESTS:
+        body = registry.get(provider, requests[0].model).error_body(
+            400, f"Bulk requests are limited to {MAX_BULK_REQUESTS} items, got {len(requests)}."
+        )
+        return JSONResponse(body, 400)
+    groups: Dict[str, List[int]] = {}
+    for index, request in enumerate(requests):
+        groups.setdefault(request.model, []).append(index)
+    charges = []
+    for model, indices in groups.items():
+        client = registry.get(provider, model)
+        if any(requests[index].stream for index in indices):
+            body = client.error_body(400, "Streaming is not supported by bulk requests.")
+            return JSONResponse(body, 400)
+        tokens = 0
+        for index in indices:
+            prompt_tokens, error = client.check_context(requests[index])
+            if error is not None:
+                metrics.route(route, model).error("ContextWindowExceeded")
+                return JSONResponse(error, 400)
+            if not client.rate_limit.is_unlimited:
+                if prompt_tokens is None:
+                    prompt_tokens = client.prompt_tokens(requests[index])
+                tokens += prompt_tokens + requests[index].max_tokens
+        if not client.rate_limit.is_unlimited:
+            charges.append((client, model, tokens, len(indices)))
+    headers = {}
+    for dry_run in (True, False):
+        for client, model, tokens, count in charges:
+            decision = limiter.acquire(api_key, model, client.rate_limit, tokens, requests=count, dry_run=dry_run)
+            headers = client.rate_limit_headers(decision)
+            if not decision.allowed:
+                metrics.route(route, model).error("RateLimitExceeded")
+                status, body = client.rate_limit_error(decision, model)
+                return JSONResponse(body, status, headers=headers)
+
+    async def serve_wave(client, observed, indices: List[int]):
+        started = [observed.start() for _ in indices]
+        try:
+            await admit(client, observed, len(indices))
+            try:
+                responses = await client.aget_responses([requests[index] for index in indices])
+            finally:
+                client.scheduler.release(len(indices))
+        except BaseException as e:
+            for start in started:
+                observed.fail(start, e)
+            raise
+        for start, response in zip(started, responses):
+            observed.finish(start, *client.usage_tokens(response))
+        return responses
+
+    async def serve(model: str, indices: List[int]):
+        client = registry.get(provider, model)
+        observed = metrics.route(route, model)
+        wave = client.scheduler.capacity.slots or len(indices)
+        responses = []
+        for start in range(0, len(indices), wave):
+            responses.extend(await serve_wave(client, observed, indices[start:start + wave]))
+        return responses
+
+    tasks = [asyncio.ensure_future(serve(model, indices)) for model, indices in groups.items()]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException as e:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if not isinstance(e, Overloaded):
+            raise
+        body = registry.get(provider, requests[0].model).error_body(529, MESSAGES[529])
+        return JSONResponse(body, 529, headers=headers)
+    responses = [None] * len(requests)
+    for indices, served in zip(groups.values(), results):
+        for index, response in zip(indices, served):
+            responses[index] = response
+    return render(responses, headers, http)
+
+
 @app.post("/chat/completions", summary="Create Chat Completion", tags=["OpenAI"],
-          response_model=OpenAIResponse)
-def create_chat_completion(request: OpenAIRequest):
-    config = LLMConfig(api_key="sk-key", model=request.model)
-    client = OpenAIMockClient(config=config, log_level=logging.DEBUG)
-    response = client.get_response(request=request)
-    return response.model_dump()
+          response_model=OpenAIResponse, responses={200: {"content": {sse.MEDIA_TYPE: {}}}})
+async def create_chat_completion(request: OpenAIRequest, http: Response, api_key: str = Depends(caller),
+                                 idempotency_key: Optional[str] = Header(None)):
+    return await complete("openai", "/chat/completions", request, api_key, http, done=True,
+                          idempotency_key=idempotency_key)
 
 
 @app.post("/claude/completions", summary="Create Claude Completion", tags=["Anthropic"],
-          response_model=AnthropicResponse)
-def create_claude_completion(request: AnthropicRequest):
-    config = LLMConfig(api_key="cl-key", model=request.model)
-    client = AnthropicMockClient(config=config, log_level=logging.DEBUG)
-    response = client.get_response(request=request)
-    return response.model_dump()
+          response_model=AnthropicResponse, responses={200: {"content": {sse.MEDIA_TYPE: {}}}})
+async def create_claude_completion(request: AnthropicRequest, http: Response, api_key: str = Depends(caller),
+                                   idempotency_key: Optional[str] = Header(None)):
+    return await complete("anthropic", "/claude/completions", request, api_key, http, named=True,
+                          idempotency_key=idempotency_key)
+
+
+@app.post("/chat/completions/bulk", summary="Create Chat Completions in Bulk", tags=["OpenAI"],
+          response_model=List[OpenAIResponse])
+async def create_chat_completions(requests: List[OpenAIRequest], http: Response, api_key: str = Depends(caller)):
+    return await complete_bulk("openai", "/chat/completions/bulk", requests, api_key, http)
+
+
+@app.post("/claude/completions/bulk", summary="Create Claude Completions in Bulk", tags=["Anthropic"],
+          response_model=List[AnthropicResponse])
+async def create_claude_completions(requests: List[AnthropicRequest], http: Response,
+                                    api_key: str = Depends(caller)):
+    return await complete_bulk("anthropic", "/claude/completions/bulk", requests, api_key, http)
+
+
+@app.post("/embeddings", summary="Create Embeddings", tags=["OpenAI"], response_model=OpenAIEmbeddingsResponse)
+async def create_embeddings(request: OpenAIEmbeddingsRequest, http: Response, api_key: str = Depends(caller),
+                            idempotency_key: Optional[str] = Header(None)):
+    return await complete("embeddings", "/embeddings", request, api_key, http, idempotency_key=idempotency_key)
+
+
+@app.get("/metrics", summary="Metrics", tags=["Monitoring"], response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(metrics.expose(), media_type=CONTENT_TYPE)
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_error(request: Request, error: RequestValidationError):
+    route = request.scope.get("route")
+    if route is not None:
+        metrics.route(route.path, "unknown").error(RequestValidationError)
+    return await request_validation_exception_handler(request, error)
+
+
+async def send_events(websocket: WebSocket, events: asyncio.Queue):
+    while True:
+        event = await events.get()
+        await websocket.send_text(event.model_dump_json())
+
+
+@app.websocket("/v1/realtime")
+async def realtime(websocket: WebSocket, model: str):
+    if model not in REALTIME_MODELS:
+        await websocket.close(code=1008, reason=f"Unsupported realtime model: {model}")
+        return
+    await websocket.accept()
+    events = asyncio.Queue(maxsize=settings.realtime_send_buffer)
+    session = RealtimeSession(
+        registry.get("openai", model), events.put, settings.realtime_max_items, settings.realtime_max_event_size
+    )
+    sender = asyncio.create_task(send_events(websocket, events))
+    try:
+        await session.start()
+        async for message in websocket.iter_text():
+            await session.handle(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await session.close()
+        sender.cancel()
+
+
+@app.post("/v1/files", summary="Upload File", tags=["Batch"], response_model=OpenAIFile)
+def upload_file(file: UploadFile = File(...), purpose: Literal["batch"] = Form(...)):
+    return files.upload(file.file, file.filename or "upload.jsonl", purpose)
+
+
+@app.get("/v1/files/{file_id}", summary="Retrieve File", tags=["Batch"], response_model=OpenAIFile)
+def retrieve_file(file_id: str):
+    file = files.get(file_id)
+    if file is None:
+        raise HTTPException(status_code=404, detail=f"No such file: {file_id}")
+    return file
+
+
+@app.get("/v1/files/{file_id}/content", summary="Retrieve File Content", tags=["Batch"])
+def retrieve_file_content(file_id: str):
+    file = retrieve_file(file_id)
+    return FileResponse(files.path(file.id), media_type="application/jsonl", filename=file.filename)
+
+
+@app.post("/v1/batches", summary="Create Batch", tags=["Batch"], response_model=OpenAIBatch)
+def create_batch(request: OpenAIBatchCreate):
+    try:
+        return batches.create(request)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No such file: {request.input_file_id}")
+
+
+@app.get("/v1/batches/{batch_id}", summary="Retrieve Batch", tags=["Batch"], response_model=OpenAIBatch)
+def retrieve_batch(batch_id: str):
+    batch = batches.get(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail=f"No such batch: {batch_id}")
+    return batch
+
+
+@app.post("/v1/batches/{batch_id}/cancel", summary="Cancel Batch", tags=["Batch"], response_model=OpenAIBatch)
+def cancel_batch(batch_id: str):
+    retrieve_batch(batch_id)
+    return batches.cancel(batch_id)
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    import uvicorn
+
+    uvicorn.run(app, host=settings.host, port=settings.port)
@@ -0,0 +1,2 @@
+from .manager import BatchManager
+from .store import FileStore
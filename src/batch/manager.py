@@ -0,0 +1,152 @@
+import logging
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from threading import Lock, Thread
+from time import time
+from typing import Deque, Dict, IO, Iterator, List, Optional, Set
+from uuid import uuid1
+
+from batch.store import FileStore, read_json, write_json
+from batch.worker import run_chunk
+from models.openai import OpenAIBatch, OpenAIBatchCreate, OpenAIBatchRequestCounts
+from utils import logger
+
+BATCH_ID = re.compile(r"batch_[0-9a-f]{32}")
+
+
+class BatchManager:
+    def __init__(self, store: FileStore, workers: Optional[int] = None, chunk_size: int = 256,
+                 log_level: int = logging.INFO):
+        self.store = store
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.logger = logger.setup(self.__class__.__name__, log_level)
+        self._batches: Dict[str, OpenAIBatch] = {}
+        self._cancelled: Set[str] = set()
+        self._lock = Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def get(self, batch_id: str) -> Optional[OpenAIBatch]:
+        batch = self._batches.get(batch_id)
+        if batch is None and BATCH_ID.fullmatch(batch_id):
+            batch = read_json(self.store.index(batch_id), OpenAIBatch)
+        return batch
+
+    def create(self, request: OpenAIBatchCreate) -> OpenAIBatch:
+        if self.store.get(request.input_file_id) is None:
+            raise KeyError(request.input_file_id)
+        batch = OpenAIBatch(
+            id=f"batch_{uuid1().hex}",
+            endpoint=request.endpoint,
+            input_file_id=request.input_file_id,
+            completion_window=request.completion_window,
+            created_at=int(time()),
+            metadata=request.metadata
+        )
+        with self._lock:
+            self._batches[batch.id] = batch
+            write_json(self.store.index(batch.id), batch)
+        Thread(target=self._run, args=(batch.id,), name=batch.id, daemon=True).start()
+        return batch
+
+    def cancel(self, batch_id: str) -> OpenAIBatch:
+        batch = self.get(batch_id)
+        if batch is None:
+            raise KeyError(batch_id)
+        if batch.status in ("validating", "in_progress"):
+            if batch_id not in self._batches:
+                self._cancel_marker(batch_id).touch()
+                return batch.model_copy(update={"status": "cancelling"})
+            self._cancelled.add(batch_id)
+            batch = self._update(batch_id, status="cancelling")
+        return batch
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _update(self, batch_id: str, **changes) -> OpenAIBatch:
+        with self._lock:
+            batch = self._batches[batch_id].model_copy(update=changes)
+            self._batches[batch_id] = batch
+            write_json(self.store.index(batch_id), batch)
+            return batch
+
+    def _cancel_marker(self, batch_id: str) -> Path:
+        return self.store.directory / f"{batch_id}.cancel"
+
+    def _cancelling(self, batch_id: str) -> bool:
+        if batch_id not in self._cancelled and self._cancel_marker(batch_id).exists():
+            self._cancelled.add(batch_id)
+            self._update(batch_id, status="cancelling")
+        return batch_id in self._cancelled
+
+    def _chunks(self, source: IO[str]) -> Iterator[List[str]]:
+        chunk = []
+        for line in source:
+            if line.strip():
+                chunk.append(line)
+                if len(chunk) == self.chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    def _run(self, batch_id: str) -> None:
+        batch = self._batches[batch_id]
+        output = self.store.create(f"{batch_id}_output.jsonl", "batch_output")
+        errors = self.store.create(f"{batch_id}_error.jsonl", "batch_output")
+        self._update(batch_id, status="in_progress", in_progress_at=int(time()),
+                     output_file_id=output.id, error_file_id=errors.id)
+        counts = OpenAIBatchRequestCounts()
+        max_pending = 2 * self.workers
+        try:
+            with self.store.path(batch.input_file_id).open(encoding="utf-8") as source, \
+                    self.store.path(output.id).open("w", encoding="utf-8") as output_file, \
+                    self.store.path(errors.id).open("w", encoding="utf-8") as error_file:
+                pending: Deque[Future] = deque()
+                for chunk in self._chunks(source):
+                    if self._cancelling(batch_id):
+                        break
+                    pending.append(self.pool.submit(run_chunk, chunk))
+                    counts.total += len(chunk)
+                    if len(pending) >= max_pending:
+                        self._write(batch_id, pending.popleft(), output_file, error_file, counts)
+                while pending:
+                    self._write(batch_id, pending.popleft(), output_file, error_file, counts)
+        except Exception as e:
+            self.logger.error(f"Error: Batch {batch_id} failed | Exception: {e}")
+            self._update(batch_id, status="failed", failed_at=int(time()), request_counts=counts.model_copy())
+            return
+        finally:
+            self.store.refresh(output.id)
+            self.store.refresh(errors.id)
+
+        if self._cancelling(batch_id):
+            self._update(batch_id, status="cancelled", cancelled_at=int(time()), request_counts=counts.model_copy())
+            return
+        self._update(batch_id, status="finalizing", finalizing_at=int(time()))
+        self._update(batch_id, status="completed", completed_at=int(time()), request_counts=counts.model_copy())
+
+    def _write(self, batch_id: str, future: Future, output_file: IO[str], error_file: IO[str],
+               counts: OpenAIBatchRequestCounts) -> None:
+        for ok, line in future.result():
+            if ok:
+                output_file.write(line + "\n")
+                counts.completed += 1
+            else:
+                error_file.write(line + "\n")
+                counts.failed += 1
+        self._update(batch_id, request_counts=counts.model_copy())
@@ -0,0 +1,81 @@
+import os
+import re
+from pathlib import Path
+from threading import Lock, get_ident
+from time import time
+from typing import BinaryIO, Dict, Optional, Type, TypeVar
+from uuid import uuid1
+
+from pydantic import BaseModel
+
+from models.openai import OpenAIFile
+
+COPY_BUFFER_SIZE = 1024 * 1024
+FILE_ID = re.compile(r"file-[0-9a-f]{32}")
+
+ModelType = TypeVar("ModelType", bound=BaseModel)
+
+
+def write_json(path: Path, model: BaseModel) -> None:
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.{get_ident()}")
+    temporary.write_text(model.model_dump_json(), encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def read_json(path: Path, model_type: Type[ModelType]) -> Optional[ModelType]:
+    try:
+        return model_type.model_validate_json(path.read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+class FileStore:
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._files: Dict[str, OpenAIFile] = {}
+        self._lock = Lock()
+
+    def path(self, file_id: str) -> Path:
+        return self.directory / f"{file_id}.jsonl"
+
+    def index(self, object_id: str) -> Path:
+        return self.directory / f"{object_id}.json"
+
+    def get(self, file_id: str) -> Optional[OpenAIFile]:
+        file = self._files.get(file_id)
+        if file is None and FILE_ID.fullmatch(file_id):
+            file = read_json(self.index(file_id), OpenAIFile)
+        return file
+
+    def create(self, filename: str, purpose: str) -> OpenAIFile:
+        file_id = f"file-{uuid1().hex}"
+        self.path(file_id).touch()
+        return self._register(file_id, filename, purpose)
+
+    def upload(self, source: BinaryIO, filename: str, purpose: str) -> OpenAIFile:
+        file_id = f"file-{uuid1().hex}"
+        with self.path(file_id).open("wb") as target:
+            while chunk := source.read(COPY_BUFFER_SIZE):
+                target.write(chunk)
+        return self._register(file_id, filename, purpose)
+
+    def refresh(self, file_id: str) -> OpenAIFile:
+        with self._lock:
+            file = self._files[file_id].model_copy(update={"bytes": self.path(file_id).stat().st_size})
+            self._files[file_id] = file
+            write_json(self.index(file_id), file)
+            return file
+
+    def _register(self, file_id: str, filename: str, purpose: str) -> OpenAIFile:
+        file = OpenAIFile(
+            id=file_id,
+            bytes=self.path(file_id).stat().st_size,
+            created_at=int(time()),
+            filename=filename,
+            purpose=purpose
+        )
+        with self._lock:
+            self._files[file_id] = file
+            write_json(self.index(file_id), file)
+        return file
@@ -0,0 +1,48 @@
+import logging
+from typing import List, Optional, Tuple
+from uuid import uuid1
+
+from pydantic import ValidationError
+
+from clients.registry import ClientRegistry
+from models.openai import OpenAIBatchRequestInput, OpenAIBatchRequestOutput, OpenAIBatchResponse, OpenAIBatchError
+
+_registry: Optional[ClientRegistry] = None
+
+
+def registry() -> ClientRegistry:
+    global _registry
+    if _registry is None:
+        _registry = ClientRegistry(log_level=logging.WARNING)
+    return _registry
+
+
+def run_line(line: str) -> Tuple[bool, str]:
+    try:
+        request = OpenAIBatchRequestInput.model_validate_json(line)
+    except ValidationError as e:
+        error = OpenAIBatchError(code="invalid_request", message=str(e))
+        return False, OpenAIBatchRequestOutput(id=f"batch_req_{uuid1().hex}", error=error).model_dump_json()
+
+    request_id = uuid1().hex
+    try:
+        client = registry().get("openai", request.body.model)
+        _, error = client.check_context(request.body)
+        if error is not None:
+            output = OpenAIBatchResponse(status_code=400, request_id=request_id, body=error)
+            ok = False
+        else:
+            response = client.get_response(request.body)
+            output = OpenAIBatchResponse(status_code=200, request_id=request_id, body=response.model_dump())
+            ok = True
+    except Exception as e:
+        body = {"error": {"message": str(e), "type": "server_error"}}
+        output = OpenAIBatchResponse(status_code=500, request_id=request_id, body=body)
+        ok = False
+    return ok, OpenAIBatchRequestOutput(
+        id=f"batch_req_{request_id}", custom_id=request.custom_id, response=output
+    ).model_dump_json()
+
+
+def run_chunk(lines: List[str]) -> List[Tuple[bool, str]]:
+    return [run_line(line) for line in lines]
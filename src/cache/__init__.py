@@ -0,0 +1 @@
+from .store import CachedResponse, IdempotencyMismatch, ResponseCache, request_fingerprint, request_key
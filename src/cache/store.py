@@ -0,0 +1,104 @@
+import asyncio
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+from time import monotonic
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel
+
+from utils.responses import adapter
+
+
+class IdempotencyMismatch(Exception):
+    pass
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    usage: Tuple[int, int]
+    expires: float = 0.0
+    fingerprint: bytes = b""
+
+
+def request_fingerprint(request: BaseModel) -> bytes:
+    return blake2b(adapter(type(request)).dump_json(request), digest_size=16).digest()
+
+
+def request_key(provider: str, request: BaseModel, api_key: str, idempotency_key: Optional[str] = None) -> bytes:
+    digest = blake2b(f"{provider}\n{api_key}\n".encode(), digest_size=16)
+    if idempotency_key:
+        digest.update(f"idempotency\n{idempotency_key}".encode())
+    else:
+        digest.update(adapter(type(request)).dump_json(request))
+    return digest.digest()
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, ttl: Optional[float] = 300.0,
+                 clock: Callable[[], float] = monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.size = 0
+        self._entries: "OrderedDict[bytes, CachedResponse]" = OrderedDict()
+        self._pending: Dict[bytes, asyncio.Future] = {}
+        self._lock = Lock()
+
+    def get(self, key: bytes) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self.ttl is not None and entry.expires <= self.clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def match(self, key: bytes, fingerprint: bytes = b"") -> Optional[CachedResponse]:
+        entry = self.get(key)
+        if entry is not None and entry.fingerprint != fingerprint:
+            raise IdempotencyMismatch(key.hex())
+        return entry
+
+    def put(self, key: bytes, body: bytes, usage: Tuple[int, int] = (0, 0), fingerprint: bytes = b"") -> CachedResponse:
+        entry = CachedResponse(body, usage, self.clock() + self.ttl if self.ttl is not None else 0.0, fingerprint)
+        if len(body) > self.max_bytes or self.max_entries == 0:
+            return entry
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self.size += len(body)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+        return entry
+
+    async def fetch(self, key: bytes, produce: Callable[[], Awaitable[Tuple[bytes, Tuple[int, int]]]],
+                    fingerprint: bytes = b"") -> Tuple[CachedResponse, bool]:
+        while True:
+            entry = self.match(key, fingerprint)
+            if entry is not None:
+                return entry, True
+            pending = self._pending.get(key)
+            if pending is None:
+                break
+            await asyncio.shield(pending)
+        self._pending[key] = asyncio.get_running_loop().create_future()
+        try:
+            return self.put(key, *await produce(), fingerprint), False
+        finally:
+            self._pending.pop(key).set_result(None)
+
+    def _remove(self, key: bytes) -> None:
+        self.size -= len(self._entries.pop(key).body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
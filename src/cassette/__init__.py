@@ -0,0 +1,11 @@
+from functools import lru_cache
+
+from utils.lazy import lazy_exports
+from .store import CassetteStore, RecordedChunk, Recording, fingerprint
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), {"Recorder": ".recorder"})
+
+
+@lru_cache(maxsize=None)
+def open_cassettes(directory: str, cache_size: int = 1024) -> CassetteStore:
+    return CassetteStore(directory, cache_size)
@@ -0,0 +1,49 @@
+import argparse
+import asyncio
+import json
+import os
+
+import httpx
+
+from cassette.recorder import Recorder, upstream_headers
+from cassette.store import CassetteStore
+
+
+async def record(args: argparse.Namespace) -> None:
+    store = CassetteStore(args.directory)
+    headers = upstream_headers(args.provider, args.api_key)
+    limit = asyncio.Semaphore(args.concurrency)
+    paths = {args.provider: args.path} if args.path else None
+    async with httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=args.timeout) as client:
+        recorder = Recorder(store, client, paths)
+
+        async def one(body: dict) -> None:
+            async with limit:
+                recording = await recorder.record(args.provider, body)
+                print(f"Recorded {body.get('model')} in {recording.latency:.2f}s")
+
+        with open(args.requests) as file:
+            await asyncio.gather(*(one(json.loads(line)) for line in file if line.strip()))
+    print(f"{len(store)} recordings in {args.directory}")
+    store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m cassette", description="Record provider responses for the mock to replay."
+    )
+    parser.add_argument("provider", choices=["openai", "anthropic"])
+    parser.add_argument("requests", help="JSONL file of request bodies, streamed requests record chunk timings.")
+    parser.add_argument("--directory", default="cassettes", help="The cassette store to append to.")
+    parser.add_argument("--base-url", required=True, help="The provider API, e.g. https://api.openai.com/v1.")
+    parser.add_argument("--path", help="Override the completion path appended to the base URL.")
+    parser.add_argument(
+        "--api-key", default=os.environ.get("UPSTREAM_API_KEY", ""), help="Defaults to UPSTREAM_API_KEY."
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests sent upstream at once.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Upstream request timeout in seconds.")
+    asyncio.run(record(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
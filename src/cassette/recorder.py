@@ -0,0 +1,64 @@
+import json
+from time import perf_counter, time
+from typing import Dict, Optional
+
+import httpx
+
+from cassette.store import CassetteStore, RecordedChunk, Recording
+from models.anthropic import AnthropicRequest
+from models.openai import OpenAIRequest
+
+REQUEST_MODELS = {"openai": OpenAIRequest, "anthropic": AnthropicRequest}
+UPSTREAM_PATHS = {"openai": "/chat/completions", "anthropic": "/messages"}
+SKIPPED_EVENTS = ("ping",)
+
+
+def upstream_headers(provider: str, api_key: str) -> Dict[str, str]:
+    if provider == "anthropic":
+        return {"x-api-key": api_key, "anthropic-version": "2023-06-01"}
+    return {"Authorization": f"Bearer {api_key}"}
+
+
+class Recorder:
+    def __init__(self, store: CassetteStore, client: httpx.AsyncClient, paths: Optional[Dict[str, str]] = None):
+        self.store = store
+        self.client = client
+        self.paths = {**UPSTREAM_PATHS, **(paths or {})}
+
+    async def record(self, provider: str, body: dict) -> Recording:
+        request = REQUEST_MODELS[provider].model_validate(body)
+        payload = request.model_dump(mode="json", exclude_none=True)
+        started = perf_counter()
+        if request.stream:
+            chunks = []
+            last = started
+            async with self.client.stream("POST", self.paths[provider], json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:") or line[5:].strip() == "[DONE]":
+                        continue
+                    data = json.loads(line[5:])
+                    if data.get("type") in SKIPPED_EVENTS:
+                        continue
+                    now = perf_counter()
+                    chunks.append(RecordedChunk(delay=now - last, data=data))
+                    last = now
+            recording = Recording(
+                provider=provider,
+                request=request.model_dump(mode="json"),
+                chunks=chunks,
+                latency=last - started,
+                recorded_at=int(time())
+            )
+        else:
+            response = await self.client.post(self.paths[provider], json=payload)
+            response.raise_for_status()
+            recording = Recording(
+                provider=provider,
+                request=request.model_dump(mode="json"),
+                response=response.json(),
+                latency=perf_counter() - started,
+                recorded_at=int(time())
+            )
+        self.store.put(recording)
+        return recording
@@ -0,0 +1,115 @@
+import json
+import os
+import struct
+from collections import OrderedDict
+from hashlib import blake2b
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+INDEX_ENTRY = struct.Struct("<QQI")
+
+
+def fingerprint(provider: str, body: Dict[str, Any]) -> int:
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return int.from_bytes(blake2b(f"{provider}\n{canonical}".encode(), digest_size=8).digest(), "little")
+
+
+class RecordedChunk(BaseModel):
+    delay: float = Field(..., ge=0, description="Seconds elapsed since the previous chunk, or the request start.")
+    data: Dict[str, Any] = Field(..., description="The chunk as sent by the provider.")
+
+
+class Recording(BaseModel):
+    provider: str = Field(..., description="The provider the request was sent to.")
+    request: Dict[str, Any] = Field(..., description="The recorded request body.")
+    response: Optional[Dict[str, Any]] = Field(None, description="The response body of a non streamed request.")
+    chunks: List[RecordedChunk] = Field(default_factory=list, description="The chunks of a streamed request.")
+    latency: float = Field(0.0, ge=0, description="Seconds until the whole response was received.")
+    recorded_at: int = Field(..., description="The Unix timestamp (in seconds) of the recording.")
+
+
+class CassetteStore:
+    def __init__(self, directory: str, cache_size: int = 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.cache_size = cache_size
+        self._log = open(self.directory / "cassette.log", "a+b")
+        self._index_file = open(self.directory / "cassette.idx", "a+b")
+        self._index: Dict[int, Tuple[int, int]] = {}
+        self._cache: "OrderedDict[int, Recording]" = OrderedDict()
+        self._lock = Lock()
+        self._load_index()
+
+    def _load_index(self) -> None:
+        self._index_file.seek(0)
+        data = self._index_file.read()
+        data = data[:len(data) - len(data) % INDEX_ENTRY.size]
+        self._index_file.truncate(len(data))
+        indexed = 0
+        for key, offset, length in INDEX_ENTRY.iter_unpack(data):
+            self._index[key] = (offset, length)
+            indexed = max(indexed, offset + length)
+
+        self._log.seek(indexed)
+        offset = indexed
+        for line in self._log:
+            if not line.endswith(b"\n"):
+                break
+            recording = Recording.model_validate_json(line)
+            key = fingerprint(recording.provider, recording.request)
+            self._append_index(key, offset, len(line))
+            offset += len(line)
+        self._log.truncate(offset)
+
+    def _append_index(self, key: int, offset: int, length: int) -> None:
+        self._index_file.write(INDEX_ENTRY.pack(key, offset, length))
+        self._index_file.flush()
+        self._index[key] = (offset, length)
+
+    def put(self, recording: Recording) -> int:
+        key = fingerprint(recording.provider, recording.request)
+        line = recording.model_dump_json().encode() + b"\n"
+        with self._lock:
+            self._log.seek(0, os.SEEK_END)
+            offset = self._log.tell()
+            self._log.write(line)
+            self._log.flush()
+            self._append_index(key, offset, len(line))
+            self._remember(key, recording)
+        return key
+
+    def get(self, key: int) -> Optional[Recording]:
+        with self._lock:
+            recording = self._cache.get(key)
+            if recording is not None:
+                self._cache.move_to_end(key)
+                return recording
+            location = self._index.get(key)
+        if location is None:
+            return None
+        recording = Recording.model_validate_json(os.pread(self._log.fileno(), location[1], location[0]))
+        with self._lock:
+            self._remember(key, recording)
+        return recording
+
+    def _remember(self, key: int, recording: Recording) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = recording
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        self._log.close()
+        self._index_file.close()
+
@@ -1,3 +1,12 @@
-from .anthropic import AnthropicMockClient
-from .llm_client import LLMClient
-from .openai import OpenAIMockClient
+from utils.lazy import lazy_exports
+
+EXPORTS = {
+    "AnthropicMockClient": ".anthropic",
+    "EmbeddingsMockClient": ".embeddings",
+    "LLMClient": ".llm_client",
+    "OpenAIMockClient": ".openai",
+    "ClientRegistry": ".registry",
+    "RealtimeSession": ".realtime",
+}
+__all__ = list(EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, globals(), EXPORTS)
@@ -1,13 +1,36 @@
-from typing import List
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from math import ceil
+from typing import Dict, Iterator, List, Optional, Tuple
 from uuid import uuid1
 
 from pydantic import ValidationError
 
 from clients.llm_client import LLMClient
-from models.anthropic import AnthropicRequest, AnthropicResponse, AnthropicMessage, AnthropicContent, AnthropicUsage
+from ratelimit import Decision
+from models.anthropic import (
+    AnthropicRequest, AnthropicResponse, AnthropicMessage, AnthropicContent, AnthropicUsage, AnthropicStreamEvent,
+    AnthropicMessageStart, AnthropicContentBlockStart, AnthropicContentBlockDelta, AnthropicContentBlockStop,
+    AnthropicMessageDelta, AnthropicMessageStop, AnthropicTextDelta, AnthropicStopDelta, AnthropicDeltaUsage
+)
+from utils.responses import adapter
+
+TOKENS_PER_MESSAGE = 3
+ERROR_TYPES = {
+    400: "invalid_request_error", 404: "not_found_error", 413: "request_too_large", 422: "invalid_request_error",
+    429: "rate_limit_error", 529: "overloaded_error"
+}
+
+
+def format_reset(seconds: float) -> str:
+    return (datetime.now(timezone.utc) + timedelta(seconds=seconds)).isoformat(timespec="seconds")
 
 
 class AnthropicMockClient(LLMClient):
+    provider = "anthropic"
+    response_type = AnthropicResponse
+    chunk_type = AnthropicStreamEvent
+
     def __init__(self, config, log_level):
         super().__init__(config, log_level)
 
@@ -15,22 +38,62 @@ class AnthropicMockClient(LLMClient):
         self.logger.debug("Loaded 🚀")
 
     @staticmethod
-    def calculate_usage(messages: List[AnthropicMessage], response: List[str]) -> AnthropicUsage:
-        prompt_tokens = sum(
-            len(message.role) + (len(message.content) if isinstance(message.content, str) else sum(
-                len(block.text or "") for block in message.content))
-            for message in messages
-        )
-        completion_tokens = sum(len(block) for block in response)
+    def prompt_texts(messages: List[AnthropicMessage], system: Optional[str] = None) -> Iterator[str]:
+        yield system or ""
+        for message in messages:
+            if isinstance(message.content, str):
+                yield message.content
+            else:
+                for block in message.content:
+                    yield block.text or ""
+
+    def calculate_usage(self, messages: List[AnthropicMessage], response: List[str],
+                        system: Optional[str] = None) -> AnthropicUsage:
+        prompt_tokens = self.tokenizer.count_within(self.prompt_texts(messages, system))
+        prompt_tokens += len(messages) * TOKENS_PER_MESSAGE
+        completion_tokens = sum(self.tokenizer.count_batch(response))
         return AnthropicUsage(input_tokens=prompt_tokens, output_tokens=completion_tokens)
 
+    def calculate_usages(self, requests: List[AnthropicRequest], answers: List[str]) -> List[AnthropicUsage]:
+        texts, lengths = [], []
+        for request in requests:
+            request_texts = list(self.prompt_texts(request.messages, request.system))
+            texts.extend(request_texts)
+            lengths.append(len(request_texts))
+        counts = iter(self.tokenizer.count_batch(texts))
+        unique = list(dict.fromkeys(answers))
+        completions = dict(zip(unique, self.tokenizer.count_batch(unique)))
+        usages: Dict[Tuple[int, int], AnthropicUsage] = {}
+        result = []
+        for request, answer, length in zip(requests, answers, lengths):
+            key = (sum(islice(counts, length)) + len(request.messages) * TOKENS_PER_MESSAGE, completions[answer])
+            usage = usages.get(key)
+            if usage is None:
+                usage = usages[key] = AnthropicUsage(input_tokens=key[0], output_tokens=key[1])
+            result.append(usage)
+        return result
+
+    @staticmethod
+    def prompt(request: AnthropicRequest) -> str:
+        for message in reversed(request.messages):
+            if message.role == "user":
+                if isinstance(message.content, str):
+                    return message.content
+                return "".join(block.text or "" for block in message.content)
+        return ""
+
+    def generate_answer(self, request: AnthropicRequest) -> str:
+        answer = "We are busy at the moment. Please try again later."
+        return self.scripted_answer(self.prompt(request), answer, request.max_tokens)
+
     def get_response(self, request: AnthropicRequest) -> AnthropicResponse:
         try:
-            self.logger.debug(f"Request: {request.model_dump_json()}")
-            answer = "We are busy at the moment. Please try again later."
-            answer = self.trim_message(answer, request.max_tokens)
+            log_payload = self.sample_payload()
+            if log_payload:
+                self.logger.debug(f"Request: {request.model_dump_json()}")
+            answer = self.generate_answer(request)
             mock_content = [AnthropicContent(type="text", text=answer)]
-            usage = self.calculate_usage(request.messages, [block.text for block in mock_content])
+            usage = self.calculate_usage(request.messages, [block.text for block in mock_content], request.system)
 
             response = AnthropicResponse(
                 id=uuid1().hex,
@@ -42,7 +105,8 @@ class AnthropicMockClient(LLMClient):
                 model=request.model
             )
 
-            self.logger.debug(f"Response: {response.model_dump_json()}")
+            if log_payload:
+                self.logger.debug(f"Response: {response.model_dump_json()}")
 
             return response
         except ValidationError as e:
@@ -52,6 +116,132 @@ class AnthropicMockClient(LLMClient):
             self.handle_error(e, "An unexpected error occurred.")
             raise
 
+    def get_responses(self, requests: List[AnthropicRequest]) -> List[AnthropicResponse]:
+        try:
+            if self.sample_payload():
+                self.logger.debug(f"Bulk request: {len(requests)} messages")
+            answers = self.generate_answers(requests)
+            usages = self.calculate_usages(requests, answers)
+            contents = {answer: [AnthropicContent(type="text", text=answer)] for answer in set(answers)}
+            return adapter(List[AnthropicResponse]).validate_python([
+                {
+                    "id": uuid1().hex,
+                    "type": "message",
+                    "role": "assistant",
+                    "content": contents[answer],
+                    "usage": usage,
+                    "stop_reason": "end_turn",
+                    "model": request.model
+                }
+                for request, answer, usage in zip(requests, answers, usages)
+            ])
+        except ValidationError as e:
+            self.handle_error(e, "Validation error.")
+            raise
+        except Exception as e:
+            self.handle_error(e, "An unexpected error occurred.")
+            raise
+
+    def stream_response(self, request: AnthropicRequest) -> Iterator[AnthropicStreamEvent]:
+        try:
+            if self.sample_payload():
+                self.logger.debug(f"Stream request: {request.model_dump_json()}")
+            answer = self.generate_answer(request)
+            usage = self.calculate_usage(request.messages, [answer], request.system)
+
+            yield AnthropicMessageStart(message=AnthropicResponse(
+                id=uuid1().hex,
+                content=[],
+                model=request.model,
+                usage=AnthropicUsage(input_tokens=usage.input_tokens, output_tokens=0)
+            ))
+            yield AnthropicContentBlockStart(index=0, content_block=AnthropicContent(type="text", text=""))
+            for token in self.split_tokens(answer):
+                yield AnthropicContentBlockDelta(index=0, delta=AnthropicTextDelta(text=token))
+            yield AnthropicContentBlockStop(index=0)
+            yield AnthropicMessageDelta(
+                delta=AnthropicStopDelta(stop_reason="end_turn"),
+                usage=AnthropicDeltaUsage(output_tokens=usage.output_tokens)
+            )
+            yield AnthropicMessageStop()
+        except ValidationError as e:
+            self.handle_error(e, "Validation error.")
+            raise
+        except Exception as e:
+            self.handle_error(e, "An unexpected error occurred.")
+            raise
+
+    @staticmethod
+    def completion_tokens(response: AnthropicResponse) -> int:
+        return response.usage.output_tokens
+
+    @staticmethod
+    def is_token(chunk: AnthropicStreamEvent) -> bool:
+        return chunk.type == "content_block_delta"
+
+    @staticmethod
+    def usage_tokens(response: AnthropicResponse) -> Tuple[int, int]:
+        return response.usage.input_tokens, response.usage.output_tokens
+
+    @staticmethod
+    def chunk_usage_tokens(chunk: AnthropicStreamEvent) -> Tuple[int, int]:
+        if chunk.type == "message_start":
+            return chunk.message.usage.input_tokens, 0
+        if chunk.type == "message_delta":
+            return 0, chunk.usage.output_tokens
+        return 0, 0
+
+    def prompt_tokens(self, request: AnthropicRequest, limit: Optional[int] = None) -> int:
+        overhead = len(request.messages) * TOKENS_PER_MESSAGE
+        budget = None if limit is None else limit - overhead
+        return overhead + self.tokenizer.count_within(self.prompt_texts(request.messages, request.system), budget)
+
+    def prompt_bound(self, request: AnthropicRequest) -> int:
+        texts = self.prompt_texts(request.messages, request.system)
+        return len(request.messages) * TOKENS_PER_MESSAGE + sum(map(self.tokenizer.upper_bound, texts))
+
+    @staticmethod
+    def rate_limit_headers(decision: Decision) -> Dict[str, str]:
+        headers = {}
+        if decision.limit_requests:
+            headers["anthropic-ratelimit-requests-limit"] = str(decision.limit_requests)
+            headers["anthropic-ratelimit-requests-remaining"] = str(decision.remaining_requests)
+            headers["anthropic-ratelimit-requests-reset"] = format_reset(decision.reset_requests)
+        if decision.limit_tokens:
+            headers["anthropic-ratelimit-tokens-limit"] = str(decision.limit_tokens)
+            headers["anthropic-ratelimit-tokens-remaining"] = str(decision.remaining_tokens)
+            headers["anthropic-ratelimit-tokens-reset"] = format_reset(decision.reset_tokens)
+        if not decision.allowed and decision.retryable:
+            headers["retry-after"] = str(ceil(decision.retry_after))
+        return headers
+
+    @staticmethod
+    def error_body(status: int, message: str) -> dict:
+        return {"type": "error", "error": {"type": ERROR_TYPES.get(status, "api_error"), "message": message}}
+
+    @staticmethod
+    def rate_limit_error(decision: Decision, model: str) -> Tuple[int, dict]:
+        limit = decision.limit_requests if decision.exceeded == "requests" else decision.limit_tokens
+        if not decision.retryable:
+            message = (
+                f"This request of {decision.requested} {decision.exceeded} exceeds your organization's rate limit "
+                f"of {limit} {decision.exceeded} per minute for {model} and can never succeed."
+            )
+            return 400, {"type": "error", "error": {"type": "request_too_large", "message": message}}
+        message = (
+            f"This request would exceed your organization's rate limit of {limit} {decision.exceeded} per minute "
+            f"for {model}. Please try again in {ceil(decision.retry_after)} seconds."
+        )
+        return 429, AnthropicMockClient.error_body(429, message)
+
+    @staticmethod
+    def context_error(tokens: int, max_tokens: int, window: int) -> dict:
+        message = (
+            f"input length and `max_tokens` exceed context limit: at least {tokens} + {max_tokens} > {window}, "
+            f"decrease input length or `max_tokens` and try again"
+        )
+        return AnthropicMockClient.error_body(400, message)
+
     def handle_error(self, error: Exception, message: str):
         self.logger.error(f"Error: {message} | Exception: {error}")
         raise error
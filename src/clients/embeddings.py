@@ -0,0 +1,147 @@
+from base64 import b64encode
+from hashlib import blake2b
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy
+from pydantic import ValidationError
+
+from clients.llm_client import LLMClient
+from clients.openai import OpenAIMockClient
+from models.openai import OpenAIEmbedding, OpenAIEmbeddingsRequest, OpenAIEmbeddingsResponse
+from utils.responses import adapter
+
+STEP = 0x9E3779B97F4A7C15
+MIX_1 = 0xBF58476D1CE4E5B9
+MIX_2 = 0x94D049BB133111EB
+SCALE = 2.0 ** -23
+
+Input = Union[str, List[int]]
+
+
+def input_seed(value: Input) -> int:
+    data = value.encode() if isinstance(value, str) else ",".join(map(str, value)).encode()
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), "little")
+
+
+def unit_vectors(seeds: List[int], size: int) -> numpy.ndarray:
+    steps = numpy.arange(1, size + 1, dtype=numpy.uint64) * numpy.uint64(STEP)
+    z = numpy.array(seeds, dtype=numpy.uint64)[:, None] + steps
+    z = (z ^ (z >> numpy.uint64(30))) * numpy.uint64(MIX_1)
+    z = (z ^ (z >> numpy.uint64(27))) * numpy.uint64(MIX_2)
+    z ^= z >> numpy.uint64(31)
+    values = (z >> numpy.uint64(40)).astype(numpy.float64) * SCALE - 1.0
+    norms = numpy.sqrt(numpy.einsum("ij,ij->i", values, values))
+    values /= numpy.where(norms == 0, 1.0, norms)[:, None]
+    return values.astype("<f4")
+
+
+def embed(inputs: List[Input], size: int, encoding_format: str) -> List[Union[List[float], str]]:
+    seeds = [input_seed(value) for value in inputs]
+    vectors = unit_vectors(seeds, size)
+    if encoding_format == "base64":
+        return [b64encode(vector.tobytes()).decode() for vector in vectors]
+    return vectors.tolist()
+
+
+class EmbeddingsMockClient(LLMClient):
+    provider = "embeddings"
+    response_type = OpenAIEmbeddingsResponse
+    chunk_type = OpenAIEmbedding
+    streams = False
+
+    def load(self):
+        self.logger.debug("Loaded 🚀")
+
+    def input_tokens(self, inputs: List[Input]) -> List[int]:
+        texts = [value for value in inputs if isinstance(value, str)]
+        counts = iter(self.tokenizer.count_batch(texts))
+        return [next(counts) if isinstance(value, str) else len(value) for value in inputs]
+
+    def get_response(self, request: OpenAIEmbeddingsRequest) -> OpenAIEmbeddingsResponse:
+        try:
+            if self.sample_payload():
+                self.logger.debug(f"Request: {len(request.inputs)} inputs, {request.vector_size} dimensions")
+            inputs = request.inputs
+            prompt_tokens = sum(self.input_tokens(inputs))
+            vectors = embed(inputs, request.vector_size, request.encoding_format)
+            return adapter(OpenAIEmbeddingsResponse).validate_python({
+                "object": "list",
+                "data": [
+                    {"object": "embedding", "index": index, "embedding": vector}
+                    for index, vector in enumerate(vectors)
+                ],
+                "model": request.model,
+                "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens},
+            })
+        except ValidationError as e:
+            self.handle_error(e, "Validation error.")
+            raise
+        except Exception as e:
+            self.handle_error(e, "An unexpected error occurred.")
+            raise
+
+    def stream_response(self, request: OpenAIEmbeddingsRequest) -> Iterator[OpenAIEmbedding]:
+        raise TypeError("Embeddings cannot be streamed")
+
+    @staticmethod
+    def completion_tokens(response: OpenAIEmbeddingsResponse) -> int:
+        return 0
+
+    @staticmethod
+    def is_token(chunk: OpenAIEmbedding) -> bool:
+        return False
+
+    @staticmethod
+    def usage_tokens(response: OpenAIEmbeddingsResponse) -> Tuple[int, int]:
+        return response.usage.prompt_tokens, 0
+
+    @staticmethod
+    def chunk_usage_tokens(chunk: OpenAIEmbedding) -> Tuple[int, int]:
+        return 0, 0
+
+    def prompt_tokens(self, request: OpenAIEmbeddingsRequest, limit: Optional[int] = None) -> int:
+        return sum(self.input_tokens(request.inputs))
+
+    def prompt_bound(self, request: OpenAIEmbeddingsRequest) -> int:
+        return sum(
+            self.tokenizer.upper_bound(value) if isinstance(value, str) else len(value) for value in request.inputs
+        )
+
+    def check_context(self, request: OpenAIEmbeddingsRequest) -> Tuple[Optional[int], Optional[dict]]:
+        if self.context_window is None:
+            return None, None
+        for value in request.inputs:
+            if isinstance(value, str):
+                if self.tokenizer.upper_bound(value) <= self.context_window:
+                    continue
+                tokens = self.tokenizer.count_within([value], self.context_window)
+            else:
+                tokens = len(value)
+            if tokens > self.context_window:
+                return None, self.context_error(tokens, 0, self.context_window)
+        return None, None
+
+    @staticmethod
+    def context_error(tokens: int, max_tokens: int, window: int) -> dict:
+        message = (
+            f"This model's maximum context length is {window} tokens, however you requested {tokens} tokens "
+            f"({tokens} in your prompt; {max_tokens} for the completion). Please reduce your prompt; "
+            f"or completion length."
+        )
+        error_type, code = "invalid_request_error", "context_length_exceeded"
+        return {"error": {"message": message, "type": error_type, "param": "input", "code": code}}
+
+    rate_limit_headers = staticmethod(OpenAIMockClient.rate_limit_headers)
+    error_body = staticmethod(OpenAIMockClient.error_body)
+    rate_limit_error = staticmethod(OpenAIMockClient.rate_limit_error)
+
+    def handle_error(self, error: Exception, message: str):
+        self.logger.error(f"Error: {message} | Exception: {error}")
+        raise error
+
+    @staticmethod
+    def prompt(request: OpenAIEmbeddingsRequest) -> str:
+        return next((value for value in request.inputs if isinstance(value, str)), "")
+
+    def generate_answer(self, request: OpenAIEmbeddingsRequest) -> str:
+        return ""
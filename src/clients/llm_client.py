@@ -1,19 +1,49 @@
+import asyncio
+import logging
+import re
 from abc import ABC, abstractmethod
-from typing import TypeVar
+from itertools import count
+from random import Random
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, TypeVar
 
 from pydantic import BaseModel
 
+from cassette import Recording, fingerprint, open_cassettes
+from corpus import open_corpus
+from ratelimit import Decision
+from scheduler import BatchScheduler
+from tokenization import get_tokenizer
 from utils import logger
 from utils.config import LLMConfig
+from utils.responses import adapter
 
 RequestType = TypeVar("RequestType", bound=BaseModel)
 ResponseType = TypeVar("ResponseType", bound=BaseModel)
+ChunkType = TypeVar("ChunkType", bound=BaseModel)
+
+TOKEN_PATTERN = re.compile(r"\S+")
 
 
 class LLMClient(ABC):
+    provider: str
+    response_type: type
+    chunk_type: type
+    streams = True
+
     def __init__(self, config: LLMConfig, log_level):
         self.config = config
-        self.logger = logger.setup(self.__class__.__name__, log_level)
+        self.logger = logger.setup(self.__class__.__name__, log_level, queued=config.log_queue)
+        self._log_counter = count()
+        self.latency = config.latency_profile()
+        self.rate_limit = config.rate_limit()
+        self.context_window = config.context_window()
+        self.scheduler = BatchScheduler(config.capacity_profile())
+        self._rng = Random(config.latency_seed)
+        self.tokenizer = get_tokenizer(config.tokenizer, config.tokenizer_path, config.tokenizer_cache_size)
+        self.corpus = open_corpus(config.corpus_path) if config.corpus_path else None
+        self.cassettes = None
+        if config.cassette_dir:
+            self.cassettes = open_cassettes(config.cassette_dir, config.cassette_cache_size)
         self.load()
 
     @abstractmethod
@@ -24,10 +54,169 @@ class LLMClient(ABC):
     def get_response(self, request: RequestType) -> ResponseType:
         pass
 
+    def get_responses(self, requests: List[RequestType]) -> List[ResponseType]:
+        return [self.get_response(request) for request in requests]
+
+    @abstractmethod
+    def stream_response(self, request: RequestType) -> Iterator[ChunkType]:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def completion_tokens(response: ResponseType) -> int:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def is_token(chunk: ChunkType) -> bool:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def usage_tokens(response: ResponseType) -> Tuple[int, int]:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def chunk_usage_tokens(chunk: ChunkType) -> Tuple[int, int]:
+        pass
+
+    def replay(self, request: RequestType) -> Optional[Recording]:
+        if self.cassettes is None:
+            return None
+        return self.cassettes.get(fingerprint(self.provider, request.model_dump(mode="json")))
+
+    async def aget_response(self, request: RequestType) -> ResponseType:
+        recording = self.replay(request)
+        if recording is not None and recording.response is not None:
+            response = adapter(self.response_type).validate_python(recording.response)
+            prefill, decode = recording.latency, 0.0
+        else:
+            response = self.get_response(request)
+            prefill = self.latency.first_token(self._rng)
+            decode = self.latency.decode(self._rng, self.completion_tokens(response))
+        await self.scheduler.run(prefill, decode)
+        return response
+
+    async def aget_responses(self, requests: List[RequestType]) -> List[ResponseType]:
+        recordings = [self.replay(request) for request in requests]
+        generated = iter(self.get_responses([
+            request for request, recording in zip(requests, recordings)
+            if recording is None or recording.response is None
+        ]))
+        responses, prefill, decode = [], 0.0, 0.0
+        for recording in recordings:
+            if recording is not None and recording.response is not None:
+                responses.append(adapter(self.response_type).validate_python(recording.response))
+                prefill = max(prefill, recording.latency)
+            else:
+                response = next(generated)
+                responses.append(response)
+                prefill = max(prefill, self.latency.first_token(self._rng))
+                decode = max(decode, self.latency.decode(self._rng, self.completion_tokens(response)))
+        await self.scheduler.run(prefill, decode)
+        return responses
+
+    async def astream_response(self, request: RequestType) -> AsyncIterator[ChunkType]:
+        recording = self.replay(request)
+        if recording is not None and recording.chunks:
+            chunks = adapter(self.chunk_type)
+            for recorded in recording.chunks:
+                if recorded.delay > 0:
+                    await asyncio.sleep(recorded.delay)
+                yield chunks.validate_python(recorded.data)
+            return
+        first = True
+        for chunk in self.stream_response(request):
+            if self.is_token(chunk):
+                if first:
+                    delay = self.latency.first_token(self._rng)
+                else:
+                    delay = self.latency.next_token(self._rng) * self.scheduler.slowdown()
+                first = False
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield chunk
+
+    @abstractmethod
+    def prompt_tokens(self, request: RequestType, limit: Optional[int] = None) -> int:
+        pass
+
+    @abstractmethod
+    def prompt_bound(self, request: RequestType) -> int:
+        pass
+
+    def check_context(self, request: RequestType) -> Tuple[Optional[int], Optional[dict]]:
+        if self.context_window is None:
+            return None, None
+        budget = self.context_window - request.max_tokens
+        if self.prompt_bound(request) <= budget:
+            return None, None
+        tokens = self.prompt_tokens(request, budget)
+        if tokens <= budget:
+            return tokens, None
+        return tokens, self.context_error(tokens, request.max_tokens, self.context_window)
+
+    @staticmethod
+    @abstractmethod
+    def rate_limit_headers(decision: Decision) -> Dict[str, str]:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def error_body(status: int, message: str) -> dict:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def rate_limit_error(decision: Decision, model: str) -> Tuple[int, dict]:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def context_error(tokens: int, max_tokens: int, window: int) -> dict:
+        pass
+
     @abstractmethod
     def handle_error(self, error: Exception, message: str) -> None:
         pass
 
+    def sample_payload(self) -> bool:
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return False
+        return next(self._log_counter) % self.config.log_sample_rate == 0
+
+    @staticmethod
+    @abstractmethod
+    def prompt(request: RequestType) -> str:
+        pass
+
+    @abstractmethod
+    def generate_answer(self, request: RequestType) -> str:
+        pass
+
+    def generate_answers(self, requests: List[RequestType]) -> List[str]:
+        answers: Dict[Tuple[Optional[str], int], str] = {}
+        result = []
+        for request in requests:
+            key = (self.prompt(request) if self.corpus is not None else None, request.max_tokens)
+            answer = answers.get(key)
+            if answer is None:
+                answer = answers[key] = self.generate_answer(request)
+            result.append(answer)
+        return result
+
+    def scripted_answer(self, prompt: str, default: str, max_tokens: int) -> str:
+        if self.corpus is not None:
+            answer = self.corpus.lookup(prompt)
+            if answer is not None:
+                default = answer
+        return self.trim_message(default, max_tokens)
+
+    def trim_message(self, message: str, max_tokens: int) -> str:
+        return self.tokenizer.truncate(message, max_tokens)
+
     @staticmethod
-    def trim_message(message: str, max_tokens: int) -> str:
-        return " ".join(message.split()[:max_tokens])
+    def split_tokens(message: str) -> Iterator[str]:
+        for position, token in enumerate(TOKEN_PATTERN.finditer(message)):
+            yield token.group() if position == 0 else f" {token.group()}"
@@ -1,34 +1,87 @@
+from itertools import islice
+from math import ceil
 from time import time
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 from uuid import uuid1
 
 from pydantic import ValidationError
 
 from clients.llm_client import LLMClient
-from models.openai import OpenAIRequest, OpenAIResponse, OpenAIMessage, OpenAIUsage
+from ratelimit import Decision
+from models.openai import (
+    OpenAIRequest, OpenAIResponse, OpenAIResponseMessage, OpenAIChoice, OpenAIMessage, OpenAIUsage, OpenAIChunk,
+    OpenAIChunkChoice, OpenAIChunkDelta
+)
+from utils.responses import adapter
+
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+LIMIT_NAMES = {"requests": "requests per min (RPM)", "tokens": "tokens per min (TPM)"}
+ERROR_TYPES = {
+    429: "requests", 400: "invalid_request_error", 404: "invalid_request_error", 422: "invalid_request_error"
+}
+ERROR_CODES = {429: "rate_limit_exceeded"}
+
+
+def format_reset(seconds: float) -> str:
+    if seconds < 1:
+        return f"{int(seconds * 1000)}ms"
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes)}m{seconds:.0f}s" if minutes else f"{seconds:.3g}s"
 
 
 class OpenAIMockClient(LLMClient):
+    provider = "openai"
+    response_type = OpenAIResponse
+    chunk_type = OpenAIChunk
+
     def __init__(self, config, log_level):
         super().__init__(config, log_level)
 
     def load(self):
         self.logger.debug("Loaded 🚀")
 
-    @staticmethod
-    def calculate_usage(messages: List[OpenAIMessage], response: str) -> OpenAIUsage:
-        prompt_tokens = sum(
-            len(message.role) + len(message.content.split()) for message in messages
-        )
-        completion_tokens = len(response.split())
+    def calculate_usage(self, messages: List[OpenAIMessage], response: str) -> OpenAIUsage:
+        prompt_tokens = self.tokenizer.count_within(message.content for message in messages)
+        prompt_tokens += len(messages) * TOKENS_PER_MESSAGE + TOKENS_PER_REPLY
+        completion_tokens = self.tokenizer.count(response)
         total = prompt_tokens + completion_tokens
         return OpenAIUsage(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, total_tokens=total)
 
+    def calculate_usages(self, requests: List[OpenAIRequest], answers: List[str]) -> List[OpenAIUsage]:
+        counts = iter(self.tokenizer.count_batch(
+            message.content for request in requests for message in request.messages
+        ))
+        unique = list(dict.fromkeys(answers))
+        completions = dict(zip(unique, self.tokenizer.count_batch(unique)))
+        usages: Dict[Tuple[int, int], OpenAIUsage] = {}
+        result = []
+        for request, answer in zip(requests, answers):
+            messages = len(request.messages)
+            prompt_tokens = sum(islice(counts, messages)) + messages * TOKENS_PER_MESSAGE + TOKENS_PER_REPLY
+            key = (prompt_tokens, completions[answer])
+            usage = usages.get(key)
+            if usage is None:
+                usage = usages[key] = OpenAIUsage(
+                    prompt_tokens=key[0], completion_tokens=key[1], total_tokens=key[0] + key[1]
+                )
+            result.append(usage)
+        return result
+
+    @staticmethod
+    def prompt(request: OpenAIRequest) -> str:
+        return next((message.content for message in reversed(request.messages) if message.role == "user"), "")
+
+    def generate_answer(self, request: OpenAIRequest) -> str:
+        answer = "I didn't understand that. Can you please join our premium program?"
+        return self.scripted_answer(self.prompt(request), answer, request.max_tokens)
+
     def get_response(self, request: OpenAIRequest) -> OpenAIResponse:
         try:
-            self.logger.debug(f"Request: {request.model_dump_json()}")
-            answer = "I didn't understand that. Can you please join our premium program?"
-            answer = self.trim_message(answer, request.max_tokens)
+            log_payload = self.sample_payload()
+            if log_payload:
+                self.logger.debug(f"Request: {request.model_dump_json()}")
+            answer = self.generate_answer(request)
             usage = self.calculate_usage(request.messages, answer)
 
             response = OpenAIResponse(
@@ -45,7 +98,8 @@ class OpenAIMockClient(LLMClient):
                 object="chat.completion",
                 usage=usage
             )
-            self.logger.debug(f"Response: {response.model_dump_json()}")
+            if log_payload:
+                self.logger.debug(f"Response: {response.model_dump_json()}")
 
             return response
         except ValidationError as e:
@@ -55,6 +109,145 @@ class OpenAIMockClient(LLMClient):
             self.handle_error(e, "An unexpected error occurred.")
             raise
 
+    def get_responses(self, requests: List[OpenAIRequest]) -> List[OpenAIResponse]:
+        try:
+            if self.sample_payload():
+                self.logger.debug(f"Bulk request: {len(requests)} completions")
+            answers = self.generate_answers(requests)
+            usages = self.calculate_usages(requests, answers)
+            choices = {
+                answer: [OpenAIChoice(
+                    index=0, finish_reason="stop", message=OpenAIResponseMessage(role="assistant", content=answer)
+                )]
+                for answer in set(answers)
+            }
+            created = int(time())
+            return adapter(List[OpenAIResponse]).validate_python([
+                {
+                    "id": uuid1().hex,
+                    "choices": choices[answer],
+                    "created": created,
+                    "model": request.model,
+                    "object": "chat.completion",
+                    "usage": usage
+                }
+                for request, answer, usage in zip(requests, answers, usages)
+            ])
+        except ValidationError as e:
+            self.handle_error(e, "Validation error.")
+            raise
+        except Exception as e:
+            self.handle_error(e, "An unexpected error occurred.")
+            raise
+
+    def stream_response(self, request: OpenAIRequest) -> Iterator[OpenAIChunk]:
+        try:
+            if self.sample_payload():
+                self.logger.debug(f"Stream request: {request.model_dump_json()}")
+            answer = self.generate_answer(request)
+            chunk_id = uuid1().hex
+            created = int(time())
+
+            def chunk(delta: OpenAIChunkDelta, finish_reason=None) -> OpenAIChunk:
+                return OpenAIChunk(
+                    id=chunk_id,
+                    choices=[OpenAIChunkChoice(index=0, delta=delta, finish_reason=finish_reason)],
+                    created=created,
+                    model=request.model
+                )
+
+            yield chunk(OpenAIChunkDelta(role="assistant", content=""))
+            for token in self.split_tokens(answer):
+                yield chunk(OpenAIChunkDelta(content=token))
+            yield chunk(OpenAIChunkDelta(), finish_reason="stop")
+            yield OpenAIChunk(
+                id=chunk_id,
+                choices=[],
+                created=created,
+                model=request.model,
+                usage=self.calculate_usage(request.messages, answer)
+            )
+        except ValidationError as e:
+            self.handle_error(e, "Validation error.")
+            raise
+        except Exception as e:
+            self.handle_error(e, "An unexpected error occurred.")
+            raise
+
+    @staticmethod
+    def completion_tokens(response: OpenAIResponse) -> int:
+        return response.usage.completion_tokens
+
+    @staticmethod
+    def is_token(chunk: OpenAIChunk) -> bool:
+        return bool(chunk.choices and chunk.choices[0].delta.content)
+
+    @staticmethod
+    def usage_tokens(response: OpenAIResponse) -> Tuple[int, int]:
+        return response.usage.prompt_tokens, response.usage.completion_tokens
+
+    @staticmethod
+    def chunk_usage_tokens(chunk: OpenAIChunk) -> Tuple[int, int]:
+        if chunk.usage is None:
+            return 0, 0
+        return chunk.usage.prompt_tokens, chunk.usage.completion_tokens
+
+    def prompt_tokens(self, request: OpenAIRequest, limit: Optional[int] = None) -> int:
+        overhead = len(request.messages) * TOKENS_PER_MESSAGE + TOKENS_PER_REPLY
+        budget = None if limit is None else limit - overhead
+        return overhead + self.tokenizer.count_within((message.content for message in request.messages), budget)
+
+    def prompt_bound(self, request: OpenAIRequest) -> int:
+        overhead = len(request.messages) * TOKENS_PER_MESSAGE + TOKENS_PER_REPLY
+        return overhead + sum(self.tokenizer.upper_bound(message.content) for message in request.messages)
+
+    @staticmethod
+    def rate_limit_headers(decision: Decision) -> Dict[str, str]:
+        headers = {}
+        if decision.limit_requests:
+            headers["x-ratelimit-limit-requests"] = str(decision.limit_requests)
+            headers["x-ratelimit-remaining-requests"] = str(decision.remaining_requests)
+            headers["x-ratelimit-reset-requests"] = format_reset(decision.reset_requests)
+        if decision.limit_tokens:
+            headers["x-ratelimit-limit-tokens"] = str(decision.limit_tokens)
+            headers["x-ratelimit-remaining-tokens"] = str(decision.remaining_tokens)
+            headers["x-ratelimit-reset-tokens"] = format_reset(decision.reset_tokens)
+        if not decision.allowed and decision.retryable:
+            headers["retry-after"] = str(ceil(decision.retry_after))
+        return headers
+
+    @staticmethod
+    def error_body(status: int, message: str) -> dict:
+        error_type = ERROR_TYPES.get(status, "server_error")
+        return {"error": {"message": message, "type": error_type, "param": None, "code": ERROR_CODES.get(status)}}
+
+    @staticmethod
+    def rate_limit_error(decision: Decision, model: str) -> Tuple[int, dict]:
+        limit = decision.limit_requests if decision.exceeded == "requests" else decision.limit_tokens
+        if decision.retryable:
+            status, message = 429, (
+                f"Rate limit reached for {model} on {LIMIT_NAMES[decision.exceeded]}: Limit {limit}. "
+                f"Please try again in {format_reset(decision.retry_after)}."
+            )
+        else:
+            status, message = 400, (
+                f"Request too large for {model} on {LIMIT_NAMES[decision.exceeded]}: Limit {limit}, "
+                f"Requested {decision.requested}. The request exceeds the limit and can never succeed, "
+                f"reduce its size in order to run successfully."
+            )
+        error = {"message": message, "type": decision.exceeded, "param": None, "code": "rate_limit_exceeded"}
+        return status, {"error": error}
+
+    @staticmethod
+    def context_error(tokens: int, max_tokens: int, window: int) -> dict:
+        message = (
+            f"This model's maximum context length is {window} tokens. However, you requested at least "
+            f"{tokens + max_tokens} tokens ({tokens} in the messages, {max_tokens} in the completion). "
+            f"Please reduce the length of the messages or completion."
+        )
+        error_type, code = "invalid_request_error", "context_length_exceeded"
+        return {"error": {"message": message, "type": error_type, "param": "messages", "code": code}}
+
     def handle_error(self, error: Exception, message: str):
         self.logger.error(f"Error: {message} | Exception: {error}")
         raise error
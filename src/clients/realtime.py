@@ -0,0 +1,139 @@
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional
+from uuid import uuid1
+
+from pydantic import ValidationError
+
+from clients.openai import OpenAIMockClient
+from models.openai import OpenAIMessage, OpenAIRequest
+from models.openai.realtime import (
+    RealtimeClientEvent, RealtimeContentPart, RealtimeItem, RealtimeResponse, RealtimeResponseConfig,
+    RealtimeSessionConfig, RealtimeError, RealtimeServerEvent, ErrorEvent, SessionEvent, ConversationItemCreatedEvent,
+    ResponseEvent, ResponseOutputItemEvent, ResponseContentPartEvent, ResponseTextDeltaEvent, ResponseTextDoneEvent,
+    SessionUpdateEvent, ConversationItemCreateEvent, ResponseCreateEvent
+)
+from utils.responses import adapter
+
+MAX_OUTPUT_TOKENS = 2048
+
+
+def event_id() -> str:
+    return f"event_{uuid1().hex}"
+
+
+class RealtimeSession:
+    def __init__(self, client: OpenAIMockClient, send: Callable[[RealtimeServerEvent], Awaitable[None]],
+                 max_items: int = 256, max_event_size: int = 1024 * 1024):
+        self.client = client
+        self.send = send
+        self.max_event_size = max_event_size
+        self.config = RealtimeSessionConfig(id=f"sess_{uuid1().hex}", model=client.config.model)
+        self.items: Deque[RealtimeItem] = deque(maxlen=max_items)
+        self.closed = False
+        self._response: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        await self.send(SessionEvent(event_id=event_id(), type="session.created", session=self.config))
+
+    async def handle(self, raw: str) -> None:
+        if len(raw) > self.max_event_size:
+            await self.error("invalid_request_error", f"Event exceeds {self.max_event_size} characters")
+            return
+        try:
+            event = adapter(RealtimeClientEvent).validate_json(raw)
+        except ValidationError as e:
+            await self.error("invalid_request_error", str(e), code="invalid_event")
+            return
+
+        if isinstance(event, SessionUpdateEvent):
+            update = event.session.model_dump(exclude_unset=True, exclude={"id", "object", "model"})
+            self.config = self.config.model_copy(update=update)
+            await self.send(SessionEvent(event_id=event_id(), type="session.updated", session=self.config))
+        elif isinstance(event, ConversationItemCreateEvent):
+            previous = self.items[-1].id if self.items else None
+            item = event.item.model_copy(update={"id": event.item.id or f"item_{uuid1().hex}"})
+            self.items.append(item)
+            await self.send(ConversationItemCreatedEvent(event_id=event_id(), previous_item_id=previous, item=item))
+        elif isinstance(event, ResponseCreateEvent):
+            if self._response is not None and not self._response.done():
+                await self.error("invalid_request_error", "Conversation already has an active response",
+                                 code="conversation_already_has_active_response", event=event.event_id)
+                return
+            self._response = asyncio.create_task(self.respond(event.response or RealtimeResponseConfig()))
+        elif self._response is not None and not self._response.done():
+            self._response.cancel()
+
+    async def error(self, type: str, message: str, code: Optional[str] = None, event: Optional[str] = None) -> None:
+        error = RealtimeError(type=type, code=code, message=message, event_id=event)
+        await self.send(ErrorEvent(event_id=event_id(), error=error))
+
+    async def close(self) -> None:
+        self.closed = True
+        if self._response is not None and not self._response.done():
+            self._response.cancel()
+            try:
+                await self._response
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    def request(self, config: RealtimeResponseConfig) -> OpenAIRequest:
+        instructions = config.instructions or self.config.instructions
+        messages = [OpenAIMessage(role="system", content=instructions)] if instructions else []
+        messages.extend(
+            OpenAIMessage(role=item.role, content="".join(part.text for part in item.content)) for item in self.items
+        )
+        max_tokens = config.max_response_output_tokens or self.config.max_response_output_tokens
+        return OpenAIRequest(
+            messages=messages or [OpenAIMessage(role="system", content="")],
+            model=self.config.model,
+            max_tokens=MAX_OUTPUT_TOKENS if max_tokens == "inf" else min(max_tokens, MAX_OUTPUT_TOKENS)
+        )
+
+    async def respond(self, config: RealtimeResponseConfig) -> None:
+        response = RealtimeResponse(id=f"resp_{uuid1().hex}")
+        try:
+            await self.generate(config, response)
+        except Exception as e:
+            self.client.logger.error(f"Realtime response {response.id} failed: {e}")
+            await self.error("server_error", f"The response failed: {e}")
+            failed = response.model_copy(update={"status": "failed"})
+            await self.send(ResponseEvent(event_id=event_id(), type="response.done", response=failed))
+
+    async def generate(self, config: RealtimeResponseConfig, response: RealtimeResponse) -> None:
+        item = RealtimeItem(id=f"item_{uuid1().hex}", role="assistant", status="in_progress")
+        ids = {"response_id": response.id, "item_id": item.id}
+        await self.send(ResponseEvent(event_id=event_id(), type="response.created", response=response))
+        await self.send(ResponseOutputItemEvent(
+            event_id=event_id(), type="response.output_item.added", response_id=response.id, item=item
+        ))
+        await self.send(ResponseContentPartEvent(
+            event_id=event_id(), type="response.content_part.added", part=RealtimeContentPart(type="text"), **ids
+        ))
+
+        deltas, usage, status = [], None, "completed"
+        try:
+            async for chunk in self.client.astream_response(self.request(config)):
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                elif chunk.choices and chunk.choices[0].delta.content:
+                    deltas.append(chunk.choices[0].delta.content)
+                    await self.send(ResponseTextDeltaEvent(event_id=event_id(), delta=deltas[-1], **ids))
+        except asyncio.CancelledError:
+            if self.closed:
+                raise
+            status = "cancelled"
+
+        part = RealtimeContentPart(type="text", text="".join(deltas))
+        item = item.model_copy(update={"status": "completed" if status == "completed" else "incomplete",
+                                       "content": [part]})
+        await self.send(ResponseTextDoneEvent(event_id=event_id(), text=part.text, **ids))
+        await self.send(ResponseContentPartEvent(
+            event_id=event_id(), type="response.content_part.done", part=part, **ids
+        ))
+        await self.send(ResponseOutputItemEvent(
+            event_id=event_id(), type="response.output_item.done", response_id=response.id, item=item
+        ))
+        self.items.append(item)
+        response = response.model_copy(update={"status": status, "output": [item], "usage": usage})
+        await self.send(ResponseEvent(event_id=event_id(), type="response.done", response=response))
@@ -0,0 +1,52 @@
+import logging
+from threading import Lock
+from typing import Dict, Tuple, Type
+
+from clients.anthropic import AnthropicMockClient
+from clients.embeddings import EmbeddingsMockClient
+from clients.llm_client import LLMClient
+from clients.openai import OpenAIMockClient
+from utils.config import LLMConfig
+
+PROVIDERS: Dict[str, Tuple[Type[LLMClient], str]] = {
+    "openai": (OpenAIMockClient, "sk-key"),
+    "anthropic": (AnthropicMockClient, "cl-key"),
+    "embeddings": (EmbeddingsMockClient, "sk-key"),
+}
+
+
+class ClientRegistry:
+    def __init__(self, log_level: int = logging.INFO):
+        self.log_level = log_level
+        self._clients: Dict[Tuple[str, str], LLMClient] = {}
+        self._lock = Lock()
+
+    def get(self, provider: str, model: str) -> LLMClient:
+        key = (provider, model)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._build(provider, model)
+                self._clients[key] = client
+            return client
+
+    def preload(self, provider: str, *models: str) -> None:
+        for model in models:
+            self.get(provider, model)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+
+    def _build(self, provider: str, model: str) -> LLMClient:
+        if provider not in PROVIDERS:
+            raise ValueError(f"Unknown provider: {provider}")
+        client_class, api_key = PROVIDERS[provider]
+        config = LLMConfig(api_key=api_key, model=model)
+        return client_class(config=config, log_level=self.log_level)
+
+    def __len__(self) -> int:
+        return len(self._clients)
@@ -0,0 +1,8 @@
+from functools import lru_cache
+
+from .store import Corpus, build, normalize, read_jsonl
+
+
+@lru_cache(maxsize=None)
+def open_corpus(path: str) -> Corpus:
+    return Corpus(path)
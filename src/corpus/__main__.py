@@ -0,0 +1,18 @@
+import argparse
+
+from corpus.store import build, read_jsonl
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m corpus", description="Compile a JSONL file of scripted responses into a response corpus."
+    )
+    parser.add_argument("source", help='JSONL lines with "response" and one of "prompt", "prefix" or "regex".')
+    parser.add_argument("output", help="Where the memory mapped corpus is written.")
+    args = parser.parse_args()
+    prompts, rules = build(read_jsonl(args.source), args.output)
+    print(f"Wrote {args.output}: {prompts} prompts, {rules} rules")
+
+
+if __name__ == "__main__":
+    main()
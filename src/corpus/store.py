@@ -0,0 +1,121 @@
+import json
+import mmap
+import re
+import struct
+from hashlib import blake2b
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple
+
+MAGIC = b"LLMCORP1"
+HEADER = struct.Struct("<8sIIQQ")
+SLOT = struct.Struct("<QQI")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(prompt: str) -> str:
+    return WHITESPACE.sub(" ", prompt).strip().casefold()
+
+
+def prompt_hash(prompt: str) -> int:
+    return int.from_bytes(blake2b(normalize(prompt).encode(), digest_size=8).digest(), "little") or 1
+
+
+def read_jsonl(path: str) -> Iterator[dict]:
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def build(entries: Iterable[dict], path: str) -> Tuple[int, int]:
+    exact: dict = {}
+    rules: List[dict] = []
+    data = bytearray()
+
+    def store(response: str) -> Tuple[int, int]:
+        encoded = response.encode()
+        offset = len(data)
+        data.extend(encoded)
+        return offset, len(encoded)
+
+    for number, entry in enumerate(entries, start=1):
+        if "response" not in entry:
+            raise ValueError(f"Entry {number} has no response")
+        kinds = [kind for kind in ("prompt", "prefix", "regex") if kind in entry]
+        if len(kinds) != 1:
+            raise ValueError(f"Entry {number} needs exactly one of prompt, prefix or regex")
+        kind = kinds[0]
+        if kind == "prompt":
+            digest = prompt_hash(entry["prompt"])
+            if digest not in exact:
+                exact[digest] = store(entry["response"])
+            continue
+        pattern = normalize(entry[kind]) if kind == "prefix" else entry[kind]
+        if kind == "regex":
+            re.compile(pattern)
+        offset, length = store(entry["response"])
+        rules.append({"kind": kind, "pattern": pattern, "offset": offset, "length": length})
+
+    slots = 8
+    while slots < len(exact) * 2:
+        slots *= 2
+    table = bytearray(slots * SLOT.size)
+    for digest, (offset, length) in exact.items():
+        index = digest & (slots - 1)
+        while SLOT.unpack_from(table, index * SLOT.size)[0]:
+            index = (index + 1) & (slots - 1)
+        SLOT.pack_into(table, index * SLOT.size, digest, offset, length)
+
+    encoded_rules = json.dumps(rules).encode()
+    data_offset = HEADER.size + len(table) + len(encoded_rules)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, slots, len(encoded_rules), data_offset, len(data)))
+        file.write(table)
+        file.write(encoded_rules)
+        file.write(data)
+    return len(exact), len(rules)
+
+
+class Corpus:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.slots, rules_size, self._data_offset, data_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or self._data_offset + data_size > len(self._map):
+            raise ValueError(f"{path} is not a response corpus")
+        rules_offset = HEADER.size + self.slots * SLOT.size
+        self._rules: List[Tuple[str, Pattern, int, int]] = [
+            (rule["kind"], re.compile(rule["pattern"]) if rule["kind"] == "regex" else rule["pattern"],
+             rule["offset"], rule["length"])
+            for rule in json.loads(self._map[rules_offset:rules_offset + rules_size])
+        ]
+
+    def _response(self, offset: int, length: int) -> str:
+        start = self._data_offset + offset
+        return self._map[start:start + length].decode()
+
+    def lookup(self, prompt: str) -> Optional[str]:
+        digest = prompt_hash(prompt)
+        index = digest & (self.slots - 1)
+        while True:
+            stored, offset, length = SLOT.unpack_from(self._map, HEADER.size + index * SLOT.size)
+            if stored == digest:
+                return self._response(offset, length)
+            if not stored:
+                break
+            index = (index + 1) & (self.slots - 1)
+
+        normalized = None
+        for kind, pattern, offset, length in self._rules:
+            if kind == "regex":
+                if pattern.search(prompt):
+                    return self._response(offset, length)
+                continue
+            if normalized is None:
+                normalized = normalize(prompt)
+            if normalized.startswith(pattern):
+                return self._response(offset, length)
+        return None
+
+    def close(self) -> None:
+        self._map.close()
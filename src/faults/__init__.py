@@ -0,0 +1,2 @@
+from .injector import MESSAGES, STREAM_FAULTS, DroppedConnection, FaultInjector, dropped, load_rules
+from .rules import FaultRule, FaultSchedule
@@ -0,0 +1,96 @@
+import asyncio
+from pathlib import Path
+from random import Random
+from time import monotonic
+from typing import AsyncIterator, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from pydantic import TypeAdapter
+
+from faults.rules import FaultRule
+
+MAX_CACHED_CANDIDATES = 4096
+STREAM_FAULTS = ("truncate", "stall", "disconnect")
+MESSAGES = {
+    429: "Rate limit reached, please try again later.",
+    500: "The server had an error while processing your request.",
+    503: "The service is temporarily unavailable.",
+    529: "Overloaded",
+}
+
+
+class DroppedConnection(ConnectionAbortedError):
+    pass
+
+
+def load_rules(path: str) -> List[FaultRule]:
+    return TypeAdapter(List[FaultRule]).validate_json(Path(path).read_bytes())
+
+
+class FaultInjector:
+    def __init__(self, rules: Sequence[FaultRule] = (), seed: Optional[int] = None,
+                 clock: Callable[[], float] = monotonic):
+        self.rules = list(rules)
+        self._rng = Random(seed)
+        self._clock = clock
+        self._started = clock()
+        self._api_keys: List[Optional[FrozenSet[str]]] = [
+            frozenset(rule.api_keys) if rule.api_keys is not None else None for rule in self.rules
+        ]
+        self._matches = [0] * len(self.rules)
+        self._candidates: Dict[Tuple[str, str], Tuple[int, ...]] = {}
+
+    def _compile(self, route: str, model: str) -> Tuple[int, ...]:
+        if len(self._candidates) >= MAX_CACHED_CANDIDATES:
+            self._candidates.clear()
+        candidates = tuple(
+            index for index, rule in enumerate(self.rules)
+            if (rule.routes is None or route in rule.routes) and (rule.models is None or model in rule.models)
+        )
+        self._candidates[(route, model)] = candidates
+        return candidates
+
+    def choose(self, route: str, model: str, api_key: str) -> Optional[FaultRule]:
+        if not self.rules:
+            return None
+        candidates = self._candidates.get((route, model))
+        if candidates is None:
+            candidates = self._compile(route, model)
+        for index in candidates:
+            rule = self.rules[index]
+            api_keys = self._api_keys[index]
+            if api_keys is not None and api_key not in api_keys:
+                continue
+            if rule.schedule is not None and not rule.schedule.active(self._clock() - self._started):
+                continue
+            if rule.every is not None:
+                self._matches[index] += 1
+                if self._matches[index] % rule.every:
+                    continue
+            if rule.percentage < 100 and self._rng.random() * 100 >= rule.percentage:
+                continue
+            return rule
+        return None
+
+    def delay(self, rule: FaultRule) -> float:
+        return rule.delay.sample(self._rng)
+
+    async def stream(self, events: AsyncIterator[bytes], rule: FaultRule) -> AsyncIterator[bytes]:
+        sent = 0
+        try:
+            async for event in events:
+                if sent == rule.after_chunks:
+                    if rule.kind == "truncate":
+                        return
+                    if rule.kind == "disconnect":
+                        raise DroppedConnection(f"Injected disconnect after {sent} events")
+                    if rule.kind == "stall":
+                        await asyncio.sleep(self.delay(rule))
+                yield event
+                sent += 1
+        finally:
+            await events.aclose()
+
+
+async def dropped() -> AsyncIterator[bytes]:
+    raise DroppedConnection("Injected disconnect before the body")
+    yield b""
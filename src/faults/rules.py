@@ -0,0 +1,38 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from utils.latency import LatencyDistribution
+
+
+class FaultSchedule(BaseModel):
+    period: float = Field(..., gt=0, description="Seconds after which the schedule repeats.")
+    duration: float = Field(..., gt=0, description="Seconds of every period during which the rule is active.")
+    offset: float = Field(0.0, ge=0, description="Seconds after the server start before the first period.")
+
+    def active(self, elapsed: float) -> bool:
+        elapsed -= self.offset
+        return elapsed >= 0 and elapsed % self.period < self.duration
+
+
+class FaultRule(BaseModel):
+    kind: Literal["latency", "error", "truncate", "stall", "disconnect"] = Field(
+        ...,
+        description="The injected fault: a latency spike, an error response, a stream cut short, a stream that "
+                    "pauses, or a connection dropped after the headers."
+    )
+    models: Optional[List[str]] = Field(None, description="Models the rule applies to, unset applies to any.")
+    routes: Optional[List[str]] = Field(None, description="Routes the rule applies to, unset applies to any.")
+    api_keys: Optional[List[str]] = Field(None, description="API keys the rule applies to, unset applies to any.")
+    percentage: float = Field(100.0, ge=0, le=100, description="Share of the matching requests that are affected.")
+    every: Optional[int] = Field(None, ge=1, description="Only affect every n-th matching request.")
+    schedule: Optional[FaultSchedule] = Field(None, description="Only affect requests within these time windows.")
+    delay: LatencyDistribution = Field(
+        default_factory=lambda: LatencyDistribution(value=5.0),
+        description="The added delay of 'latency' and 'stall' faults."
+    )
+    status: Literal[429, 500, 503, 529] = Field(500, description="The status code of 'error' faults.")
+    after_chunks: int = Field(
+        1, ge=0, description="Stream events sent before a 'truncate', 'stall' or 'disconnect' fault hits."
+    )
+
@@ -0,0 +1,146 @@
+import argparse
+import os
+import signal
+import socket
+from importlib.util import find_spec
+from time import monotonic, sleep
+from typing import Dict, Optional
+
+import uvicorn
+
+from utils import logger
+from utils.config import ServerConfig
+from utils.metrics import ServerMetrics
+from utils.shared import SharedCounters
+
+RESPAWN_BACKOFF = 0.5
+RESPAWN_MAX_BACKOFF = 30.0
+STABLE_UPTIME = 10.0
+
+
+def event_loop() -> str:
+    return "uvloop" if find_spec("uvloop") is not None else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if find_spec("httptools") is not None else "h11"
+
+
+def respawn_delay(failures: int) -> float:
+    return min(RESPAWN_MAX_BACKOFF, RESPAWN_BACKOFF * 2 ** (failures - 1)) if failures else 0.0
+
+
+def bind(host: str, port: int, backlog: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Launcher:
+    def __init__(self, settings: ServerConfig, workers: int, backlog: int = 2048, counter_slots: int = 4096):
+        self.settings = settings
+        self.workers = workers
+        self.backlog = backlog
+        self.counters = SharedCounters(workers, counter_slots)
+        self.logger = logger.setup(self.__class__.__name__, settings.log_level)
+        self._children: Dict[int, int] = {}
+        self._started: Dict[int, float] = {}
+        self._failures: Dict[int, int] = {}
+        self._stopping = False
+        self._server = None
+        self._socket: Optional[socket.socket] = None
+
+    def run(self) -> None:
+        import app as server
+
+        server.metrics = ServerMetrics(shared=self.counters)
+        self._server = server
+        self._socket = bind(self.settings.host, self.settings.port, self.backlog)
+        self.logger.info(
+            f"Serving on {self.settings.host}:{self.settings.port} with {self.workers} workers "
+            f"({event_loop()}, {http_protocol()})"
+        )
+        for index in range(self.workers):
+            self._spawn(index)
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            index = self._children.pop(pid, None)
+            if index is None or self._stopping:
+                continue
+            self._server.metrics.reset_gauges(index)
+            stable = monotonic() - self._started[index] >= STABLE_UPTIME
+            failures = self._failures[index] = 0 if stable else self._failures.get(index, 0) + 1
+            delay = respawn_delay(failures)
+            self.logger.warning(
+                f"Worker {index} (pid {pid}) exited with status {status}, restarting in {delay:.1f}s"
+            )
+            if self._pause(delay):
+                self._spawn(index)
+        self._socket.close()
+
+    def _pause(self, delay: float) -> bool:
+        deadline = monotonic() + delay
+        while not self._stopping and monotonic() < deadline:
+            sleep(min(0.1, max(0.0, deadline - monotonic())))
+        return not self._stopping
+
+    def _spawn(self, index: int) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = index
+            self._started[index] = monotonic()
+            return
+        status = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            self.counters.bind(index)
+            config = uvicorn.Config(
+                self._server.app, loop=event_loop(), http=http_protocol(), log_level=self.settings.log_level,
+                access_log=False
+            )
+            uvicorn.Server(config).run(sockets=[self._socket])
+        except BaseException:
+            self.logger.exception(f"Worker {index} crashed")
+            status = 1
+        finally:
+            os._exit(status)
+
+    def _stop(self, signum, _frame) -> None:
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the mock LLM server with pre-forked workers.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes to fork.")
+    parser.add_argument("--host", help="Overrides SERVER_HOST.")
+    parser.add_argument("--port", type=int, help="Overrides SERVER_PORT.")
+    parser.add_argument("--backlog", type=int, default=2048, help="Pending connections of the shared socket.")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        os.environ.setdefault("SERVER_RATE_LIMIT_STORE", "shared")
+    settings = ServerConfig()
+    if args.host:
+        settings.host = args.host
+    if args.port:
+        settings.port = args.port
+    Launcher(settings, args.workers, args.backlog).run()
+
+
+if __name__ == "__main__":
+    main()
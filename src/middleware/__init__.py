@@ -0,0 +1 @@
+from .compression import CompressionMiddleware
@@ -0,0 +1,181 @@
+import zlib
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+EXCLUDED_MEDIA_TYPES = ("text/event-stream",)
+ZSTD_MAX_RATIO = 1 << 15
+DECOMPRESSION_ERRORS = (zlib.error, zstandard.ZstdError) if zstandard is not None else (zlib.error,)
+
+
+def supported_encodings() -> tuple:
+    return (ZSTD, GZIP) if zstandard is not None else (GZIP,)
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for encoding in supported_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class Encoder:
+    def __init__(self, encoding: str, level: int):
+        if encoding == ZSTD:
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+            self._sync_flush = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._sync_flush = zlib.Z_SYNC_FLUSH
+
+    def compress(self, data: bytes, last: bool) -> bytes:
+        if last:
+            return self._compressor.compress(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(self._sync_flush)
+
+
+class Decoder:
+    def __init__(self, encoding: str, max_size: int):
+        if encoding == ZSTD:
+            self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+        else:
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._bounded = encoding == GZIP
+        self.remaining = max_size
+
+    def decompress(self, data: bytes) -> bytes:
+        try:
+            if self._bounded:
+                chunk = self._decompressor.decompress(data, self.remaining + 1)
+            else:
+                chunk = self._decompress_zstd(data)
+        except DECOMPRESSION_ERRORS:
+            raise HTTPException(status_code=400, detail="Request body could not be decompressed")
+        self.remaining -= len(chunk)
+        if self.remaining < 0:
+            raise HTTPException(status_code=413, detail="Decompressed request body is too large")
+        return chunk
+
+    def _decompress_zstd(self, data: bytes) -> bytes:
+        chunks, produced, view = [], 0, memoryview(data)
+        while view and produced <= self.remaining:
+            step = max(1, (self.remaining - produced) // ZSTD_MAX_RATIO)
+            chunk = self._decompressor.decompress(view[:step])
+            chunks.append(chunk)
+            produced += len(chunk)
+            view = view[step:]
+        return b"".join(chunks)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, zstd_level: int = 3,
+                 max_body_size: int = 64 * 1024 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {GZIP: gzip_level, ZSTD: zstd_level}
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_encoding = headers.get("content-encoding", "identity").strip().lower()
+        if content_encoding not in ("identity", ""):
+            if content_encoding not in supported_encodings():
+                response = JSONResponse({"detail": f"Unsupported Content-Encoding: {content_encoding}"}, 415)
+                await response(scope, receive, send)
+                return
+            scope = dict(scope)
+            scope["headers"] = [
+                (key, value) for key, value in scope["headers"] if key not in (b"content-encoding", b"content-length")
+            ]
+            receive = DecompressingReceive(receive, Decoder(content_encoding, self.max_body_size))
+
+        encoding = negotiate(headers.get("accept-encoding", ""))
+        if encoding is not None:
+            send = CompressingSend(send, encoding, self.levels[encoding], self.minimum_size)
+        await self.app(scope, receive, send)
+
+
+class DecompressingReceive:
+    def __init__(self, receive: Receive, decoder: Decoder):
+        self.receive = receive
+        self.decoder = decoder
+
+    async def __call__(self) -> Message:
+        message = await self.receive()
+        if message["type"] == "http.request":
+            message = dict(message)
+            message["body"] = self.decoder.decompress(message.get("body", b""))
+        return message
+
+
+class CompressingSend:
+    def __init__(self, send: Send, encoding: str, level: int, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.encoder: Optional[Encoder] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            media_type = headers.get("content-type", "").split(";")[0].strip()
+            if ("content-encoding" in headers or media_type in EXCLUDED_MEDIA_TYPES
+                    or (not more_body and len(body) < self.minimum_size)):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            self.encoder = Encoder(self.encoding, self.level)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            body = self.encoder.compress(body, last=not more_body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            await self.send(start)
+        else:
+            body = self.encoder.compress(body, last=not more_body)
+
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
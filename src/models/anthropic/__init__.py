@@ -1,2 +1,23 @@
-from .request import AnthropicRequest, AnthropicMessage
-from .response import AnthropicResponse, AnthropicContent, AnthropicUsage
+from utils.lazy import lazy_exports
+
+EXPORTS = {
+    "AnthropicRequest": ".request",
+    "AnthropicMessage": ".request",
+    "AnthropicFastRequest": ".request",
+    "AnthropicMessageView": ".request",
+    "AnthropicResponse": ".response",
+    "AnthropicContent": ".response",
+    "AnthropicUsage": ".response",
+    "AnthropicStreamEvent": ".stream",
+    "AnthropicMessageStart": ".stream",
+    "AnthropicContentBlockStart": ".stream",
+    "AnthropicContentBlockDelta": ".stream",
+    "AnthropicContentBlockStop": ".stream",
+    "AnthropicMessageDelta": ".stream",
+    "AnthropicMessageStop": ".stream",
+    "AnthropicTextDelta": ".stream",
+    "AnthropicStopDelta": ".stream",
+    "AnthropicDeltaUsage": ".stream",
+}
+__all__ = list(EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, globals(), EXPORTS)
@@ -1,9 +1,12 @@
 from typing import List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import Field
+from typing_extensions import TypedDict
 
+from ..base import DeferredModel, MessageView
 
-class AnthropicContent(BaseModel):
+
+class AnthropicContent(DeferredModel):
     type: Literal['text', 'image'] = Field(
         ...,
         description="The type of content block, either 'text' or 'image'."
@@ -14,7 +17,7 @@ class AnthropicContent(BaseModel):
     )
 
 
-class AnthropicMessage(BaseModel):
+class AnthropicMessage(DeferredModel):
     role: Literal['user', 'assistant'] = Field(
         ...,
         description="The role of the message sender, either 'user' or 'assistant'."
@@ -27,7 +30,7 @@ class AnthropicMessage(BaseModel):
     )
 
 
-class AnthropicRequest(BaseModel):
+class AnthropicRequest(DeferredModel):
     model: Literal["claude-3-5-sonnet-20241022"] = Field(
         ...,
         description="ID of the model to use."
@@ -53,6 +56,10 @@ class AnthropicRequest(BaseModel):
         le=2048,
         description="The maximum number of tokens to generate in the completion."
     )
+    stream: Optional[bool] = Field(
+        False,
+        description="Whether to incrementally stream the response using server-sent events."
+    )
 
     class ConfigDict:
         json_schema_extra = {
@@ -68,3 +75,21 @@ class AnthropicRequest(BaseModel):
                 "max_tokens": 42
             }
         }
+
+
+class AnthropicMessageFields(TypedDict):
+    role: Literal['user', 'assistant']
+    content: Union[str, List[AnthropicContent]]
+
+
+class AnthropicMessageView(MessageView):
+    __slots__ = ("role", "content")
+    fields = AnthropicMessageFields
+
+    def __init__(self, role: str, content: Union[str, List[AnthropicContent]]):
+        self.role = role
+        self.content = content
+
+
+class AnthropicFastRequest(AnthropicRequest):
+    messages: List[AnthropicMessageView] = Field(..., min_length=1)
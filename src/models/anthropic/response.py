@@ -1,9 +1,11 @@
 from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from ..base import DeferredModel
 
-class AnthropicContent(BaseModel):
+
+class AnthropicContent(DeferredModel):
     type: Literal['text', 'image'] = Field(
         ...,
         description="The type of content block: 'text', or 'image'."
@@ -14,7 +16,7 @@ class AnthropicContent(BaseModel):
     )
 
 
-class AnthropicUsage(BaseModel):
+class AnthropicUsage(DeferredModel):
     input_tokens: int = Field(
         ...,
         description="The number of tokens used in the input prompt."
@@ -25,7 +27,7 @@ class AnthropicUsage(BaseModel):
     )
 
 
-class AnthropicResponse(BaseModel):
+class AnthropicResponse(DeferredModel):
     id: str = Field(
         ...,
         description="A unique identifier for the completion response."
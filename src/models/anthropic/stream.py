@@ -0,0 +1,115 @@
+from typing import Literal, Optional, Union
+
+from pydantic import Field
+
+from ..base import DeferredModel
+from .response import AnthropicContent, AnthropicResponse
+
+
+class AnthropicMessageStart(DeferredModel):
+    type: Literal['message_start'] = Field(
+        'message_start',
+        description="The event type, always 'message_start'."
+    )
+    message: AnthropicResponse = Field(
+        ...,
+        description="The message being generated, with empty content and the input token usage."
+    )
+
+
+class AnthropicContentBlockStart(DeferredModel):
+    type: Literal['content_block_start'] = Field(
+        'content_block_start',
+        description="The event type, always 'content_block_start'."
+    )
+    index: int = Field(
+        ...,
+        description="The index of the content block in the final message."
+    )
+    content_block: AnthropicContent = Field(
+        ...,
+        description="The content block being started, with empty text."
+    )
+
+
+class AnthropicTextDelta(DeferredModel):
+    type: Literal['text_delta'] = Field(
+        'text_delta',
+        description="The delta type, always 'text_delta'."
+    )
+    text: str = Field(
+        ...,
+        description="The text fragment to append to the content block."
+    )
+
+
+class AnthropicContentBlockDelta(DeferredModel):
+    type: Literal['content_block_delta'] = Field(
+        'content_block_delta',
+        description="The event type, always 'content_block_delta'."
+    )
+    index: int = Field(
+        ...,
+        description="The index of the content block the delta applies to."
+    )
+    delta: AnthropicTextDelta = Field(
+        ...,
+        description="The incremental content of the block."
+    )
+
+
+class AnthropicContentBlockStop(DeferredModel):
+    type: Literal['content_block_stop'] = Field(
+        'content_block_stop',
+        description="The event type, always 'content_block_stop'."
+    )
+    index: int = Field(
+        ...,
+        description="The index of the content block that is complete."
+    )
+
+
+class AnthropicStopDelta(DeferredModel):
+    stop_reason: Optional[str] = Field(
+        None,
+        description="The reason why the generation of the response was stopped."
+    )
+    stop_sequence: Optional[str] = Field(
+        None,
+        description="The stop sequence that was generated, if any."
+    )
+
+
+class AnthropicDeltaUsage(DeferredModel):
+    output_tokens: int = Field(
+        ...,
+        description="The cumulative number of tokens used in the output completion."
+    )
+
+
+class AnthropicMessageDelta(DeferredModel):
+    type: Literal['message_delta'] = Field(
+        'message_delta',
+        description="The event type, always 'message_delta'."
+    )
+    delta: AnthropicStopDelta = Field(
+        ...,
+        description="The top-level changes to the message."
+    )
+    usage: AnthropicDeltaUsage = Field(
+        ...,
+        description="The cumulative output token usage."
+    )
+
+
+class AnthropicMessageStop(DeferredModel):
+    type: Literal['message_stop'] = Field(
+        'message_stop',
+        description="The event type, always 'message_stop'."
+    )
+
+
+AnthropicStreamEvent = Union[
+    AnthropicMessageStart, AnthropicContentBlockStart, AnthropicContentBlockDelta,
+    AnthropicContentBlockStop, AnthropicMessageDelta, AnthropicMessageStop
+]
@@ -0,0 +1,46 @@
+from typing import ClassVar, Iterator, Type
+
+from pydantic import BaseModel, ConfigDict, GetCoreSchemaHandler
+from pydantic_core import CoreSchema, core_schema
+
+
+class DeferredModel(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+
+class MessageView:
+    __slots__ = ()
+    fields: ClassVar[type]
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: type, handler: GetCoreSchemaHandler) -> CoreSchema:
+        fields = handler.generate_schema(cls.fields)
+        return core_schema.no_info_after_validator_function(
+            lambda data: cls(**data),
+            fields,
+            serialization=core_schema.plain_serializer_function_ser_schema(cls.as_dict, return_schema=fields)
+        )
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and self.as_dict() == other.as_dict()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.as_dict().items())})"
+
+
+def deferred_models(base: Type[BaseModel] = DeferredModel) -> Iterator[Type[BaseModel]]:
+    for model in base.__subclasses__():
+        yield model
+        yield from deferred_models(model)
+
+
+def build_models() -> int:
+    built = 0
+    for model in deferred_models():
+        if not model.__pydantic_complete__:
+            model.model_rebuild(force=True)
+            built += 1
+    return built
@@ -1,2 +1,34 @@
-from .request import OpenAIRequest, OpenAIMessage
-from .response import OpenAIResponse, OpenAIResponseMessage, OpenAIChoice, OpenAIUsage
+from utils.lazy import lazy_exports
+
+EXPORTS = {
+    "OpenAIRequest": ".request",
+    "OpenAIMessage": ".request",
+    "OpenAIFastRequest": ".request",
+    "OpenAIMessageView": ".request",
+    "OpenAIResponse": ".response",
+    "OpenAIResponseMessage": ".response",
+    "OpenAIChoice": ".response",
+    "OpenAIUsage": ".response",
+    "OpenAIChunk": ".stream",
+    "OpenAIChunkChoice": ".stream",
+    "OpenAIChunkDelta": ".stream",
+    "OpenAIFile": ".batch",
+    "OpenAIBatch": ".batch",
+    "OpenAIBatchCreate": ".batch",
+    "OpenAIBatchRequestCounts": ".batch",
+    "OpenAIBatchRequestInput": ".batch",
+    "OpenAIBatchResponse": ".batch",
+    "OpenAIBatchError": ".batch",
+    "OpenAIBatchRequestOutput": ".batch",
+    "EMBEDDING_DIMENSIONS": ".embeddings",
+    "OpenAIEmbeddingsRequest": ".embeddings",
+    "OpenAIEmbedding": ".embeddings",
+    "OpenAIEmbeddingsUsage": ".embeddings",
+    "OpenAIEmbeddingsResponse": ".embeddings",
+    "REALTIME_MODELS": ".realtime",
+    "RealtimeClientEvent": ".realtime",
+    "RealtimeItem": ".realtime",
+    "RealtimeSessionConfig": ".realtime",
+}
+__all__ = list(EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, globals(), EXPORTS)
@@ -0,0 +1,149 @@
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import Field
+
+from ..base import DeferredModel
+from .request import OpenAIRequest
+
+
+class OpenAIFile(DeferredModel):
+    id: str = Field(
+        ...,
+        description="The file identifier, which can be referenced in the API endpoints."
+    )
+    object: Literal["file"] = Field(
+        "file",
+        description="The object type, always 'file'."
+    )
+    bytes: int = Field(
+        ...,
+        description="The size of the file, in bytes."
+    )
+    created_at: int = Field(
+        ...,
+        description="The Unix timestamp (in seconds) for when the file was created."
+    )
+    filename: str = Field(
+        ...,
+        description="The name of the file."
+    )
+    purpose: Literal["batch", "batch_output"] = Field(
+        ...,
+        description="The intended purpose of the file."
+    )
+
+
+class OpenAIBatchCreate(DeferredModel):
+    input_file_id: str = Field(
+        ...,
+        description="The ID of an uploaded JSONL file containing the requests for the batch."
+    )
+    endpoint: Literal["/v1/chat/completions", "/chat/completions"] = Field(
+        ...,
+        description="The endpoint to be used for all requests in the batch."
+    )
+    completion_window: Literal["24h"] = Field(
+        "24h",
+        description="The time frame within which the batch should be processed."
+    )
+    metadata: Optional[Dict[str, str]] = Field(
+        None,
+        description="Set of key-value pairs that can be attached to the batch."
+    )
+
+
+class OpenAIBatchRequestCounts(DeferredModel):
+    total: int = Field(0, ge=0, description="Total number of requests in the batch.")
+    completed: int = Field(0, ge=0, description="Number of requests that have been completed successfully.")
+    failed: int = Field(0, ge=0, description="Number of requests that have failed.")
+
+
+class OpenAIBatch(DeferredModel):
+    id: str = Field(
+        ...,
+        description="A unique identifier for the batch."
+    )
+    object: Literal["batch"] = Field(
+        "batch",
+        description="The object type, always 'batch'."
+    )
+    endpoint: str = Field(
+        ...,
+        description="The API endpoint used by the batch."
+    )
+    input_file_id: str = Field(
+        ...,
+        description="The ID of the input file for the batch."
+    )
+    completion_window: str = Field(
+        ...,
+        description="The time frame within which the batch should be processed."
+    )
+    status: Literal[
+        "validating", "failed", "in_progress", "finalizing", "completed", "expired", "cancelling", "cancelled"
+    ] = Field(
+        "validating",
+        description="The current status of the batch."
+    )
+    output_file_id: Optional[str] = Field(
+        None,
+        description="The ID of the file containing the outputs of successfully executed requests."
+    )
+    error_file_id: Optional[str] = Field(
+        None,
+        description="The ID of the file containing the outputs of requests with errors."
+    )
+    created_at: int = Field(
+        ...,
+        description="The Unix timestamp (in seconds) for when the batch was created."
+    )
+    in_progress_at: Optional[int] = Field(None, description="When the batch started processing.")
+    finalizing_at: Optional[int] = Field(None, description="When the batch started finalizing.")
+    completed_at: Optional[int] = Field(None, description="When the batch was completed.")
+    failed_at: Optional[int] = Field(None, description="When the batch failed.")
+    cancelled_at: Optional[int] = Field(None, description="When the batch was cancelled.")
+    request_counts: OpenAIBatchRequestCounts = Field(
+        default_factory=OpenAIBatchRequestCounts,
+        description="The request counts for different statuses within the batch."
+    )
+    metadata: Optional[Dict[str, str]] = Field(
+        None,
+        description="Set of key-value pairs attached to the batch."
+    )
+
+
+class OpenAIBatchRequestInput(DeferredModel):
+    custom_id: str = Field(
+        ...,
+        description="A developer-provided per-request id used to match outputs to inputs."
+    )
+    method: Literal["POST"] = Field(
+        ...,
+        description="The HTTP method used for the request, always 'POST'."
+    )
+    url: Literal["/v1/chat/completions", "/chat/completions"] = Field(
+        ...,
+        description="The relative URL of the endpoint."
+    )
+    body: OpenAIRequest = Field(
+        ...,
+        description="The request body."
+    )
+
+
+class OpenAIBatchResponse(DeferredModel):
+    status_code: int = Field(..., description="The HTTP status code of the response.")
+    request_id: str = Field(..., description="A unique identifier for the request.")
+    body: Dict[str, Any] = Field(..., description="The JSON body of the response.")
+
+
+class OpenAIBatchError(DeferredModel):
+    code: str = Field(..., description="A machine-readable error code.")
+    message: str = Field(..., description="A human-readable error message.")
+
+
+class OpenAIBatchRequestOutput(DeferredModel):
+    id: str = Field(..., description="A unique identifier for the output line.")
+    custom_id: Optional[str] = Field(None, description="The custom_id of the matching input line.")
+    response: Optional[OpenAIBatchResponse] = Field(None, description="The response, if the request was executed.")
+    error: Optional[OpenAIBatchError] = Field(None, description="The error, if the request could not be executed.")
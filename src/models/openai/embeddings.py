@@ -0,0 +1,116 @@
+from typing import List, Literal, Optional, Union
+
+from pydantic import Field, conlist, model_validator
+
+from ..base import DeferredModel
+
+EMBEDDING_DIMENSIONS = {"text-embedding-3-small": 1536, "text-embedding-3-large": 3072, "text-embedding-ada-002": 1536}
+MAX_EMBEDDING_INPUTS = 2048
+
+
+class OpenAIEmbeddingsRequest(DeferredModel):
+    input: Union[
+        str,
+        conlist(str, min_length=1, max_length=MAX_EMBEDDING_INPUTS),
+        conlist(int, min_length=1),
+        conlist(conlist(int, min_length=1), min_length=1, max_length=MAX_EMBEDDING_INPUTS),
+    ] = Field(
+        ...,
+        description=(
+            "Input text to embed, encoded as a string or array of tokens. To embed multiple inputs in a single "
+            "request, pass an array of strings or array of token arrays."
+        )
+    )
+    model: Literal["text-embedding-3-small", "text-embedding-3-large", "text-embedding-ada-002"] = Field(
+        ...,
+        description="ID of the model to use."
+    )
+    encoding_format: Literal["float", "base64"] = Field(
+        "float",
+        description="The format to return the embeddings in. Can be either 'float' or 'base64'."
+    )
+    dimensions: Optional[int] = Field(
+        None,
+        ge=1,
+        description="The number of dimensions of the output embeddings, only supported by text-embedding-3 models."
+    )
+    user: Optional[str] = Field(
+        None,
+        description="A unique identifier representing your end-user."
+    )
+
+    @model_validator(mode="after")
+    def dimensions_must_fit_the_model(self):
+        if self.dimensions is not None:
+            if self.model == "text-embedding-ada-002":
+                raise ValueError("This model does not support specifying dimensions.")
+            if self.dimensions > EMBEDDING_DIMENSIONS[self.model]:
+                raise ValueError(f"dimensions must be at most {EMBEDDING_DIMENSIONS[self.model]} for {self.model}")
+        return self
+
+    @property
+    def inputs(self) -> List[Union[str, List[int]]]:
+        if isinstance(self.input, str) or (self.input and isinstance(self.input[0], int)):
+            return [self.input]
+        return self.input
+
+    @property
+    def vector_size(self) -> int:
+        return self.dimensions or EMBEDDING_DIMENSIONS[self.model]
+
+    @property
+    def max_tokens(self) -> int:
+        return 0
+
+    @property
+    def stream(self) -> bool:
+        return False
+
+    class ConfigDict:
+        json_schema_extra = {
+            "example": {
+                "input": ["The food was delicious and the waiter was friendly."],
+                "model": "text-embedding-3-small",
+                "encoding_format": "float"
+            }
+        }
+
+
+class OpenAIEmbedding(DeferredModel):
+    object: Literal["embedding"] = Field(
+        "embedding",
+        description="The object type, always 'embedding'."
+    )
+    index: int = Field(
+        ...,
+        ge=0,
+        description="The index of the embedding in the list of embeddings."
+    )
+    embedding: Union[List[float], str] = Field(
+        ...,
+        description="The embedding vector, a list of floats or the base64 encoded little-endian float32 buffer."
+    )
+
+
+class OpenAIEmbeddingsUsage(DeferredModel):
+    prompt_tokens: int = Field(ge=0, description="Tokens of all inputs.")
+    total_tokens: int = Field(ge=0, description="Total tokens used by the request.")
+
+
+class OpenAIEmbeddingsResponse(DeferredModel):
+    object: Literal["list"] = Field(
+        "list",
+        description="The object type, always 'list'."
+    )
+    data: List[OpenAIEmbedding] = Field(
+        ...,
+        description="The embeddings, one per input and in the order of the inputs."
+    )
+    model: str = Field(
+        ...,
+        description="The model used to generate the embeddings."
+    )
+    usage: OpenAIEmbeddingsUsage = Field(
+        ...,
+        description="Usage information of the request."
+    )
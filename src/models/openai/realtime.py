@@ -0,0 +1,179 @@
+from typing import List, Literal, Optional, Union
+
+from pydantic import Field
+from typing_extensions import Annotated
+
+from ..base import DeferredModel
+from .response import OpenAIUsage
+
+REALTIME_MODELS = ("gpt-4o-realtime-preview", "gpt-4o-realtime-preview-2024-10-01")
+
+
+class RealtimeContentPart(DeferredModel):
+    type: Literal["input_text", "text"] = Field(
+        ...,
+        description="The content type, 'input_text' for user and system items, 'text' for assistant items."
+    )
+    text: str = Field(
+        "",
+        description="The text content."
+    )
+
+
+class RealtimeItem(DeferredModel):
+    id: Optional[str] = Field(
+        None,
+        description="The unique ID of the item, generated by the server when omitted."
+    )
+    object: Literal["realtime.item"] = Field(
+        "realtime.item",
+        description="The object type, always 'realtime.item'."
+    )
+    type: Literal["message"] = Field(
+        "message",
+        description="The type of the item, only 'message' is supported."
+    )
+    status: Literal["completed", "incomplete", "in_progress"] = Field(
+        "completed",
+        description="The status of the item."
+    )
+    role: Literal["user", "assistant", "system"] = Field(
+        ...,
+        description="The role of the message sender."
+    )
+    content: List[RealtimeContentPart] = Field(
+        default_factory=list,
+        description="The content of the message."
+    )
+
+
+class RealtimeSessionConfig(DeferredModel):
+    id: Optional[str] = Field(None, description="The unique ID of the session.")
+    object: Literal["realtime.session"] = Field("realtime.session", description="Always 'realtime.session'.")
+    model: Optional[str] = Field(None, description="The realtime model used for this session.")
+    modalities: List[Literal["text", "audio"]] = Field(["text"], description="The modalities the model responds with.")
+    instructions: Optional[str] = Field(None, description="The system instructions prepended to model calls.")
+    temperature: float = Field(0.8, ge=0.6, le=1.2, description="Sampling temperature for the model.")
+    max_response_output_tokens: Union[Annotated[int, Field(ge=1)], Literal["inf"]] = Field(
+        "inf",
+        description="Maximum number of output tokens for a single assistant response, or 'inf'."
+    )
+
+
+class RealtimeResponseConfig(DeferredModel):
+    instructions: Optional[str] = Field(None, description="Instructions overriding the session ones.")
+    max_response_output_tokens: Optional[Union[Annotated[int, Field(ge=1)], Literal["inf"]]] = Field(
+        None,
+        description="Maximum number of output tokens overriding the session one."
+    )
+
+
+class RealtimeError(DeferredModel):
+    type: str = Field(..., description="The type of error.")
+    code: Optional[str] = Field(None, description="Error code, if any.")
+    message: str = Field(..., description="A human-readable error message.")
+    event_id: Optional[str] = Field(None, description="The event_id of the client event that caused the error.")
+
+
+class RealtimeResponse(DeferredModel):
+    id: str = Field(..., description="The unique ID of the response.")
+    object: Literal["realtime.response"] = Field("realtime.response", description="Always 'realtime.response'.")
+    status: Literal["in_progress", "completed", "cancelled", "incomplete", "failed"] = Field(
+        "in_progress",
+        description="The final status of the response."
+    )
+    output: List[RealtimeItem] = Field(default_factory=list, description="The list of output items.")
+    usage: Optional[OpenAIUsage] = Field(None, description="Usage statistics for the response.")
+
+
+# Client events
+
+class SessionUpdateEvent(DeferredModel):
+    event_id: Optional[str] = None
+    type: Literal["session.update"]
+    session: RealtimeSessionConfig
+
+
+class ConversationItemCreateEvent(DeferredModel):
+    event_id: Optional[str] = None
+    type: Literal["conversation.item.create"]
+    item: RealtimeItem
+
+
+class ResponseCreateEvent(DeferredModel):
+    event_id: Optional[str] = None
+    type: Literal["response.create"]
+    response: Optional[RealtimeResponseConfig] = None
+
+
+class ResponseCancelEvent(DeferredModel):
+    event_id: Optional[str] = None
+    type: Literal["response.cancel"]
+
+
+RealtimeClientEvent = Annotated[
+    Union[SessionUpdateEvent, ConversationItemCreateEvent, ResponseCreateEvent, ResponseCancelEvent],
+    Field(discriminator="type")
+]
+
+
+# Server events
+
+class RealtimeServerEvent(DeferredModel):
+    event_id: str = Field(..., description="The unique ID of the server event.")
+    type: str = Field(..., description="The event type.")
+
+
+class ErrorEvent(RealtimeServerEvent):
+    type: Literal["error"] = "error"
+    error: RealtimeError
+
+
+class SessionEvent(RealtimeServerEvent):
+    type: Literal["session.created", "session.updated"]
+    session: RealtimeSessionConfig
+
+
+class ConversationItemCreatedEvent(RealtimeServerEvent):
+    type: Literal["conversation.item.created"] = "conversation.item.created"
+    previous_item_id: Optional[str] = None
+    item: RealtimeItem
+
+
+class ResponseEvent(RealtimeServerEvent):
+    type: Literal["response.created", "response.done"]
+    response: RealtimeResponse
+
+
+class ResponseOutputItemEvent(RealtimeServerEvent):
+    type: Literal["response.output_item.added", "response.output_item.done"]
+    response_id: str
+    output_index: int = 0
+    item: RealtimeItem
+
+
+class ResponseContentPartEvent(RealtimeServerEvent):
+    type: Literal["response.content_part.added", "response.content_part.done"]
+    response_id: str
+    item_id: str
+    output_index: int = 0
+    content_index: int = 0
+    part: RealtimeContentPart
+
+
+class ResponseTextDeltaEvent(RealtimeServerEvent):
+    type: Literal["response.text.delta"] = "response.text.delta"
+    response_id: str
+    item_id: str
+    output_index: int = 0
+    content_index: int = 0
+    delta: str
+
+
+class ResponseTextDoneEvent(RealtimeServerEvent):
+    type: Literal["response.text.done"] = "response.text.done"
+    response_id: str
+    item_id: str
+    output_index: int = 0
+    content_index: int = 0
+    text: str
@@ -1,9 +1,12 @@
-from typing import List, Literal
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import Field
+from typing_extensions import TypedDict
 
+from ..base import DeferredModel, MessageView
 
-class OpenAIMessage(BaseModel):
+
+class OpenAIMessage(DeferredModel):
     role: Literal['user', 'assistant', 'system'] = Field(
         ...,
         description="The role of the message sender (e.g., 'user', 'assistant', or 'system')."
@@ -14,7 +17,7 @@ class OpenAIMessage(BaseModel):
     )
 
 
-class OpenAIRequest(BaseModel):
+class OpenAIRequest(DeferredModel):
     messages: List[OpenAIMessage] = Field(
         ...,
         description=(
@@ -49,6 +52,13 @@ class OpenAIRequest(BaseModel):
         le=2048,
         description="The maximum number of tokens to generate in the completion."
     )
+    stream: Optional[bool] = Field(
+        False,
+        description=(
+            "If set, partial message deltas will be sent as server-sent events, terminated "
+            "by a usage chunk and a `data: [DONE]` message."
+        )
+    )
 
     class ConfigDict:
         json_schema_extra = {
@@ -62,3 +72,21 @@ class OpenAIRequest(BaseModel):
                 "max_tokens": 42
             }
         }
+
+
+class OpenAIMessageFields(TypedDict):
+    role: Literal['user', 'assistant', 'system']
+    content: str
+
+
+class OpenAIMessageView(MessageView):
+    __slots__ = ("role", "content")
+    fields = OpenAIMessageFields
+
+    def __init__(self, role: str, content: str):
+        self.role = role
+        self.content = content
+
+
+class OpenAIFastRequest(OpenAIRequest):
+    messages: List[OpenAIMessageView] = Field(..., min_length=1)
@@ -1,9 +1,11 @@
 from typing import Literal, Optional
 
-from pydantic import BaseModel, Field, conlist
+from pydantic import Field, conlist
 
+from ..base import DeferredModel
 
-class OpenAIResponseMessage(BaseModel):
+
+class OpenAIResponseMessage(DeferredModel):
     role: Literal["user", "assistant", "system"] = Field(
         ...,
         description="The role of the message sender (e.g., 'user', 'assistant', or 'system')."
@@ -22,7 +24,7 @@ class OpenAIResponseMessage(BaseModel):
         }
 
 
-class OpenAIChoice(BaseModel):
+class OpenAIChoice(DeferredModel):
     finish_reason: Literal["stop", "length", "tool_calls", "content_filter", "function_call"] = Field(
         ...,
         description=(
@@ -54,7 +56,7 @@ class OpenAIChoice(BaseModel):
         }
 
 
-class OpenAIUsage(BaseModel):
+class OpenAIUsage(DeferredModel):
     prompt_tokens: int = Field(ge=0, description="Prompt token count must be >= 0")
     completion_tokens: int = Field(ge=0, description="Completion token count must be >= 0")
     total_tokens: int = Field(ge=0, description="Total token count must be >= 0")
@@ -69,7 +71,7 @@ class OpenAIUsage(BaseModel):
         }
 
 
-class OpenAIResponse(BaseModel):
+class OpenAIResponse(DeferredModel):
     id: str = Field(
         ...,
         description="A unique identifier for the chat completion."
@@ -0,0 +1,77 @@
+from typing import List, Literal, Optional
+
+from pydantic import Field
+
+from ..base import DeferredModel
+from .response import OpenAIUsage
+
+
+class OpenAIChunkDelta(DeferredModel):
+    role: Optional[Literal["assistant"]] = Field(
+        None,
+        description="The role of the author, only sent with the first chunk."
+    )
+    content: Optional[str] = Field(
+        None,
+        description="The content fragment carried by this chunk."
+    )
+
+
+class OpenAIChunkChoice(DeferredModel):
+    index: int = Field(
+        ...,
+        description="The index of the choice in the list of choices."
+    )
+    delta: OpenAIChunkDelta = Field(
+        ...,
+        description="The incremental message content of the choice."
+    )
+    finish_reason: Optional[Literal["stop", "length", "tool_calls", "content_filter", "function_call"]] = Field(
+        None,
+        description="The reason the model stopped generating tokens, only set on the last content chunk."
+    )
+
+
+class OpenAIChunk(DeferredModel):
+    id: str = Field(
+        ...,
+        description="A unique identifier for the chat completion. Each chunk has the same ID."
+    )
+    choices: List[OpenAIChunkChoice] = Field(
+        ...,
+        description="A list of chat completion choices. Empty for the final usage chunk."
+    )
+    created: int = Field(
+        ...,
+        description="The Unix timestamp (in seconds) when the chat completion was created."
+    )
+    model: str = Field(
+        ...,
+        description="The model used for the chat completion."
+    )
+    object: Literal["chat.completion.chunk"] = Field(
+        "chat.completion.chunk",
+        description="The object type, always 'chat.completion.chunk'."
+    )
+    usage: Optional[OpenAIUsage] = Field(
+        None,
+        description="Usage information, only set on the final chunk."
+    )
+
+    class ConfigDict:
+        json_schema_extra = {
+            "example": {
+                "id": "chatcmpl-12345",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": " Hello"},
+                        "finish_reason": None
+                    }
+                ],
+                "created": 1678491234,
+                "model": "gpt-4",
+                "object": "chat.completion.chunk",
+                "usage": None
+            }
+        }
@@ -0,0 +1,4 @@
+from .gcra import Decision
+from .limiter import RateLimit, RateLimiter
+from .memory import MemoryStore
+from .shared import SharedMemoryStore
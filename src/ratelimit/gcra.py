@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+WINDOW = 60.0
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    limit_requests: Optional[int]
+    remaining_requests: Optional[int]
+    reset_requests: float
+    limit_tokens: Optional[int]
+    remaining_tokens: Optional[int]
+    reset_tokens: float
+    retry_after: float
+    exceeded: Optional[str] = None
+    requested: int = 0
+    retryable: bool = True
+
+
+def _cell(tat: float, now: float, limit: Optional[int], cost: int) -> Tuple[float, bool, int, float, float]:
+    if not limit:
+        return tat, True, 0, 0.0, 0.0
+    interval = WINDOW / limit
+    new_tat = max(tat, now) + cost * interval
+    allowed = new_tat - now <= WINDOW
+    if not allowed:
+        backlog = max(tat, now) - now
+        return tat, False, int((WINDOW - backlog) / interval), new_tat - WINDOW - now, backlog
+    return new_tat, True, int((WINDOW - (new_tat - now)) / interval), 0.0, new_tat - now
+
+
+def acquire(tats: Tuple[float, float], now: float, rpm: Optional[int], tpm: Optional[int],
+            tokens: int, requests: int = 1) -> Tuple[Tuple[float, float], Decision]:
+    request_tat, requests_ok, remaining_requests, requests_wait, reset_requests = _cell(tats[0], now, rpm, requests)
+    token_tat, tokens_ok, remaining_tokens, tokens_wait, reset_tokens = _cell(tats[1], now, tpm, tokens)
+    allowed = requests_ok and tokens_ok
+    oversized = "tokens" if tpm and tokens > tpm else "requests" if rpm and requests > rpm else None
+    exceeded = oversized or (None if allowed else ("requests" if not requests_ok else "tokens"))
+    if not allowed:
+        _, _, remaining_requests, _, reset_requests = _cell(tats[0], now, rpm, 0)
+        _, _, remaining_tokens, _, reset_tokens = _cell(tats[1], now, tpm, 0)
+    decision = Decision(
+        allowed=allowed,
+        limit_requests=rpm,
+        remaining_requests=remaining_requests if rpm else None,
+        reset_requests=reset_requests,
+        limit_tokens=tpm,
+        remaining_tokens=remaining_tokens if tpm else None,
+        reset_tokens=reset_tokens,
+        retry_after=0.0 if oversized else max(requests_wait, tokens_wait),
+        exceeded=exceeded,
+        requested=tokens if exceeded == "tokens" else requests,
+        retryable=oversized is None
+    )
+    return ((request_tat, token_tat) if allowed else tats), decision
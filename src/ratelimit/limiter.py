@@ -0,0 +1,32 @@
+from time import time
+from typing import Optional, Union
+
+from pydantic import BaseModel, Field
+
+from ratelimit.gcra import Decision, acquire
+from ratelimit.memory import MemoryStore
+from ratelimit.shared import SharedMemoryStore
+
+
+class RateLimit(BaseModel):
+    rpm: Optional[int] = Field(None, gt=0, description="Requests allowed per minute, unset is unlimited.")
+    tpm: Optional[int] = Field(None, gt=0, description="Prompt plus max_tokens allowed per minute, unset is unlimited.")
+
+    @property
+    def is_unlimited(self) -> bool:
+        return self.rpm is None and self.tpm is None
+
+
+class RateLimiter:
+    def __init__(self, store: Union[MemoryStore, SharedMemoryStore]):
+        self.store = store
+
+    def acquire(self, api_key: str, model: str, limit: RateLimit, tokens: int,
+                now: Optional[float] = None, requests: int = 1, dry_run: bool = False) -> Decision:
+        now = time() if now is None else now
+
+        def update(tats):
+            charged, decision = acquire(tats, now, limit.rpm, limit.tpm, tokens, requests)
+            return (tats if dry_run else charged), decision
+
+        return self.store.update(f"{api_key}:{model}", now, update)
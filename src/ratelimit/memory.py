@@ -0,0 +1,33 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, List, Tuple, TypeVar
+from zlib import crc32
+
+Result = TypeVar("Result")
+Tats = Tuple[float, float]
+
+EMPTY: Tats = (0.0, 0.0)
+
+
+class MemoryStore:
+    def __init__(self, shards: int = 64, max_keys_per_shard: int = 4096):
+        self.max_keys_per_shard = max_keys_per_shard
+        self._locks: List[Lock] = [Lock() for _ in range(shards)]
+        self._shards: List["OrderedDict[str, Tats]"] = [OrderedDict() for _ in range(shards)]
+
+    def update(self, key: str, now: float, fn: Callable[[Tats], Tuple[Tats, Result]]) -> Result:
+        index = crc32(key.encode()) % len(self._shards)
+        shard = self._shards[index]
+        with self._locks[index]:
+            current = shard.get(key, EMPTY)
+            tats, result = fn(current)
+            if tats != current:
+                if key in shard:
+                    shard.move_to_end(key)
+                elif len(shard) >= self.max_keys_per_shard:
+                    shard.popitem(last=False)
+                shard[key] = tats
+            return result
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
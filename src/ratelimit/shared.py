@@ -0,0 +1,64 @@
+import fcntl
+import mmap
+import os
+import struct
+from hashlib import blake2b
+from threading import Lock
+from typing import Callable, List, Tuple, TypeVar
+
+Result = TypeVar("Result")
+Tats = Tuple[float, float]
+
+EMPTY: Tats = (0.0, 0.0)
+SLOT = struct.Struct("<Qdd")
+
+
+class SharedMemoryStore:
+    def __init__(self, path: str, stripes: int = 64, slots_per_stripe: int = 1024):
+        self.path = path
+        self.stripes = stripes
+        self.slots_per_stripe = slots_per_stripe
+        size = stripes * slots_per_stripe * SLOT.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        self._locks: List[Lock] = [Lock() for _ in range(stripes)]
+
+    def update(self, key: str, now: float, fn: Callable[[Tats], Tuple[Tats, Result]]) -> Result:
+        digest = int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+        stripe = digest % self.stripes
+        with self._locks[stripe]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                offset = self._find(stripe, digest, now)
+                stored, *tats = SLOT.unpack_from(self._map, offset)
+                current = tuple(tats) if stored == digest else EMPTY
+                new, result = fn(current)
+                if new != current:
+                    SLOT.pack_into(self._map, offset, digest, *new)
+                return result
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, stripe)
+
+    def _find(self, stripe: int, digest: int, now: float) -> int:
+        base = stripe * self.slots_per_stripe
+        home = (digest // self.stripes) % self.slots_per_stripe
+        reusable, victim, victim_tat = None, None, None
+        for probe in range(self.slots_per_stripe):
+            offset = (base + (home + probe) % self.slots_per_stripe) * SLOT.size
+            stored, request_tat, token_tat = SLOT.unpack_from(self._map, offset)
+            if stored == digest:
+                return offset
+            if stored == 0:
+                return offset if reusable is None else reusable
+            tat = max(request_tat, token_tat)
+            if reusable is None and tat <= now:
+                reusable = offset
+            if victim_tat is None or tat < victim_tat:
+                victim, victim_tat = offset, tat
+        return reusable if reusable is not None else victim
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
@@ -0,0 +1,2 @@
+from .batcher import BatchScheduler
+from .capacity import Capacity, Overloaded
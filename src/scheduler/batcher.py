@@ -0,0 +1,83 @@
+import asyncio
+from collections import deque
+from typing import Deque, Tuple
+
+from scheduler.capacity import Capacity, Overloaded
+
+DECODE_STEP = 0.05
+
+
+class BatchScheduler:
+    def __init__(self, capacity: Capacity):
+        self.capacity = capacity
+        self.active = 0
+        self.queued = 0
+        self._waiters: Deque[Tuple[asyncio.Future, int]] = deque()
+
+    def slowdown(self) -> float:
+        return 1.0 + self.capacity.batch_slowdown * max(0, self.active - 1)
+
+    async def acquire(self, count: int = 1) -> float:
+        capacity = self.capacity
+        if capacity.slots is None or (not self._waiters and self.active + count <= capacity.slots):
+            self.active += count
+            return 0.0
+        if count > capacity.slots:
+            raise Overloaded(f"{count} sequences do not fit in a batch of {capacity.slots} slots")
+        if self.queued + count > capacity.max_queue:
+            raise Overloaded(f"All {capacity.slots} slots are busy and {self.queued} requests are queued")
+        loop = asyncio.get_running_loop()
+        waiter = (loop.create_future(), count)
+        self._waiters.append(waiter)
+        self.queued += count
+        timer = loop.call_later(capacity.queue_timeout, self._expire, waiter) if capacity.queue_timeout else None
+        started = loop.time()
+        try:
+            await waiter[0]
+        except asyncio.CancelledError:
+            if waiter[0].cancelled():
+                self._forget(waiter)
+            else:
+                self.release(count)
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+        return loop.time() - started
+
+    def release(self, count: int = 1) -> None:
+        self.active -= count
+        self._grant()
+
+    def _grant(self) -> None:
+        while self._waiters:
+            future, count = self._waiters[0]
+            if not future.done() and self.active + count > self.capacity.slots:
+                return
+            self._waiters.popleft()
+            self.queued -= count
+            if not future.done():
+                self.active += count
+                future.set_result(None)
+
+    def _forget(self, waiter: Tuple[asyncio.Future, int]) -> None:
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+            self.queued -= waiter[1]
+            self._grant()
+
+    def _expire(self, waiter: Tuple[asyncio.Future, int]) -> None:
+        if not waiter[0].done():
+            self._forget(waiter)
+            waiter[0].set_exception(Overloaded(f"No slot became free within {self.capacity.queue_timeout}s"))
+
+    async def run(self, prefill: float, decode: float) -> None:
+        if self.capacity.batch_slowdown == 0:
+            prefill, decode = prefill + decode, 0.0
+        if prefill > 0:
+            await asyncio.sleep(prefill)
+        while decode > 0:
+            slowdown = self.slowdown()
+            step = min(decode * slowdown, DECODE_STEP)
+            await asyncio.sleep(step)
+            decode -= step / slowdown
@@ -0,0 +1,20 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class Overloaded(Exception):
+    pass
+
+
+class Capacity(BaseModel):
+    slots: Optional[int] = Field(
+        None, ge=1, description="Sequences decoded together in one continuous batch, unset is unlimited."
+    )
+    max_queue: int = Field(0, ge=0, description="Requests waiting for a free slot before new ones are rejected.")
+    queue_timeout: Optional[float] = Field(
+        None, gt=0, description="Seconds a request waits for a slot before it is rejected, unset waits until served."
+    )
+    batch_slowdown: float = Field(
+        0.0, ge=0, description="Extra time per token for every other sequence in the batch, relative to one alone."
+    )
@@ -0,0 +1,2 @@
+from .client import AsyncClient, Client, RetryPolicy
+from .errors import APIConnectionError, APIError, APIStatusError
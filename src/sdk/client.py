@@ -0,0 +1,205 @@
+import asyncio
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from importlib.util import find_spec
+from random import Random
+from time import sleep
+from typing import AsyncIterator, Iterator, Mapping, Optional, Tuple, Union
+
+import httpx
+from pydantic import BaseModel, Field
+
+from sdk.errors import APIConnectionError, APIStatusError
+from sdk.providers import PROVIDERS, auth_headers, parse_line
+from utils.responses import adapter
+
+RequestLike = Union[BaseModel, dict]
+
+
+def retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    if "retry-after-ms" in headers:
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy(BaseModel):
+    max_retries: int = Field(3, ge=0, description="Retries after the first attempt.")
+    backoff: float = Field(0.5, gt=0, description="Base delay in seconds of the exponential backoff.")
+    max_backoff: float = Field(20.0, gt=0, description="Largest backoff delay, before jitter.")
+    statuses: Tuple[int, ...] = Field(
+        (408, 409, 429, 500, 502, 503, 504, 529), description="Status codes worth retrying."
+    )
+
+    def delay(self, attempt: int, rng: Random, headers: Optional[Mapping[str, str]] = None) -> float:
+        if headers is not None:
+            wait = retry_after(headers)
+            if wait is not None:
+                return max(0.0, wait)
+        return rng.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+class BaseClient:
+    def __init__(self, base_url: str, api_key: Optional[str] = None, provider: str = "openai",
+                 upstream: bool = False, path: Optional[str] = None, timeout: float = 60.0,
+                 max_connections: int = 100, max_concurrency: Optional[int] = None, http2: Optional[bool] = None,
+                 retry: Optional[RetryPolicy] = None, seed: Optional[int] = None):
+        if provider not in PROVIDERS:
+            raise ValueError(f"Unknown provider: {provider}")
+        self.provider = PROVIDERS[provider]
+        self.path = path or self.provider.path(upstream)
+        self.retry = retry or RetryPolicy()
+        self.max_concurrency = max_concurrency or max_connections
+        self._rng = Random(seed)
+        self._options = dict(
+            base_url=base_url,
+            headers=auth_headers(provider, api_key),
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            http2=find_spec("h2") is not None if http2 is None else http2,
+        )
+
+    def _body(self, request: RequestLike, stream: bool) -> dict:
+        if not isinstance(request, BaseModel):
+            request = self.provider.request_type.model_validate(request)
+        if request.stream != stream:
+            request = request.model_copy(update={"stream": stream})
+        return request.model_dump(mode="json", exclude_none=True)
+
+    def _response(self, response: httpx.Response):
+        return adapter(self.provider.response_type).validate_json(response.content)
+
+    def _chunk(self, event: dict):
+        return adapter(self.provider.chunk_type).validate_python(event)
+
+    def _retryable(self, attempt: int, response: httpx.Response) -> bool:
+        return response.status_code in self.retry.statuses and attempt < self.retry.max_retries
+
+    @staticmethod
+    def _error(response: httpx.Response) -> APIStatusError:
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        return APIStatusError(response.status_code, body, response.headers)
+
+
+class AsyncClient(BaseClient):
+    def __init__(self, base_url: str, *args, transport: Optional[httpx.AsyncBaseTransport] = None, **kwargs):
+        super().__init__(base_url, *args, **kwargs)
+        self._http = httpx.AsyncClient(transport=transport, **self._options)
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+    async def _send(self, body: dict, stream: bool) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = await self._http.send(self._http.build_request("POST", self.path, json=body), stream=stream)
+            except httpx.TransportError as e:
+                if attempt >= self.retry.max_retries:
+                    raise APIConnectionError(str(e)) from e
+                delay = self.retry.delay(attempt, self._rng)
+            else:
+                if response.status_code < 400:
+                    return response
+                await response.aread()
+                await response.aclose()
+                if not self._retryable(attempt, response):
+                    raise self._error(response)
+                delay = self.retry.delay(attempt, self._rng, response.headers)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def create(self, request: RequestLike):
+        async with self._slots:
+            response = await self._send(self._body(request, stream=False), stream=False)
+        return self._response(response)
+
+    async def stream(self, request: RequestLike) -> AsyncIterator:
+        async with self._slots:
+            response = await self._send(self._body(request, stream=True), stream=True)
+            try:
+                async for line in response.aiter_lines():
+                    done, event = parse_line(line)
+                    if done:
+                        break
+                    if event is not None:
+                        yield self._chunk(event)
+            finally:
+                await response.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+class Client(BaseClient):
+    def __init__(self, base_url: str, *args, transport: Optional[httpx.BaseTransport] = None, **kwargs):
+        super().__init__(base_url, *args, **kwargs)
+        self._http = httpx.Client(transport=transport, **self._options)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+
+    def _send(self, body: dict, stream: bool) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = self._http.send(self._http.build_request("POST", self.path, json=body), stream=stream)
+            except httpx.TransportError as e:
+                if attempt >= self.retry.max_retries:
+                    raise APIConnectionError(str(e)) from e
+                delay = self.retry.delay(attempt, self._rng)
+            else:
+                if response.status_code < 400:
+                    return response
+                response.read()
+                response.close()
+                if not self._retryable(attempt, response):
+                    raise self._error(response)
+                delay = self.retry.delay(attempt, self._rng, response.headers)
+            attempt += 1
+            sleep(delay)
+
+    def create(self, request: RequestLike):
+        with self._slots:
+            response = self._send(self._body(request, stream=False), stream=False)
+        return self._response(response)
+
+    def stream(self, request: RequestLike) -> Iterator:
+        with self._slots:
+            response = self._send(self._body(request, stream=True), stream=True)
+            try:
+                for line in response.iter_lines():
+                    done, event = parse_line(line)
+                    if done:
+                        break
+                    if event is not None:
+                        yield self._chunk(event)
+            finally:
+                response.close()
+
+    def close(self) -> None:
+        self._http.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
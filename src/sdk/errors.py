@@ -0,0 +1,17 @@
+from typing import Mapping, Optional
+
+
+class APIError(Exception):
+    pass
+
+
+class APIConnectionError(APIError):
+    pass
+
+
+class APIStatusError(APIError):
+    def __init__(self, status_code: int, body: Optional[object], headers: Mapping[str, str]):
+        self.status_code = status_code
+        self.body = body
+        self.headers = dict(headers)
+        super().__init__(f"HTTP {status_code}: {body}")
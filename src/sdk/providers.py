@@ -0,0 +1,48 @@
+import json
+from typing import Dict, NamedTuple, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from models.anthropic import AnthropicRequest, AnthropicResponse, AnthropicStreamEvent
+from models.openai import OpenAIChunk, OpenAIRequest, OpenAIResponse
+
+ANTHROPIC_VERSION = "2023-06-01"
+SKIPPED_EVENTS = ("ping",)
+
+
+class Provider(NamedTuple):
+    request_type: Type[BaseModel]
+    response_type: type
+    chunk_type: type
+    mock_path: str
+    upstream_path: str
+
+    def path(self, upstream: bool) -> str:
+        return self.upstream_path if upstream else self.mock_path
+
+
+PROVIDERS: Dict[str, Provider] = {
+    "openai": Provider(OpenAIRequest, OpenAIResponse, OpenAIChunk, "/chat/completions", "/chat/completions"),
+    "anthropic": Provider(
+        AnthropicRequest, AnthropicResponse, AnthropicStreamEvent, "/claude/completions", "/messages"
+    ),
+}
+
+
+def auth_headers(provider: str, api_key: Optional[str]) -> Dict[str, str]:
+    if provider == "anthropic":
+        headers = {"anthropic-version": ANTHROPIC_VERSION}
+        if api_key:
+            headers["x-api-key"] = api_key
+        return headers
+    return {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+
+def parse_line(line: str) -> Tuple[bool, Optional[dict]]:
+    if not line.startswith("data:"):
+        return False, None
+    data = line[5:].strip()
+    if data == "[DONE]":
+        return True, None
+    event = json.loads(data)
+    return False, None if event.get("type") in SKIPPED_EVENTS else event
@@ -0,0 +1,18 @@
+from functools import lru_cache
+from typing import Optional
+
+from .base import ReversibleTokenizer, Tokenizer
+from .bpe import BPETokenizer, load_ranks, save_ranks, train_ranks
+from .context import CONTEXT_WINDOWS
+from .whitespace import WhitespaceTokenizer
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(name: str = "whitespace", path: Optional[str] = None, cache_size: int = 65536) -> Tokenizer:
+    if name == "whitespace":
+        return WhitespaceTokenizer()
+    if name == "bpe":
+        if not path:
+            raise ValueError("The bpe tokenizer requires a merge table path")
+        return BPETokenizer.from_file(path, cache_size)
+    raise ValueError(f"Unknown tokenizer: {name}")
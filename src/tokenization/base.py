@@ -0,0 +1,50 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, List, Optional
+
+
+class Tokenizer(ABC):
+    name: str
+
+    @abstractmethod
+    def encode(self, text: str) -> List[int]:
+        pass
+
+    def count(self, text: str) -> int:
+        return len(self.encode(text))
+
+    def encode_batch(self, texts: Iterable[str]) -> List[List[int]]:
+        return [self.encode(text) for text in texts]
+
+    def count_batch(self, texts: Iterable[str]) -> List[int]:
+        return [self.count(text) for text in texts]
+
+    def upper_bound(self, text: str) -> int:
+        return 4 * len(text)
+
+    def count_chunks(self, text: str) -> Iterator[int]:
+        yield self.count(text)
+
+    def count_within(self, texts: Iterable[str], limit: Optional[int] = None) -> int:
+        total = 0
+        for text in texts:
+            for tokens in self.count_chunks(text):
+                total += tokens
+                if limit is not None and total > limit:
+                    return total
+        return total
+
+    @abstractmethod
+    def truncate(self, text: str, max_tokens: int) -> str:
+        pass
+
+
+class ReversibleTokenizer(Tokenizer):
+    @abstractmethod
+    def decode(self, tokens: List[int]) -> str:
+        pass
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return self.decode(tokens[:max_tokens])
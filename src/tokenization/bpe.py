@@ -0,0 +1,121 @@
+import re
+from base64 import b64decode, b64encode
+from collections import Counter
+from functools import lru_cache
+from heapq import heapify, heappop, heappush
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from tokenization.base import ReversibleTokenizer
+
+PATTERN = re.compile(r"""'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d{1,3}| ?(?:[^\s\w]|_)+|\s+(?!\S)|\s+""")
+
+
+def load_ranks(path: str) -> Dict[bytes, int]:
+    ranks = {}
+    for line in Path(path).read_bytes().splitlines():
+        if line:
+            token, rank = line.split()
+            ranks[b64decode(token)] = int(rank)
+    return ranks
+
+
+def save_ranks(ranks: Dict[bytes, int], path: str) -> None:
+    lines = (b64encode(token) + b" " + str(rank).encode() for token, rank in sorted(ranks.items(), key=lambda x: x[1]))
+    Path(path).write_bytes(b"\n".join(lines) + b"\n")
+
+
+def train_ranks(texts: Iterable[str], merges: int) -> Dict[bytes, int]:
+    ranks = {bytes([byte]): byte for byte in range(256)}
+    words: Counter = Counter()
+    for text in texts:
+        words.update(piece.encode() for piece in PATTERN.findall(text))
+    vocabulary = {tuple(bytes([byte]) for byte in word): frequency for word, frequency in words.items()}
+
+    for _ in range(merges):
+        pairs: Counter = Counter()
+        for parts, frequency in vocabulary.items():
+            for pair in zip(parts, parts[1:]):
+                pairs[pair] += frequency
+        if not pairs:
+            break
+        (left, right), _ = pairs.most_common(1)[0]
+        merged = left + right
+        ranks[merged] = len(ranks)
+        vocabulary = {_merge(parts, left, right, merged): frequency for parts, frequency in vocabulary.items()}
+    return ranks
+
+
+def _merge(parts: Tuple[bytes, ...], left: bytes, right: bytes, merged: bytes) -> Tuple[bytes, ...]:
+    result, i = [], 0
+    while i < len(parts):
+        if i < len(parts) - 1 and parts[i] == left and parts[i + 1] == right:
+            result.append(merged)
+            i += 2
+        else:
+            result.append(parts[i])
+            i += 1
+    return tuple(result)
+
+
+class BPETokenizer(ReversibleTokenizer):
+    name = "bpe"
+
+    def __init__(self, ranks: Dict[bytes, int], cache_size: int = 65536):
+        missing = [byte for byte in range(256) if bytes([byte]) not in ranks]
+        if missing:
+            raise ValueError(f"Merge table lacks {len(missing)} single-byte tokens")
+        self.ranks = ranks
+        self.decoder = {rank: token for token, rank in ranks.items()}
+        self.encode_piece = lru_cache(maxsize=cache_size)(self._encode_piece)
+
+    @classmethod
+    def from_file(cls, path: str, cache_size: int = 65536) -> "BPETokenizer":
+        return cls(load_ranks(path), cache_size)
+
+    def _encode_piece(self, piece: str) -> Tuple[int, ...]:
+        data = piece.encode()
+        if data in self.ranks:
+            return self.ranks[data],
+        ranks, size = self.ranks, len(data)
+        ends = list(range(1, size + 1))
+        starts = list(range(-1, size - 1))
+        heap = [(ranks[data[i:i + 2]], i) for i in range(size - 1) if data[i:i + 2] in ranks]
+        heapify(heap)
+        while heap:
+            rank, start = heappop(heap)
+            middle = ends[start]
+            if middle <= start or middle >= size:
+                continue
+            end = ends[middle]
+            if ranks.get(data[start:end]) != rank:
+                continue
+            ends[start], ends[middle] = end, -1
+            before = starts[start]
+            if before >= 0 and data[before:end] in ranks:
+                heappush(heap, (ranks[data[before:end]], before))
+            if end < size:
+                starts[end] = start
+                if data[start:ends[end]] in ranks:
+                    heappush(heap, (ranks[data[start:ends[end]]], start))
+        tokens, start = [], 0
+        while start < size:
+            tokens.append(ranks[data[start:ends[start]]])
+            start = ends[start]
+        return tuple(tokens)
+
+    def encode(self, text: str) -> List[int]:
+        tokens = []
+        for piece in PATTERN.findall(text):
+            tokens.extend(self.encode_piece(piece))
+        return tokens
+
+    def decode(self, tokens: List[int]) -> str:
+        return b"".join(self.decoder[token] for token in tokens).decode("utf-8", errors="replace")
+
+    def count(self, text: str) -> int:
+        return sum(self.count_chunks(text))
+
+    def count_chunks(self, text: str) -> Iterator[int]:
+        for piece in PATTERN.finditer(text):
+            yield len(self.encode_piece(piece.group()))
@@ -0,0 +1,17 @@
+from typing import Dict
+
+CONTEXT_WINDOWS: Dict[str, int] = {
+    "o1-preview": 128000, "o1-preview-2024-09-12": 128000, "o1-mini": 128000, "o1-mini-2024-09-12": 128000,
+    "gpt-4o": 128000, "gpt-4o-2024-11-20": 128000, "gpt-4o-2024-08-06": 128000, "gpt-4o-2024-05-13": 128000,
+    "gpt-4o-realtime-preview": 128000, "gpt-4o-realtime-preview-2024-10-01": 128000,
+    "gpt-4o-audio-preview": 128000, "gpt-4o-audio-preview-2024-10-01": 128000,
+    "chatgpt-4o-latest": 128000, "gpt-4o-mini": 128000, "gpt-4o-mini-2024-07-18": 128000,
+    "gpt-4-turbo": 128000, "gpt-4-turbo-2024-04-09": 128000, "gpt-4-0125-preview": 128000,
+    "gpt-4-turbo-preview": 128000, "gpt-4-1106-preview": 128000, "gpt-4-vision-preview": 128000,
+    "gpt-4": 8192, "gpt-4-0314": 8192, "gpt-4-0613": 8192, "gpt-4-32k": 32768, "gpt-4-32k-0314": 32768,
+    "gpt-4-32k-0613": 32768, "gpt-3.5-turbo": 16385, "gpt-3.5-turbo-16k": 16385, "gpt-3.5-turbo-0301": 4096,
+    "gpt-3.5-turbo-0613": 4096, "gpt-3.5-turbo-1106": 16385, "gpt-3.5-turbo-0125": 16385,
+    "gpt-3.5-turbo-16k-0613": 16385,
+    "claude-3-5-sonnet-20241022": 200000,
+    "text-embedding-3-small": 8191, "text-embedding-3-large": 8191, "text-embedding-ada-002": 8191,
+}
@@ -0,0 +1,36 @@
+import re
+from typing import Iterator, List
+from zlib import crc32
+
+from tokenization.base import Tokenizer
+
+CHUNK_SIZE = 1 << 16
+SPACE = re.compile(r"\s")
+
+
+class WhitespaceTokenizer(Tokenizer):
+    name = "whitespace"
+
+    def encode(self, text: str) -> List[int]:
+        return [crc32(word.encode()) for word in text.split()]
+
+    def count(self, text: str) -> int:
+        if len(text) <= CHUNK_SIZE:
+            return len(text.split())
+        return sum(self.count_chunks(text))
+
+    def upper_bound(self, text: str) -> int:
+        return (len(text) + 1) // 2
+
+    def count_chunks(self, text: str) -> Iterator[int]:
+        start, size = 0, len(text)
+        while start < size:
+            end = start + CHUNK_SIZE
+            if end < size:
+                space = SPACE.search(text, end)
+                end = space.start() if space else size
+            yield len(text[start:end].split())
+            start = end
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        return " ".join(text.split(None, max_tokens)[:max_tokens])
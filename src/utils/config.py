@@ -1,10 +1,50 @@
-from pydantic import field_validator
-from pydantic_settings import BaseSettings
+import logging
+import os
+import tempfile
+from typing import Dict, List, Literal, Optional, Union
+
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from faults import FaultRule
+from ratelimit import RateLimit
+from scheduler import Capacity
+from tokenization.context import CONTEXT_WINDOWS
+from utils.latency import LatencyDistribution, LatencyProfile
 
 
 class LLMConfig(BaseSettings):
     api_key: str
     model: str
+    log_sample_rate: int = Field(1, ge=1, description="Log request/response payloads for 1 in N requests.")
+    log_queue: bool = Field(False, description="Hand log records to a background thread instead of writing inline.")
+    stream_tokens_per_second: Optional[float] = Field(
+        None, gt=0, description="Pace of streamed tokens. Unset streams as fast as possible."
+    )
+    latency: Dict[str, LatencyProfile] = Field(
+        default_factory=dict, description="Simulated latency per model name, '*' applies to any other model."
+    )
+    latency_seed: Optional[int] = Field(None, description="Seed of the latency sampler.")
+    tokenizer: Literal["whitespace", "bpe"] = Field("whitespace", description="Tokenizer used for usage accounting.")
+    tokenizer_path: Optional[str] = Field(None, description="Merge table of the 'bpe' tokenizer.")
+    tokenizer_cache_size: int = Field(65536, ge=0, description="Number of encoded segments kept in the LRU cache.")
+    corpus_path: Optional[str] = Field(
+        None, description="Response corpus built with 'python -m corpus', unset answers with a fixed message."
+    )
+    cassette_dir: Optional[str] = Field(
+        None, description="Replay responses recorded with 'python -m cassette' when a request matches one."
+    )
+    cassette_cache_size: int = Field(1024, ge=0, description="Recordings kept decoded in the LRU cache.")
+    rate_limits: Dict[str, RateLimit] = Field(
+        default_factory=dict, description="Limits per api_key and minute by model name, '*' applies to any other model."
+    )
+    context_windows: Dict[str, Optional[int]] = Field(
+        default_factory=dict,
+        description="Context window in tokens by model name, '*' applies to any other model, null disables the check."
+    )
+    capacity: Dict[str, Capacity] = Field(
+        default_factory=dict, description="Simulated serving capacity by model name, '*' applies to any other model."
+    )
 
     @field_validator('api_key')
     def api_key_must_not_be_empty(cls, v):
@@ -17,3 +57,80 @@ class LLMConfig(BaseSettings):
         if not v or not v.strip():
             raise ValueError('Model name must not be empty')
         return v
+
+    def latency_profile(self) -> LatencyProfile:
+        profile = self.latency.get(self.model) or self.latency.get("*")
+        if profile is not None:
+            return profile
+        if self.stream_tokens_per_second:
+            per_token = LatencyDistribution(value=1 / self.stream_tokens_per_second)
+            return LatencyProfile(time_per_token=per_token)
+        return LatencyProfile()
+
+    def rate_limit(self) -> RateLimit:
+        return self.rate_limits.get(self.model) or self.rate_limits.get("*") or RateLimit()
+
+    def context_window(self) -> Optional[int]:
+        for name in (self.model, "*"):
+            if name in self.context_windows:
+                return self.context_windows[name]
+        return CONTEXT_WINDOWS.get(self.model)
+
+    def capacity_profile(self) -> Capacity:
+        return self.capacity.get(self.model) or self.capacity.get("*") or Capacity()
+
+
+class ServerConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="SERVER_")
+
+    host: str = "0.0.0.0"
+    port: int = 8000
+    log_level: int = logging.INFO
+    compression_min_size: int = Field(1024, ge=0, description="Smallest response body worth compressing.")
+    gzip_level: int = Field(6, ge=1, le=9)
+    zstd_level: int = Field(3, ge=1, le=22)
+    max_request_body_size: int = Field(64 * 1024 * 1024, ge=1, description="Limit of a decompressed request body.")
+    fast_responses: bool = Field(
+        True, description="Encode response models to JSON once instead of re-validating them through FastAPI."
+    )
+    fast_requests: bool = Field(
+        False, description="Validate JSON request bodies in one pass into lightweight message views."
+    )
+    warmup: bool = Field(
+        False, description="Build the deferred models and the OpenAPI document at startup instead of on first use."
+    )
+    data_dir: str = Field(
+        os.path.join(tempfile.gettempdir(), "llm_test"), description="Where uploaded and batch output files are kept."
+    )
+    batch_workers: Optional[int] = Field(None, ge=1, description="Batch worker processes, defaults to the CPU count.")
+    batch_chunk_size: int = Field(256, ge=1, description="Number of batch requests sent to a worker at once.")
+    realtime_max_items: int = Field(256, ge=1, description="Conversation items kept per realtime session.")
+    realtime_send_buffer: int = Field(64, ge=1, description="Server events queued per realtime connection.")
+    realtime_max_event_size: int = Field(1024 * 1024, ge=1, description="Largest accepted realtime client event.")
+    rate_limit_store: Literal["memory", "shared"] = Field(
+        "memory", description="Keep rate limit state per process, or in a file mapped by every worker."
+    )
+    rate_limit_path: str = Field(
+        os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "llm_test.ratelimit"),
+        description="The memory mapped file of the 'shared' rate limit store."
+    )
+    rate_limit_shards: int = Field(64, ge=1, description="Independently locked partitions of the rate limit state.")
+    rate_limit_keys_per_shard: int = Field(4096, ge=1, description="Keys tracked per partition before evicting.")
+    faults: List[FaultRule] = Field(default_factory=list, description="Fault injection rules, the first match wins.")
+    faults_path: Optional[str] = Field(None, description="A JSON file of fault injection rules tried after 'faults'.")
+    fault_seed: Optional[int] = Field(None, description="Seed of the fault injection sampler.")
+    response_cache: bool = Field(
+        False, description="Serve repeated requests, or retries with the same Idempotency-Key, from a response cache."
+    )
+    response_cache_entries: int = Field(1024, ge=0, description="Responses kept in the cache before evicting.")
+    response_cache_bytes: int = Field(64 * 1024 * 1024, ge=0, description="Encoded bytes kept in the cache.")
+    response_cache_ttl: Optional[float] = Field(300.0, gt=0, description="Seconds a cached response stays valid.")
+
+    @field_validator('log_level', mode='before')
+    def log_level_from_name(cls, v: Union[int, str]):
+        if isinstance(v, str) and not v.isdigit():
+            level = logging.getLevelName(v.upper())
+            if not isinstance(level, int):
+                raise ValueError(f'Unknown log level: {v}')
+            return level
+        return v
@@ -0,0 +1,87 @@
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+from random import Random
+from typing import List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, Field, model_validator
+
+
+@lru_cache(maxsize=None)
+def load_histogram(path: str) -> Tuple[List[float], List[int]]:
+    values, counts = [], []
+    for line in Path(path).read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        value, count = line.replace(",", " ").split()
+        values.append(float(value))
+        counts.append(int(count))
+    if not values or sum(counts) <= 0:
+        raise ValueError(f"Histogram {path} has no samples")
+    return values, list(accumulate(counts))
+
+
+class LatencyDistribution(BaseModel):
+    kind: Literal["fixed", "normal", "lognormal", "histogram"] = Field(
+        "fixed",
+        description="The distribution the delay in seconds is drawn from."
+    )
+    value: float = Field(0.0, ge=0, description="The delay of a 'fixed' distribution.")
+    mean: float = Field(0.0, description="The mean of a 'normal' distribution.")
+    stddev: float = Field(0.0, ge=0, description="The standard deviation of a 'normal' distribution.")
+    mu: float = Field(0.0, description="The mean of the underlying normal of a 'lognormal' distribution.")
+    sigma: float = Field(0.0, ge=0, description="The standard deviation of the underlying normal of a 'lognormal'.")
+    path: Optional[str] = Field(
+        None,
+        description="A file of '<seconds> <count>' lines replayed by a 'histogram' distribution."
+    )
+
+    @model_validator(mode="after")
+    def histogram_must_have_path(self):
+        if self.kind == "histogram":
+            if not self.path:
+                raise ValueError("A histogram distribution requires a path")
+            load_histogram(self.path)
+        return self
+
+    @property
+    def is_zero(self) -> bool:
+        return self.kind == "fixed" and self.value == 0
+
+    def sample(self, rng: Random) -> float:
+        if self.kind == "fixed":
+            return self.value
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(self.mean, self.stddev))
+        if self.kind == "lognormal":
+            return rng.lognormvariate(self.mu, self.sigma)
+        values, cumulative = load_histogram(self.path)
+        return values[bisect_left(cumulative, rng.random() * cumulative[-1])]
+
+
+class LatencyProfile(BaseModel):
+    time_to_first_token: LatencyDistribution = Field(
+        default_factory=LatencyDistribution,
+        description="The delay before the first token is produced."
+    )
+    time_per_token: LatencyDistribution = Field(
+        default_factory=LatencyDistribution,
+        description="The delay between two consecutive tokens."
+    )
+
+    def first_token(self, rng: Random) -> float:
+        return self.time_to_first_token.sample(rng)
+
+    def next_token(self, rng: Random) -> float:
+        return self.time_per_token.sample(rng)
+
+    def decode(self, rng: Random, tokens: int) -> float:
+        if tokens > 1 and not self.time_per_token.is_zero:
+            return sum(self.next_token(rng) for _ in range(tokens - 1))
+        return 0.0
+
+    def total(self, rng: Random, tokens: int) -> float:
+        delay = self.first_token(rng)
+        return delay + self.decode(rng, tokens)
@@ -1,12 +1,42 @@
+import atexit
 import logging
 from logging import Logger
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Optional
 
+FORMAT = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
 
-def setup(name: str, level: int = logging.INFO) -> Logger:
+_queue: Optional[SimpleQueue] = None
+_listener: Optional[QueueListener] = None
+
+
+def _stream_handler() -> logging.Handler:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(FORMAT))
+    return handler
+
+
+def _queue_handler() -> logging.Handler:
+    global _queue, _listener
+    if _listener is None:
+        _queue = SimpleQueue()
+        _listener = QueueListener(_queue, _stream_handler(), respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown)
+    return QueueHandler(_queue)
+
+
+def shutdown() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup(name: str, level: int = logging.INFO, queued: bool = False) -> Logger:
     logger = logging.getLogger(name)
     if not logger.hasHandlers():
-        handler = logging.StreamHandler()
-        handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s'))
-        logger.addHandler(handler)
+        logger.addHandler(_queue_handler() if queued else _stream_handler())
     logger.setLevel(level)
     return logger
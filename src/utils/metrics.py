@@ -0,0 +1,318 @@
+import json
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from utils.shared import SharedCounters
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+ChunkType = TypeVar("ChunkType")
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class CounterChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class GaugeChild(CounterChild):
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class HistogramChild:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class SharedChild:
+    def __init__(self, counters: SharedCounters, key: str):
+        self._counters = counters
+        self._key = key
+        self._offset = counters.slot(key)
+
+    @property
+    def value(self) -> float:
+        return self._counters.total(self._key)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._counters.add(self._offset, amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._counters.add(self._offset, -amount)
+
+    def set(self, value: float) -> None:
+        self._counters.set(self._offset, value)
+
+
+class SharedHistogramChild:
+    def __init__(self, counters: SharedCounters, key: str, buckets: Sequence[float]):
+        self.buckets = buckets
+        self._counters = counters
+        self._offsets = [counters.slot(f"{key}\t{index}") for index in range(len(buckets) + 1)]
+        self._sum = counters.slot(f"{key}\tsum")
+
+    def observe(self, value: float) -> None:
+        self._counters.add(self._offsets[bisect_left(self.buckets, value)], 1)
+        self._counters.add(self._sum, value)
+
+
+class Metric(ABC):
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 shared: Optional[SharedCounters] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.shared = shared
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = Lock()
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._child(values)
+        return child
+
+    def _key(self, values: Tuple[str, ...]) -> str:
+        return f"{self.name}\t{json.dumps(values)}"
+
+    def _child(self, values: Tuple[str, ...]):
+        if self.shared is not None:
+            return SharedChild(self.shared, self._key(values))
+        return self._local_child()
+
+    @abstractmethod
+    def _local_child(self):
+        pass
+
+    def series(self) -> Dict[Tuple[str, ...], float]:
+        if self.shared is None:
+            return {values: child.value for values, child in list(self._children.items())}
+        return {tuple(json.loads(labels)): value for labels, value in self.shared.totals(self.name).items()}
+
+    def samples(self) -> Iterable[str]:
+        for values, value in self.series().items():
+            yield f"{self.name}{format_labels(self.labelnames, values)} {value}"
+
+    def expose(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def _local_child(self) -> CounterChild:
+        return CounterChild()
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def _local_child(self) -> GaugeChild:
+        return GaugeChild()
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, shared: Optional[SharedCounters] = None):
+        super().__init__(name, documentation, labelnames, shared)
+        self.buckets = tuple(sorted(buckets))
+
+    def _child(self, values: Tuple[str, ...]):
+        if self.shared is not None:
+            return SharedHistogramChild(self.shared, self._key(values), self.buckets)
+        return self._local_child()
+
+    def _local_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def series(self) -> Dict[Tuple[str, ...], Tuple[List[int], float]]:
+        if self.shared is None:
+            return {values: (child.counts, child.sum) for values, child in list(self._children.items())}
+        series: Dict[Tuple[str, ...], list] = {}
+        for key, value in self.shared.totals(self.name).items():
+            labels, part = key.rsplit("\t", 1)
+            entry = series.setdefault(tuple(json.loads(labels)), [[0] * (len(self.buckets) + 1), 0.0])
+            if part == "sum":
+                entry[1] = value
+            else:
+                entry[0][int(part)] = int(value)
+        return {values: (counts, total) for values, (counts, total) in series.items()}
+
+    def samples(self) -> Iterable[str]:
+        names = self.labelnames + ("le",)
+        for values, (counts, total) in self.series().items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket{format_labels(names, values + (le,))} {cumulative}"
+            labels = format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {total}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class RouteMetrics:
+    def __init__(self, metrics: "ServerMetrics", route: str, model: str):
+        self.route = route
+        self.model = model
+        self.requests = metrics.requests.labels(route, model)
+        self.latency = metrics.latency.labels(route, model)
+        self.in_flight = metrics.in_flight.labels(route, model)
+        self.input_tokens = metrics.input_tokens.labels(route, model)
+        self.output_tokens = metrics.output_tokens.labels(route, model)
+        self.queue_depth = metrics.queue_depth.labels(route, model)
+        self.queue_wait = metrics.queue_wait.labels(route, model)
+        self._errors = metrics.errors
+        self._error_children: Dict[str, CounterChild] = {}
+        self._cache = {True: metrics.cache_hits, False: metrics.cache_misses}
+        self._cache_children: Dict[bool, CounterChild] = {}
+
+    def start(self) -> float:
+        self.in_flight.inc()
+        return perf_counter()
+
+    def finish(self, started: float, input_tokens: int = 0, output_tokens: int = 0) -> None:
+        self.in_flight.dec()
+        self.latency.observe(perf_counter() - started)
+        self.requests.inc()
+        self.input_tokens.inc(input_tokens)
+        self.output_tokens.inc(output_tokens)
+
+    def fail(self, started: float, error: Union[str, BaseException]) -> None:
+        self.in_flight.dec()
+        self.latency.observe(perf_counter() - started)
+        self.requests.inc()
+        self.error(error if isinstance(error, str) else type(error))
+
+    def error(self, error: Union[str, type]) -> None:
+        label = error if isinstance(error, str) else error.__name__
+        child = self._error_children.get(label)
+        if child is None:
+            child = self._error_children.setdefault(label, self._errors.labels(self.route, self.model, label))
+        child.inc()
+
+    def cached(self, hit: bool) -> None:
+        child = self._cache_children.get(hit)
+        if child is None:
+            child = self._cache_children.setdefault(hit, self._cache[hit].labels(self.route, self.model))
+        child.inc()
+
+    def stream(self, started: float, chunks: AsyncIterator[ChunkType],
+               usage: Callable[[ChunkType], Tuple[int, int]]) -> "ObservedStream":
+        return ObservedStream(self, started, chunks, usage)
+
+
+class ObservedStream:
+    def __init__(self, metrics: RouteMetrics, started: float, chunks: AsyncIterator[ChunkType],
+                 usage: Callable[[ChunkType], Tuple[int, int]]):
+        self.metrics = metrics
+        self.started = started
+        self.input_tokens = self.output_tokens = 0
+        self.closed = False
+        self._chunks = chunks
+        self._usage = usage
+
+    def __aiter__(self) -> AsyncIterator[ChunkType]:
+        return self._observe()
+
+    async def _observe(self) -> AsyncIterator[ChunkType]:
+        try:
+            async for chunk in self._chunks:
+                tokens = self._usage(chunk)
+                self.input_tokens += tokens[0]
+                self.output_tokens += tokens[1]
+                yield chunk
+        except BaseException as e:
+            self.close(e)
+            raise
+        self.close()
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if error is None:
+            self.metrics.finish(self.started, self.input_tokens, self.output_tokens)
+        else:
+            self.metrics.fail(self.started, error)
+
+
+class ServerMetrics:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, shared: Optional[SharedCounters] = None):
+        labels = ("route", "model")
+        self.requests = Counter("llm_requests_total", "Completed requests.", labels, shared)
+        self.errors = Counter(
+            "llm_request_errors_total", "Failed requests by exception type.", labels + ("error",), shared
+        )
+        self.latency = Histogram(
+            "llm_request_duration_seconds", "Request latency in seconds.", labels, buckets, shared
+        )
+        self.in_flight = Gauge("llm_requests_in_flight", "Requests currently being served.", labels, shared)
+        self.input_tokens = Counter("llm_input_tokens_total", "Prompt tokens received.", labels, shared)
+        self.output_tokens = Counter("llm_output_tokens_total", "Completion tokens produced.", labels, shared)
+        self.queue_depth = Gauge("llm_queue_depth", "Requests waiting for a batch slot.", labels, shared)
+        self.queue_wait = Histogram(
+            "llm_queue_wait_seconds", "Seconds spent waiting for a batch slot.", labels, buckets, shared
+        )
+        self.cache_hits = Counter("llm_cache_hits_total", "Responses served from the response cache.", labels, shared)
+        self.cache_misses = Counter("llm_cache_misses_total", "Responses computed and cached.", labels, shared)
+        self.metrics: List[Metric] = [
+            self.requests, self.errors, self.latency, self.in_flight, self.input_tokens, self.output_tokens,
+            self.queue_depth, self.queue_wait, self.cache_hits, self.cache_misses
+        ]
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def route(self, route: str, model: str) -> RouteMetrics:
+        bound = self._routes.get((route, model))
+        if bound is None:
+            bound = self._routes.setdefault((route, model), RouteMetrics(self, route, model))
+        return bound
+
+    def reset_gauges(self, worker: int) -> None:
+        for metric in self.metrics:
+            if isinstance(metric, Gauge) and metric.shared is not None:
+                metric.shared.reset(worker, metric.name)
+
+    def expose(self) -> str:
+        return "\n".join(metric.expose() for metric in self.metrics) + "\n"
@@ -0,0 +1,44 @@
+from typing import Callable, Dict, List, Optional, Type, get_args, get_origin
+
+from fastapi.routing import APIRoute
+from pydantic import ValidationError
+from starlette.requests import Request
+
+from utils.responses import adapter
+
+
+def is_json(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return True
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type == "application/json" or (media_type.startswith("application/") and media_type.endswith("+json"))
+
+
+def fast_type(annotation, fast_types: Dict[type, type]) -> Optional[type]:
+    if get_origin(annotation) is list:
+        item = fast_types.get(get_args(annotation)[0])
+        return None if item is None else List[item]
+    return fast_types.get(annotation)
+
+
+def fast_body_route(fast_types: Dict[type, type], enabled: Callable[[], bool]) -> Type[APIRoute]:
+    class FastBodyRoute(APIRoute):
+        def get_route_handler(self) -> Callable:
+            handler = super().get_route_handler()
+            target = fast_type(self.body_field.type_, fast_types) if self.body_field is not None else None
+            if target is None:
+                return handler
+
+            async def route_handler(request: Request):
+                if enabled() and is_json(request.headers.get("content-type")):
+                    body = await request.body()
+                    if body:
+                        try:
+                            request._json = adapter(target).validate_json(body)
+                        except ValidationError:
+                            pass
+                return await handler(request)
+
+            return route_handler
+
+    return FastBodyRoute
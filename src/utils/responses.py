@@ -0,0 +1,37 @@
+from functools import lru_cache
+from typing import Callable, List, Type, Union
+
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+@lru_cache(maxsize=None)
+def adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+class ModelResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Union[BaseModel, List[BaseModel]]) -> bytes:
+        if isinstance(content, list):
+            return adapter(List[type(content[0])]).dump_json(content) if content else b"[]"
+        return adapter(type(content)).dump_json(content)
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    def __init__(self, content, on_close: Callable[[], None], **kwargs):
+        super().__init__(content, **kwargs)
+        self._on_close = on_close
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close()
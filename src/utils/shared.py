@@ -0,0 +1,97 @@
+import mmap
+import struct
+from collections import defaultdict
+from hashlib import blake2b
+from threading import Lock
+from typing import Dict
+
+DIGEST = struct.Struct("<Q")
+VALUE = struct.Struct("<d")
+NAME_SIZE = 240
+SLOT_SIZE = DIGEST.size + VALUE.size + NAME_SIZE
+
+
+class SharedCounters:
+    def __init__(self, workers: int, slots: int = 4096):
+        self.workers = workers
+        self.slots = slots
+        self.worker = 0
+        self._map = mmap.mmap(-1, workers * slots * SLOT_SIZE)
+        self._offsets: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def bind(self, worker: int) -> None:
+        self.worker = worker
+        self._offsets = {}
+        self._lock = Lock()
+
+    def slot(self, key: str) -> int:
+        offset = self._offsets.get(key)
+        if offset is None:
+            with self._lock:
+                offset = self._offsets.get(key)
+                if offset is None:
+                    offset = self._offsets[key] = self._allocate(key)
+        return offset
+
+    def _allocate(self, key: str) -> int:
+        encoded = key.encode()
+        digest = self._digest(encoded)
+        base = self.worker * self.slots
+        home = digest % self.slots
+        for probe in range(self.slots):
+            offset = (base + (home + probe) % self.slots) * SLOT_SIZE
+            stored = DIGEST.unpack_from(self._map, offset)[0]
+            if stored == digest:
+                return offset
+            if stored == 0:
+                name = DIGEST.size + VALUE.size
+                self._map[offset + name:offset + name + NAME_SIZE] = encoded[:NAME_SIZE].ljust(NAME_SIZE, b"\0")
+                DIGEST.pack_into(self._map, offset, digest)
+                return offset
+        raise RuntimeError(f"No free shared counter slot for worker {self.worker}")
+
+    @staticmethod
+    def _digest(encoded: bytes) -> int:
+        return int.from_bytes(blake2b(encoded, digest_size=8).digest(), "little") or 1
+
+    def add(self, offset: int, amount: float) -> None:
+        offset += DIGEST.size
+        with self._lock:
+            VALUE.pack_into(self._map, offset, VALUE.unpack_from(self._map, offset)[0] + amount)
+
+    def set(self, offset: int, value: float) -> None:
+        VALUE.pack_into(self._map, offset + DIGEST.size, value)
+
+    def reset(self, worker: int, prefix: str) -> None:
+        marker = f"{prefix}\t".encode()
+        start = worker * self.slots * SLOT_SIZE
+        for offset in range(start, start + self.slots * SLOT_SIZE, SLOT_SIZE):
+            name = offset + DIGEST.size + VALUE.size
+            if self._map[name:name + len(marker)] == marker:
+                VALUE.pack_into(self._map, offset + DIGEST.size, 0.0)
+
+    def total(self, key: str) -> float:
+        digest = self._digest(key.encode())
+        total = 0.0
+        for worker in range(self.workers):
+            base = worker * self.slots
+            for probe in range(self.slots):
+                offset = (base + (digest + probe) % self.slots) * SLOT_SIZE
+                stored = DIGEST.unpack_from(self._map, offset)[0]
+                if stored == digest:
+                    total += VALUE.unpack_from(self._map, offset + DIGEST.size)[0]
+                if stored in (digest, 0):
+                    break
+        return total
+
+    def totals(self, prefix: str) -> Dict[str, float]:
+        marker = f"{prefix}\t".encode()
+        totals: Dict[str, float] = defaultdict(float)
+        for offset in range(0, len(self._map), SLOT_SIZE):
+            name = offset + DIGEST.size + VALUE.size
+            if self._map[name:name + len(marker)] != marker:
+                continue
+            key = self._map[name + len(marker):name + NAME_SIZE].rstrip(b"\0").decode(errors="replace")
+            totals[key] += VALUE.unpack_from(self._map, offset + DIGEST.size)[0]
+        return dict(totals)
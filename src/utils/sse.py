@@ -0,0 +1,27 @@
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Optional
+
+from pydantic import BaseModel
+
+MEDIA_TYPE = "text/event-stream"
+DONE = b"data: [DONE]\n\n"
+
+
+def event(payload: BaseModel, name: Optional[str] = None) -> bytes:
+    data = b"data: " + payload.model_dump_json().encode() + b"\n\n"
+    if name is None:
+        return data
+    return b"event: " + name.encode() + b"\n" + data
+
+
+def encode(events: Iterable[BaseModel], named: bool = False, done: bool = False) -> Iterator[bytes]:
+    for payload in events:
+        yield event(payload, payload.type if named else None)
+    if done:
+        yield DONE
+
+
+async def aencode(events: AsyncIterable[BaseModel], named: bool = False, done: bool = False) -> AsyncIterator[bytes]:
+    async for payload in events:
+        yield event(payload, payload.type if named else None)
+    if done:
+        yield DONE
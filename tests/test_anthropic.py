@@ -160,3 +160,41 @@ def test_valid_request(client):
     response = client.get_response(valid_request)
 
     assert response.id is not None
+
+
+def test_stream_response(client):
+    request = AnthropicRequest(
+        messages=[AnthropicMessage(role="user", content="Hello!")],
+        model="claude-3-5-sonnet-20241022",
+        max_tokens=42,
+        stream=True
+    )
+    events = list(client.stream_response(request))
+
+    assert [event.type for event in events[:2]] == ["message_start", "content_block_start"]
+    assert [event.type for event in events[-3:]] == ["content_block_stop", "message_delta", "message_stop"]
+
+    text = "".join(event.delta.text for event in events if event.type == "content_block_delta")
+    response = client.get_response(request)
+    assert text == response.content[0].text
+    assert events[0].message.usage.input_tokens == response.usage.input_tokens
+    assert events[-2].usage.output_tokens == response.usage.output_tokens
+
+
+def test_get_responses_match_individual_responses(client):
+    requests = [
+        AnthropicRequest(
+            messages=[AnthropicMessage(role="user", content="Hello " * n)],
+            model="claude-3-5-sonnet-20241022",
+            system="You are Claudio" if n % 2 else None,
+            max_tokens=n + 3
+        )
+        for n in range(1, 6)
+    ]
+    responses = client.get_responses(requests)
+
+    assert len({response.id for response in responses}) == len(requests)
+    for request, response in zip(requests, responses):
+        expected = client.get_response(request)
+        assert response.content == expected.content
+        assert response.usage == expected.usage
@@ -0,0 +1,99 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app as server
+
+OPENAI_REQUEST = {"messages": [{"role": "user", "content": "Hello!"}], "model": "gpt-4", "max_tokens": 42}
+ANTHROPIC_REQUEST = {
+    "messages": [{"role": "user", "content": "Hello!"}], "model": "claude-3-5-sonnet-20241022", "max_tokens": 42
+}
+
+
+@pytest.fixture
+def client():
+    return TestClient(server.app)
+
+
+@pytest.mark.parametrize(
+    "url,body",
+    [
+        ("/chat/completions", OPENAI_REQUEST),
+        ("/claude/completions", ANTHROPIC_REQUEST),
+    ]
+)
+def test_fast_responses_match_validated_responses(client, monkeypatch, url, body):
+    fast = client.post(url, json=body)
+    monkeypatch.setattr(server.settings, "fast_responses", False)
+    validated = client.post(url, json=body)
+
+    assert fast.headers["content-type"] == validated.headers["content-type"] == "application/json"
+    assert fast.json().keys() == validated.json().keys()
+    assert fast.json()["usage"] == validated.json()["usage"]
+
+
+def test_openapi_keeps_response_models(client):
+    paths = client.get("/openapi.json").json()["paths"]
+    assert paths["/chat/completions"]["post"]["responses"]["200"]["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/OpenAIResponse"
+    }
+    assert paths["/claude/completions"]["post"]["responses"]["200"]["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/AnthropicResponse"
+    }
+
+
+@pytest.mark.parametrize(
+    "url,bulk_url,body",
+    [
+        ("/chat/completions", "/chat/completions/bulk", OPENAI_REQUEST),
+        ("/claude/completions", "/claude/completions/bulk", ANTHROPIC_REQUEST),
+    ]
+)
+def test_bulk_endpoints_answer_every_request_in_order(client, monkeypatch, url, bulk_url, body):
+    requests = [{**body, "max_tokens": n} for n in (3, 1, 2)]
+    bulk = client.post(bulk_url, json=requests)
+    assert bulk.status_code == 200
+    assert [item["usage"] for item in bulk.json()] == [client.post(url, json=item).json()["usage"] for item in requests]
+
+    monkeypatch.setattr(server.settings, "fast_responses", False)
+    assert [item["usage"] for item in client.post(bulk_url, json=requests).json()] == [
+        item["usage"] for item in bulk.json()
+    ]
+    assert client.post(bulk_url, json=[]).json() == []
+
+
+def test_bulk_endpoint_limits_its_size(client, monkeypatch):
+    monkeypatch.setattr(server, "MAX_BULK_REQUESTS", 2)
+    response = client.post("/chat/completions/bulk", json=[OPENAI_REQUEST] * 3)
+    assert response.status_code == 400
+    assert "limited to 2 items" in response.json()["error"]["message"]
+
+
+def test_bulk_endpoint_rejects_streaming(client):
+    response = client.post("/chat/completions/bulk", json=[OPENAI_REQUEST, {**OPENAI_REQUEST, "stream": True}])
+    assert response.status_code == 400
+    assert response.json()["error"]["type"] == "invalid_request_error"
+
+
+@pytest.mark.parametrize(
+    "provider,url,body,error",
+    [
+        ("openai", "/chat/completions", OPENAI_REQUEST, "context_length_exceeded"),
+        ("openai", "/chat/completions/bulk", [OPENAI_REQUEST], "context_length_exceeded"),
+        ("anthropic", "/claude/completions", ANTHROPIC_REQUEST, "invalid_request_error"),
+    ]
+)
+def test_requests_beyond_the_context_window_are_rejected(client, monkeypatch, provider, url, body, error):
+    model = ANTHROPIC_REQUEST["model"] if provider == "anthropic" else OPENAI_REQUEST["model"]
+    monkeypatch.setattr(server.registry.get(provider, model), "context_window", 40)
+
+    response = client.post(url, json=body)
+    assert response.status_code == 400
+    assert error in response.text and "40" in response.text
+    assert "at least" in response.text
+
+
+def test_huge_prompts_hit_the_default_context_window(client):
+    body = {**OPENAI_REQUEST, "messages": [{"role": "user", "content": "token " * 10000}]}
+    response = client.post("/chat/completions", json=body)
+    assert response.status_code == 400
+    assert response.json()["error"]["message"].startswith("This model's maximum context length is 8192 tokens.")
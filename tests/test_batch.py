@@ -0,0 +1,100 @@
+import io
+import json
+from time import sleep
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from batch import BatchManager, FileStore
+from models.openai import OpenAIBatchCreate
+
+
+def batch_line(custom_id, **body):
+    body = {"model": "gpt-4", "max_tokens": 3, "messages": [{"role": "user", "content": "Hello!"}], **body}
+    return json.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body})
+
+
+def wait(manager, batch_id, timeout=30.0):
+    for _ in range(int(timeout / 0.05)):
+        batch = manager.get(batch_id)
+        if batch.status in ("completed", "failed", "cancelled"):
+            return batch
+        sleep(0.05)
+    raise TimeoutError(batch_id)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = BatchManager(FileStore(str(tmp_path)), workers=2, chunk_size=4)
+    yield manager
+    manager.shutdown()
+
+
+def test_batch_writes_outputs_and_errors(manager):
+    lines = [batch_line(f"request-{i}") for i in range(10)] + [batch_line("bad", model="geppetto-4"), "{", ""]
+    source = manager.store.upload(io.BytesIO("\n".join(lines).encode()), "input.jsonl", "batch")
+
+    batch = manager.create(OpenAIBatchCreate(input_file_id=source.id, endpoint="/v1/chat/completions"))
+    batch = wait(manager, batch.id)
+
+    assert batch.status == "completed"
+    assert batch.request_counts.model_dump() == {"total": 12, "completed": 10, "failed": 2}
+
+    outputs = [json.loads(line) for line in manager.store.path(batch.output_file_id).read_text().splitlines()]
+    assert [output["custom_id"] for output in outputs] == [f"request-{i}" for i in range(10)]
+    assert outputs[0]["response"]["status_code"] == 200
+    assert outputs[0]["response"]["body"]["object"] == "chat.completion"
+
+    errors = [json.loads(line) for line in manager.store.path(batch.error_file_id).read_text().splitlines()]
+    assert all(error["error"]["code"] == "invalid_request" for error in errors)
+    assert manager.store.get(batch.output_file_id).bytes > 0
+
+
+def test_files_and_batches_are_visible_to_other_workers(manager):
+    source = manager.store.upload(io.BytesIO(batch_line("request").encode()), "input.jsonl", "batch")
+    other = BatchManager(FileStore(str(manager.store.directory)), workers=1)
+
+    assert other.store.get(source.id) == source
+    assert other.store.get("file-../../secret") is None
+    batch = other.create(OpenAIBatchCreate(input_file_id=source.id, endpoint="/v1/chat/completions"))
+    batch = wait(manager, batch.id)
+    assert batch.status == "completed"
+    assert manager.store.get(batch.output_file_id).bytes > 0
+    other.shutdown()
+
+
+def test_batch_cancelled_by_another_worker(manager):
+    lines = [batch_line(f"request-{i}") for i in range(2000)]
+    source = manager.store.upload(io.BytesIO("\n".join(lines).encode()), "input.jsonl", "batch")
+    batch = manager.create(OpenAIBatchCreate(input_file_id=source.id, endpoint="/v1/chat/completions"))
+
+    other = BatchManager(FileStore(str(manager.store.directory)))
+    assert other.cancel(batch.id).status == "cancelling"
+    assert wait(manager, batch.id).status == "cancelled"
+    assert wait(other, batch.id).status == "cancelled"
+
+
+def test_batch_requires_input_file(manager):
+    with pytest.raises(KeyError):
+        manager.create(OpenAIBatchCreate(input_file_id="file-missing", endpoint="/v1/chat/completions"))
+
+
+def test_batch_endpoints():
+    with TestClient(app) as client:
+        content = "\n".join(batch_line(f"request-{i}") for i in range(3)).encode()
+        file = client.post("/v1/files", files={"file": ("input.jsonl", content)}, data={"purpose": "batch"}).json()
+        assert file["bytes"] == len(content)
+
+        batch = client.post("/v1/batches", json={"input_file_id": file["id"], "endpoint": "/v1/chat/completions"})
+        assert batch.status_code == 200
+        for _ in range(600):
+            batch = client.get(f"/v1/batches/{batch.json()['id']}")
+            if batch.json()["status"] == "completed":
+                break
+            sleep(0.05)
+        assert batch.json()["request_counts"]["completed"] == 3
+
+        output = client.get(f"/v1/files/{batch.json()['output_file_id']}/content")
+        assert len(output.text.splitlines()) == 3
+        assert client.get("/v1/batches/batch_missing").status_code == 404
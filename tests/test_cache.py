@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as server
+from cache import ResponseCache, request_key
+from models.openai import OpenAIFastRequest, OpenAIRequest
+from ratelimit import MemoryStore, RateLimit, RateLimiter
+
+OPENAI_REQUEST = {"messages": [{"role": "user", "content": "Hello!"}], "model": "gpt-4", "max_tokens": 42}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(server.settings, "response_cache", True)
+    monkeypatch.setattr(server, "cache", ResponseCache())
+    return TestClient(server.app)
+
+
+def test_request_key_is_canonical():
+    first = OpenAIRequest(**OPENAI_REQUEST)
+    second = OpenAIRequest(**dict(reversed(list(OPENAI_REQUEST.items()))))
+    assert request_key("openai", first, "a") == request_key("openai", second, "a")
+    assert request_key("openai", first, "a") != request_key("openai", first, "b")
+    assert request_key("openai", first, "a") == request_key("openai", OpenAIFastRequest(**OPENAI_REQUEST), "a")
+    assert request_key("openai", first, "a") != request_key("anthropic", first, "a")
+    assert request_key("openai", first, "a", "retry-1") != request_key("openai", first, "b", "retry-1")
+
+
+def test_evicts_least_recently_used_by_entries():
+    cache = ResponseCache(max_entries=2)
+    cache.put(b"1", b"one")
+    cache.put(b"2", b"two")
+    assert cache.get(b"1").body == b"one"
+    cache.put(b"3", b"three")
+
+    assert cache.get(b"2") is None
+    assert [cache.get(key).body for key in (b"1", b"3")] == [b"one", b"three"]
+
+
+def test_evicts_by_bytes():
+    cache = ResponseCache(max_bytes=10)
+    cache.put(b"1", b"12345")
+    cache.put(b"2", b"123456")
+    cache.put(b"3", b"12345678901")
+
+    assert cache.get(b"1") is None
+    assert cache.get(b"2").body == b"123456"
+    assert cache.get(b"3") is None
+    assert (len(cache), cache.size) == (1, 6)
+
+
+def test_entries_expire():
+    clock = Clock()
+    cache = ResponseCache(ttl=10, clock=clock)
+    cache.put(b"1", b"body", (3, 4))
+    clock.now = 9.9
+    assert cache.get(b"1").usage == (3, 4)
+    clock.now = 10
+    assert cache.get(b"1") is None
+    assert cache.size == 0
+
+
+def test_concurrent_misses_compute_once():
+    cache = ResponseCache()
+    calls = []
+
+    async def produce():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"body", (1, 2)
+
+    async def main():
+        return await asyncio.gather(*(cache.fetch(b"1", produce) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert [hit for _, hit in results] == [False, True, True, True, True]
+    assert {entry.body for entry, _ in results} == {b"body"}
+
+
+def test_failed_computation_is_not_cached():
+    cache = ResponseCache()
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def succeed():
+        return b"body", (0, 0)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.fetch(b"1", fail))
+    entry, hit = asyncio.run(cache.fetch(b"1", succeed))
+    assert (entry.body, hit) == (b"body", False)
+
+
+def test_repeated_requests_are_served_from_cache(client):
+    first = client.post("/chat/completions", json=OPENAI_REQUEST)
+    second = client.post("/chat/completions", json=OPENAI_REQUEST)
+    other = client.post("/chat/completions", json={**OPENAI_REQUEST, "max_tokens": 43})
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert other.json()["id"] != first.json()["id"]
+    metrics = client.get("/metrics").text
+    assert 'llm_cache_hits_total{route="/chat/completions",model="gpt-4"} 1.0' in metrics
+    assert 'llm_cache_misses_total{route="/chat/completions",model="gpt-4"} 2.0' in metrics
+
+
+def test_idempotency_key_returns_the_same_response_for_the_same_body(client):
+    body = {"messages": [{"role": "user", "content": "Hi"}], "model": "claude-3-5-sonnet-20241022", "max_tokens": 8}
+    first = client.post("/claude/completions", json=body, headers={"Idempotency-Key": "retry-1"})
+    retry = client.post(
+        "/claude/completions", json={**body, "max_tokens": 9}, headers={"Idempotency-Key": "retry-1"}
+    )
+    other = client.post("/claude/completions", json=body, headers={"Idempotency-Key": "retry-2"})
+    again = client.post("/claude/completions", json=body, headers={"Idempotency-Key": "retry-1"})
+
+    assert retry.status_code == 422
+    assert retry.json()["error"]["type"] == "invalid_request_error"
+    assert again.json()["id"] == first.json()["id"]
+    assert other.json()["id"] != first.json()["id"]
+
+
+def test_cache_is_per_caller(client):
+    first = client.post("/chat/completions", json=OPENAI_REQUEST, headers={"Authorization": "Bearer sk-a"})
+    second = client.post("/chat/completions", json=OPENAI_REQUEST, headers={"Authorization": "Bearer sk-b"})
+    assert first.json()["id"] != second.json()["id"]
+
+
+def test_idempotent_retries_are_not_rate_limited(client, monkeypatch):
+    monkeypatch.setattr(server, "limiter", RateLimiter(MemoryStore()))
+    monkeypatch.setattr(server.registry.get("openai", "gpt-4"), "rate_limit", RateLimit(rpm=1))
+    headers = {"Authorization": "Bearer sk-a", "Idempotency-Key": "retry-1"}
+    first = client.post("/chat/completions", json=OPENAI_REQUEST, headers=headers)
+    retry = client.post("/chat/completions", json=OPENAI_REQUEST, headers=headers)
+
+    assert retry.status_code == 200
+    assert retry.content == first.content
+    other = client.post("/chat/completions", json=OPENAI_REQUEST, headers={"Authorization": "Bearer sk-a"})
+    assert other.status_code == 429
+
+
+def test_cache_is_disabled_by_default():
+    http = TestClient(server.app)
+    first = http.post("/chat/completions", json=OPENAI_REQUEST, headers={"Idempotency-Key": "retry-1"})
+    second = http.post("/chat/completions", json=OPENAI_REQUEST, headers={"Idempotency-Key": "retry-1"})
+    assert first.json()["id"] != second.json()["id"]
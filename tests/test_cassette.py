@@ -0,0 +1,112 @@
+import asyncio
+
+import httpx
+import pytest
+
+import app as server
+from cassette import CassetteStore, Recorder, Recording, fingerprint
+from clients import AnthropicMockClient, OpenAIMockClient
+from models.anthropic import AnthropicRequest
+from models.openai import OpenAIRequest
+from utils.config import LLMConfig
+
+LOG_LEVEL = 10
+ANTHROPIC_MODEL = "claude-3-5-sonnet-20241022"
+
+
+def recording(content: str, latency: float = 0.0) -> Recording:
+    return Recording(
+        provider="openai", request={"content": content}, response={"content": content}, latency=latency, recorded_at=0
+    )
+
+
+def test_store_survives_reopening(tmp_path):
+    store = CassetteStore(str(tmp_path))
+    key = store.put(recording("first"))
+    store.put(recording("second"))
+    store.close()
+
+    store = CassetteStore(str(tmp_path))
+    assert len(store) == 2
+    assert store.get(key).response == {"content": "first"}
+    assert store.get(fingerprint("openai", {"content": "missing"})) is None
+    store.close()
+
+
+def test_store_rebuilds_a_lost_index_tail(tmp_path):
+    store = CassetteStore(str(tmp_path))
+    first = store.put(recording("first"))
+    second = store.put(recording("second"))
+    store.close()
+    index = tmp_path / "cassette.idx"
+    index.write_bytes(index.read_bytes()[:-5])
+    with (tmp_path / "cassette.log").open("ab") as log:
+        log.write(b'{"provider": "openai", "requ')
+
+    store = CassetteStore(str(tmp_path))
+    assert store.get(first).response == {"content": "first"}
+    assert store.get(second).response == {"content": "second"}
+    assert (tmp_path / "cassette.log").read_bytes().endswith(b"}\n")
+    store.close()
+
+
+def test_store_cache_is_bounded(tmp_path):
+    store = CassetteStore(str(tmp_path), cache_size=2)
+    keys = [store.put(recording(f"entry-{i}")) for i in range(5)]
+    assert len(store._cache) == 2
+    assert store.get(keys[0]).response == {"content": "entry-0"}
+    assert list(store._cache) == [keys[4], keys[0]]
+    store.close()
+
+
+async def record(tmp_path, provider, path, body):
+    store = CassetteStore(str(tmp_path))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://upstream") as client:
+        recorded = await Recorder(store, client, {provider: path}).record(provider, body)
+    store.close()
+    return recorded
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_openai_replays_recordings(tmp_path, stream):
+    body = {"messages": [{"role": "user", "content": "Hello!"}], "model": "gpt-4", "max_tokens": 3, "stream": stream}
+    recorded = asyncio.run(record(tmp_path, "openai", "/chat/completions", body))
+    client = OpenAIMockClient(LLMConfig(api_key="sk-key", model="gpt-4", cassette_dir=str(tmp_path)), LOG_LEVEL)
+    request = OpenAIRequest.model_validate(body)
+
+    async def replay():
+        if stream:
+            return [chunk async for chunk in client.astream_response(request)]
+        return await client.aget_response(request)
+
+    replayed = asyncio.run(replay())
+    if stream:
+        assert [chunk.model_dump(mode="json") for chunk in replayed] == [
+            chunk.data for chunk in recorded.chunks
+        ]
+    else:
+        assert replayed.model_dump(mode="json") == recorded.response
+        assert client.replay(request.model_copy(update={"max_tokens": 4})) is None
+
+
+def test_anthropic_stream_replays_recorded_timings(tmp_path, monkeypatch):
+    body = {"messages": [{"role": "user", "content": "Hello!"}], "model": ANTHROPIC_MODEL, "max_tokens": 3,
+            "stream": True}
+    recorded = asyncio.run(record(tmp_path, "anthropic", "/claude/completions", body))
+    config = LLMConfig(api_key="cl-key", model=ANTHROPIC_MODEL, cassette_dir=str(tmp_path))
+    client = AnthropicMockClient(config, LOG_LEVEL)
+
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+
+    async def replay():
+        return [chunk async for chunk in client.astream_response(AnthropicRequest.model_validate(body))]
+
+    events = asyncio.run(replay())
+    assert [event.type for event in events][0] == "message_start"
+    assert len(events) == len(recorded.chunks)
+    assert delays == [chunk.delay for chunk in recorded.chunks if chunk.delay > 0]
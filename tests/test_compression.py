@@ -0,0 +1,102 @@
+import gzip
+import json
+import tracemalloc
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app import app
+from middleware.compression import Decoder, negotiate, zstandard
+
+BODY = json.dumps({
+    "messages": [{"role": "user", "content": "Hello! " * 2000}],
+    "model": "gpt-4",
+    "max_tokens": 5
+}).encode()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0.5, br", "gzip"),
+        ("identity", None),
+        ("gzip;q=0", None),
+        ("", None),
+    ]
+)
+def test_negotiate(accept_encoding, expected):
+    assert negotiate(accept_encoding) == expected
+
+
+def test_gzip_request_body(client):
+    response = client.post(
+        "/chat/completions",
+        content=gzip.compress(BODY),
+        headers={"Content-Encoding": "gzip", "Content-Type": "application/json"}
+    )
+    assert response.status_code == 200
+    assert response.json()["usage"]["prompt_tokens"] == 2006
+
+
+@pytest.mark.skipif(zstandard is None, reason="zstandard is not installed")
+def test_zstd_request_body(client):
+    response = client.post(
+        "/chat/completions",
+        content=zstandard.ZstdCompressor().compress(BODY),
+        headers={"Content-Encoding": "zstd", "Content-Type": "application/json"}
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "body,encoding,status_code",
+    [
+        (b"not gzip", "gzip", 400),
+        (BODY, "br", 415),
+    ]
+)
+def test_invalid_request_body(client, body, encoding, status_code):
+    response = client.post(
+        "/chat/completions", content=body, headers={"Content-Encoding": encoding, "Content-Type": "application/json"}
+    )
+    assert response.status_code == status_code
+
+
+def test_response_compression_threshold(client):
+    small = client.post("/chat/completions", content=BODY, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    large = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert large.headers["content-encoding"] == "gzip"
+    assert int(large.headers["content-length"]) < len(large.content)
+    assert "Accept-Encoding" in large.headers["vary"]
+
+
+def test_decompressed_size_limit():
+    decoder = Decoder("gzip", max_size=100)
+    with pytest.raises(HTTPException) as error:
+        decoder.decompress(gzip.compress(b"x" * 1000))
+    assert error.value.status_code == 413
+
+
+@pytest.mark.skipif(zstandard is None, reason="zstandard is not installed")
+def test_zstd_bomb_is_bounded():
+    compressor, zeros = zstandard.ZstdCompressor(level=19).compressobj(), bytes(1024 * 1024)
+    bomb = b"".join(compressor.compress(zeros) for _ in range(256)) + compressor.flush()
+    decoder = Decoder("zstd", max_size=1024 * 1024)
+    tracemalloc.start()
+    try:
+        with pytest.raises(HTTPException) as error:
+            decoder.decompress(bomb)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert error.value.status_code == 413
+    assert peak < 8 * 1024 * 1024
@@ -0,0 +1,88 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from clients import AnthropicMockClient, OpenAIMockClient
+from corpus import Corpus, build
+from models.anthropic import AnthropicRequest
+from models.openai import OpenAIRequest
+from utils.config import LLMConfig
+
+LOG_LEVEL = 10
+
+ENTRIES = [
+    {"prompt": "Hello,   World!", "response": "Ciao mondo!"},
+    {"prompt": "What is 2 + 2?", "response": "4"},
+    {"prefix": "Translate", "response": "Traduzione non disponibile."},
+    {"regex": r"\bweather\b", "response": "Sempre soleggiato."},
+    {"prompt": "hello, world!", "response": "Duplicate prompts keep the first response."},
+]
+
+
+@pytest.fixture
+def corpus_path(tmp_path):
+    path = str(tmp_path / "responses.corpus")
+    build(ENTRIES, path)
+    return path
+
+
+@pytest.mark.parametrize(
+    "prompt,expected",
+    [
+        ("hello, world!", "Ciao mondo!"),
+        ("  HELLO,\nWORLD!  ", "Ciao mondo!"),
+        ("What is 2 + 2?", "4"),
+        ("translate this sentence", "Traduzione non disponibile."),
+        ("How is the weather today?", "Sempre soleggiato."),
+        ("Something else entirely", None),
+    ]
+)
+def test_lookup(corpus_path, prompt, expected):
+    corpus = Corpus(corpus_path)
+    assert corpus.lookup(prompt) == expected
+    corpus.close()
+
+
+@pytest.mark.parametrize("entry", [{"prompt": "no response"}, {"prompt": "a", "prefix": "b", "response": "c"}])
+def test_build_rejects_invalid_entries(tmp_path, entry):
+    with pytest.raises(ValueError):
+        build([entry], str(tmp_path / "invalid.corpus"))
+
+
+def test_open_rejects_other_files(tmp_path):
+    path = tmp_path / "not.corpus"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        Corpus(str(path))
+
+
+def test_builder_cli(tmp_path):
+    source, output = tmp_path / "responses.jsonl", tmp_path / "responses.corpus"
+    source.write_text("\n".join(json.dumps(entry) for entry in ENTRIES) + "\n")
+    result = subprocess.run(
+        [sys.executable, "-m", "corpus", str(source), str(output)], capture_output=True, text=True, check=True
+    )
+    assert "2 prompts, 2 rules" in result.stdout
+    assert Corpus(str(output)).lookup("What is 2 + 2?") == "4"
+
+
+def test_clients_answer_from_the_corpus(corpus_path):
+    openai = OpenAIMockClient(LLMConfig(api_key="sk-key", model="gpt-4", corpus_path=corpus_path), LOG_LEVEL)
+    response = openai.get_response(OpenAIRequest(
+        messages=[{"role": "user", "content": "Hello, world!"}, {"role": "assistant", "content": "Ciao mondo!"},
+                  {"role": "user", "content": "What is 2 + 2?"}],
+        model="gpt-4",
+        max_tokens=42
+    ))
+    assert response.choices[0].message.content == "4"
+
+    model = "claude-3-5-sonnet-20241022"
+    anthropic = AnthropicMockClient(LLMConfig(api_key="cl-key", model=model, corpus_path=corpus_path), LOG_LEVEL)
+    response = anthropic.get_response(AnthropicRequest(
+        messages=[{"role": "user", "content": [{"type": "text", "text": "Translate: good morning"}]}],
+        model=model,
+        max_tokens=2
+    ))
+    assert response.content[0].text == "Traduzione non"
@@ -0,0 +1,153 @@
+import asyncio
+import base64
+import sys
+from array import array
+from math import fsum, sqrt
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Response
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+import app as server
+from clients import EmbeddingsMockClient
+from clients.embeddings import MIX_1, MIX_2, SCALE, STEP, embed, input_seed, unit_vectors
+from models.openai import OpenAIEmbeddingsRequest, OpenAIEmbeddingsResponse
+from utils.config import LLMConfig
+
+LOG_LEVEL = 10
+
+
+@pytest.fixture
+def client():
+    config = LLMConfig(api_key="sk-key", model="text-embedding-3-small")
+    return EmbeddingsMockClient(config, LOG_LEVEL)
+
+
+def decode(embedding: str):
+    vector = array("f", base64.b64decode(embedding))
+    if sys.byteorder == "big":
+        vector.byteswap()
+    return vector.tolist()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"input": [], "model": "text-embedding-3-small"},  # No inputs
+        {"input": "text", "model": "gpt-4"},  # Not an embedding model
+        {"input": "text", "model": "text-embedding-ada-002", "dimensions": 256},  # Fixed size model
+        {"input": "text", "model": "text-embedding-3-small", "dimensions": 2048},  # Larger than the model
+        {"input": ["text"] * 2049, "model": "text-embedding-3-small"},  # Too many inputs
+    ]
+)
+def test_request_validation(kwargs):
+    with pytest.raises(ValidationError):
+        OpenAIEmbeddingsRequest(**kwargs)
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("text", ["text"]),
+        (["a", "b"], ["a", "b"]),
+        ([1, 2, 3], [[1, 2, 3]]),
+        ([[1, 2], [3]], [[1, 2], [3]]),
+    ]
+)
+def test_request_inputs(value, expected):
+    assert OpenAIEmbeddingsRequest(input=value, model="text-embedding-3-small").inputs == expected
+
+
+def test_vectors_are_deterministic_and_normalized():
+    first, second = embed(["same text", "other text"], 64, "float")
+    assert embed(["same text"], 64, "float") == [first]
+    assert first != second
+    assert fsum(value * value for value in first) == pytest.approx(1.0, abs=1e-5)
+    assert input_seed([1, 2, 3]) != input_seed([12, 3])
+
+
+def test_base64_matches_floats():
+    floats = embed(["text", [1, 2, 3]], 32, "float")
+    encoded = embed(["text", [1, 2, 3]], 32, "base64")
+    assert [decode(value) for value in encoded] == floats
+
+
+def splitmix_vector(seed, size):
+    mask = (1 << 64) - 1
+    values = []
+    for step in range(1, size + 1):
+        z = (seed + STEP * step) & mask
+        z = ((z ^ (z >> 30)) * MIX_1) & mask
+        z = ((z ^ (z >> 27)) * MIX_2) & mask
+        values.append(((z ^ (z >> 31)) >> 40) * SCALE - 1.0)
+    norm = sqrt(sum(value * value for value in values))
+    return [value / norm for value in values]
+
+
+def test_vectors_match_the_scalar_splitmix():
+    seeds = [input_seed(value) for value in ("a", "b", "c")]
+    for vector, seed in zip(unit_vectors(seeds, 256).tolist(), seeds):
+        assert vector == pytest.approx(splitmix_vector(seed, 256), abs=1e-6)
+
+
+def test_get_response(client):
+    request = OpenAIEmbeddingsRequest(input=["hello world", "again"], model="text-embedding-3-small")
+    response = client.get_response(request)
+
+    assert isinstance(response, OpenAIEmbeddingsResponse)
+    assert [item.index for item in response.data] == [0, 1]
+    assert all(len(item.embedding) == 1536 for item in response.data)
+    assert response.usage.prompt_tokens == response.usage.total_tokens == 3
+    assert client.usage_tokens(response) == (3, 0)
+    assert not client.streams
+    with pytest.raises(TypeError, match="cannot be streamed"):
+        client.stream_response(request)
+
+    tokens = client.get_response(OpenAIEmbeddingsRequest(input=[1, 2, 3], model="text-embedding-3-small"))
+    assert tokens.usage.prompt_tokens == 3
+
+
+def test_dimensions(client):
+    request = OpenAIEmbeddingsRequest(
+        input="hello", model="text-embedding-3-small", dimensions=256, encoding_format="base64"
+    )
+    response = client.get_response(request)
+    assert len(base64.b64decode(response.data[0].embedding)) == 256 * 4
+
+
+def test_context_window_is_per_input(client):
+    short = OpenAIEmbeddingsRequest(input=["word " * 8000] * 3, model="text-embedding-3-small")
+    assert client.check_context(short) == (None, None)
+
+    long = OpenAIEmbeddingsRequest(input=[[1], [1] * 8192], model="text-embedding-3-small")
+    _, error = client.check_context(long)
+    assert error["error"]["code"] == "context_length_exceeded"
+    assert error["error"]["param"] == "input"
+
+
+def test_endpoint():
+    http = TestClient(server.app)
+    body = {"input": ["hello", "world"], "model": "text-embedding-3-large", "encoding_format": "base64"}
+    response = http.post("/embeddings", json=body)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["object"] == "list"
+    assert [len(decode(item["embedding"])) for item in data["data"]] == [3072, 3072]
+    assert http.post("/embeddings", json=body).json() == data
+
+
+def test_endpoint_context_window():
+    http = TestClient(server.app)
+    response = http.post("/embeddings", json={"input": [[1] * 9000], "model": "text-embedding-3-small"})
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "context_length_exceeded"
+
+
+def test_streaming_is_rejected_at_the_route():
+    request = SimpleNamespace(model="text-embedding-3-small", stream=True)
+    response = asyncio.run(server.complete("embeddings", "/embeddings", request, "sk-key", Response()))
+    assert response.status_code == 400
+    assert b"does not support streaming" in response.body
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as server
+from faults import DroppedConnection, FaultInjector, FaultRule, FaultSchedule
+from utils.latency import LatencyDistribution
+from utils.metrics import ServerMetrics
+
+OPENAI_REQUEST = {"messages": [{"role": "user", "content": "Hello!"}], "model": "gpt-4", "max_tokens": 42}
+ANTHROPIC_REQUEST = {
+    "messages": [{"role": "user", "content": "Hello!"}], "model": "claude-3-5-sonnet-20241022", "max_tokens": 42
+}
+
+
+def test_rules_match_model_route_and_api_key():
+    rule = FaultRule(kind="error", models=["gpt-4"], routes=["/chat/completions"], api_keys=["sk-a"])
+    injector = FaultInjector([rule])
+    assert injector.choose("/chat/completions", "gpt-4", "sk-a") is rule
+    assert injector.choose("/chat/completions", "gpt-4", "sk-b") is None
+    assert injector.choose("/chat/completions", "gpt-4o", "sk-a") is None
+    assert injector.choose("/claude/completions", "gpt-4", "sk-a") is None
+
+
+def test_percentage_is_deterministic_with_a_seed():
+    rules = [FaultRule(kind="error", percentage=30)]
+
+    def draws(seed):
+        injector = FaultInjector(rules, seed=seed)
+        return [injector.choose("/chat/completions", "gpt-4", "key") is not None for _ in range(1000)]
+
+    assert draws(7) == draws(7)
+    assert 250 < sum(draws(7)) < 350
+
+
+def test_every_and_schedule():
+    now = [0.0]
+    rules = [
+        FaultRule(kind="error", status=529, schedule=FaultSchedule(period=10, duration=2, offset=5)),
+        FaultRule(kind="latency", every=3),
+    ]
+    injector = FaultInjector(rules, clock=lambda: now[0])
+    kinds = [getattr(injector.choose("/r", "m", "k"), "kind", None) for _ in range(6)]
+    assert kinds == [None, None, "latency", None, None, "latency"]
+
+    now[0] = 6.0
+    assert injector.choose("/r", "m", "k").kind == "error"
+    now[0] = 8.0
+    assert injector.choose("/r", "m", "k") is None
+
+
+@pytest.fixture
+def inject(monkeypatch):
+    def install(**rule):
+        monkeypatch.setattr(server, "faults", FaultInjector([FaultRule(**rule)], seed=0))
+        return TestClient(server.app)
+    return install
+
+
+@pytest.mark.parametrize(
+    "url,body,status,expected",
+    [
+        ("/chat/completions", OPENAI_REQUEST, 500, {"type": "server_error"}),
+        ("/claude/completions", ANTHROPIC_REQUEST, 529, {"type": "overloaded_error"}),
+        ("/claude/completions", ANTHROPIC_REQUEST, 429, {"type": "rate_limit_error"}),
+    ]
+)
+def test_error_faults_use_the_provider_error_shape(inject, url, body, status, expected):
+    response = inject(kind="error", status=status).post(url, json=body)
+    assert response.status_code == status
+    assert expected.items() <= response.json()["error"].items()
+
+
+def test_truncated_stream_stops_without_done(inject):
+    client = inject(kind="truncate", after_chunks=2)
+    response = client.post("/chat/completions", json={**OPENAI_REQUEST, "stream": True})
+    events = [line for line in response.text.split("\n\n") if line]
+    assert len(events) == 2
+    assert "[DONE]" not in response.text
+
+
+def test_truncated_response_is_not_valid_json(inject, monkeypatch):
+    monkeypatch.setattr(server, "metrics", ServerMetrics())
+    response = inject(kind="truncate").post("/chat/completions", json=OPENAI_REQUEST)
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(response.text)
+
+    observed = server.metrics.route("/chat/completions", "gpt-4")
+    assert server.metrics.errors.labels("/chat/completions", "gpt-4", "FaultInjected").value == 1
+    assert (observed.requests.value, observed.in_flight.value, observed.output_tokens.value) == (1, 0, 0)
+
+
+def test_stalled_stream_completes(inject):
+    client = inject(kind="stall", after_chunks=1, delay=LatencyDistribution(value=0.01))
+    response = client.post("/chat/completions", json={**OPENAI_REQUEST, "stream": True})
+    assert response.text.endswith("data: [DONE]\n\n")
+
+
+def dropped(error: BaseException) -> bool:
+    if isinstance(error, DroppedConnection):
+        return True
+    return any(dropped(inner) for inner in getattr(error, "exceptions", ()))
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_disconnect_drops_the_connection(inject, stream):
+    client = inject(kind="disconnect", after_chunks=1)
+    with pytest.raises(Exception) as info:
+        client.post("/chat/completions", json={**OPENAI_REQUEST, "stream": stream})
+    assert dropped(info.value)
@@ -0,0 +1,71 @@
+import asyncio
+from random import Random
+
+import pytest
+from pydantic import ValidationError
+
+from clients import OpenAIMockClient
+from models.openai import OpenAIRequest, OpenAIMessage
+from utils.config import LLMConfig
+from utils.latency import LatencyDistribution, LatencyProfile
+
+LOG_LEVEL = 10
+
+
+@pytest.mark.parametrize(
+    "distribution",
+    [
+        LatencyDistribution(kind="fixed", value=0.5),
+        LatencyDistribution(kind="normal", mean=0.5, stddev=0.1),
+        LatencyDistribution(kind="lognormal", mu=-1, sigma=0.3),
+    ]
+)
+def test_distribution_is_seeded(distribution):
+    first = [distribution.sample(Random(7)) for _ in range(5)]
+    second = [distribution.sample(Random(7)) for _ in range(5)]
+    assert first == second
+    assert all(sample >= 0 for sample in first)
+
+
+def test_histogram_distribution(tmp_path):
+    histogram = tmp_path / "ttft.txt"
+    histogram.write_text("# seconds count\n0.1 9\n2.0 1\n")
+    distribution = LatencyDistribution(kind="histogram", path=str(histogram))
+    rng = Random(0)
+    samples = [distribution.sample(rng) for _ in range(1000)]
+    assert set(samples) == {0.1, 2.0}
+    assert 850 < samples.count(0.1) < 950
+
+
+def test_histogram_requires_path():
+    with pytest.raises(ValidationError, match="requires a path"):
+        LatencyDistribution(kind="histogram")
+
+
+def test_profile_resolution():
+    slow = LatencyProfile(time_to_first_token=LatencyDistribution(value=1))
+    config = LLMConfig(api_key="sk-key", model="gpt-4", latency={"gpt-4": slow, "*": LatencyProfile()})
+    assert config.latency_profile() is config.latency["gpt-4"]
+
+    paced = LLMConfig(api_key="sk-key", model="gpt-4", stream_tokens_per_second=4)
+    assert paced.latency_profile().time_per_token.value == 0.25
+
+
+def test_async_response_waits_for_latency():
+    profile = LatencyProfile(
+        time_to_first_token=LatencyDistribution(value=0.05),
+        time_per_token=LatencyDistribution(value=0.01)
+    )
+    config = LLMConfig(api_key="sk-key", model="gpt-4", latency={"*": profile})
+    client = OpenAIMockClient(config, LOG_LEVEL)
+    request = OpenAIRequest(messages=[OpenAIMessage(role="user", content="Hello!")], model="gpt-4", max_tokens=3)
+
+    async def timed():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        response = await client.aget_response(request)
+        return response, loop.time() - start
+
+    response, elapsed = asyncio.run(timed())
+    assert response.usage.completion_tokens == 3
+    assert elapsed >= 0.07
@@ -0,0 +1,71 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app as server
+from utils.metrics import Counter, Histogram, Metric, ServerMetrics
+
+
+def test_counter_exposition():
+    counter = Counter("requests_total", "Requests.", ("route",))
+    counter.labels('/a"b').inc()
+    counter.labels('/a"b').inc(2)
+    assert counter.labels('/a"b') is counter.labels('/a"b')
+    assert counter.expose().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a\\"b"} 3.0',
+    ]
+
+
+def test_histogram_exposition():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    child = histogram.labels("/a")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        child.observe(value)
+    assert list(histogram.samples()) == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 3.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_metric_requires_a_child_type():
+    with pytest.raises(TypeError):
+        Metric("untyped", "No child type.")
+
+
+def test_route_metrics_are_bound_once():
+    metrics = ServerMetrics()
+    observed = metrics.route("/chat/completions", "gpt-4")
+    assert metrics.route("/chat/completions", "gpt-4") is observed
+
+    started = observed.start()
+    assert observed.in_flight.value == 1
+    observed.finish(started, 10, 5)
+    observed.fail(observed.start(), ValueError())
+    assert observed.in_flight.value == 0
+    assert observed.requests.value == 2
+    assert (observed.input_tokens.value, observed.output_tokens.value) == (10, 5)
+    assert metrics.errors.labels("/chat/completions", "gpt-4", "ValueError").value == 1
+
+    observed.error("RateLimitExceeded")
+    observed.error(KeyError)
+    observed.fail(observed.start(), "RateLimitExceeded")
+    assert metrics.errors.labels("/chat/completions", "gpt-4", "RateLimitExceeded").value == 2
+    assert metrics.errors.labels("/chat/completions", "gpt-4", "KeyError").value == 1
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_metrics_endpoint(monkeypatch, stream):
+    monkeypatch.setattr(server, "metrics", ServerMetrics())
+    client = TestClient(server.app)
+    body = {"messages": [{"role": "user", "content": "Hello!"}], "model": "gpt-4", "max_tokens": 3, "stream": stream}
+    client.post("/chat/completions", json=body)
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'llm_requests_total{route="/chat/completions",model="gpt-4"} 1.0' in response.text
+    assert 'llm_output_tokens_total{route="/chat/completions",model="gpt-4"} 3.0' in response.text
+    assert 'llm_requests_in_flight{route="/chat/completions",model="gpt-4"} 0.0' in response.text
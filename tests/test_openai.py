@@ -1,3 +1,5 @@
+import logging
+
 import pytest
 from pydantic import ValidationError
 
@@ -199,3 +201,47 @@ def test_valid_request(client):
     valid_response = client.get_response(valid_request)
 
     assert valid_response.id is not None
+
+
+def test_payload_log_sampling():
+    config = LLMConfig(api_key="sk-key", model="gpt-4", log_sample_rate=3)
+    sampled = OpenAIMockClient(config, LOG_LEVEL)
+    assert [sampled.sample_payload() for _ in range(6)] == [True, False, False, True, False, False]
+
+    quiet = OpenAIMockClient(config, logging.INFO)
+    assert not quiet.sample_payload()
+
+
+def test_stream_response(client):
+    request = OpenAIRequest(
+        messages=[OpenAIMessage(role="user", content="Hello!")],
+        model="gpt-4",
+        max_tokens=42,
+        stream=True
+    )
+    chunks = list(client.stream_response(request))
+
+    assert all(chunk.object == "chat.completion.chunk" for chunk in chunks)
+    assert len({chunk.id for chunk in chunks}) == 1
+    assert chunks[0].choices[0].delta.role == "assistant"
+    assert chunks[-2].choices[0].finish_reason == "stop"
+    assert chunks[-1].choices == []
+
+    content = "".join(chunk.choices[0].delta.content or "" for chunk in chunks[:-1])
+    assert content == client.get_response(request).choices[0].message.content
+    assert chunks[-1].usage.completion_tokens == len(content.split())
+
+
+def test_get_responses_match_individual_responses(client):
+    requests = [
+        OpenAIRequest(messages=[OpenAIMessage(role="user", content="Hello " * n)], model="gpt-4", max_tokens=n + 3)
+        for n in range(1, 6)
+    ]
+    responses = client.get_responses(requests)
+
+    assert len({response.id for response in responses}) == len(requests)
+    for request, response in zip(requests, responses):
+        expected = client.get_response(request)
+        assert response.choices == expected.choices
+        assert response.usage == expected.usage
+    assert client.get_responses([]) == []
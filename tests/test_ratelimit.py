@@ -0,0 +1,177 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app as server
+from ratelimit import MemoryStore, RateLimit, RateLimiter, SharedMemoryStore
+from ratelimit.gcra import acquire
+from utils.config import LLMConfig
+
+OPENAI_REQUEST = {"messages": [{"role": "user", "content": "Hello!"}], "model": "gpt-4", "max_tokens": 42}
+ANTHROPIC_REQUEST = {
+    "messages": [{"role": "user", "content": "Hello!"}], "model": "claude-3-5-sonnet-20241022", "max_tokens": 42
+}
+
+
+def test_gcra_allows_a_burst_of_rpm_requests_then_spaces_them():
+    tats, now = (0.0, 0.0), 1000.0
+    for remaining in range(2, -1, -1):
+        tats, decision = acquire(tats, now, 3, None, 1)
+        assert decision.allowed and decision.remaining_requests == remaining
+
+    denied_tats, decision = acquire(tats, now, 3, None, 1)
+    assert not decision.allowed and decision.exceeded == "requests"
+    assert denied_tats == tats
+    assert decision.retry_after == pytest.approx(20.0)
+
+    _, decision = acquire(tats, now + 20.0, 3, None, 1)
+    assert decision.allowed
+
+
+def test_gcra_checks_tokens_without_charging_requests_on_denial():
+    tats, decision = acquire((0.0, 0.0), 1000.0, 10, 100, 80)
+    assert decision.allowed and decision.remaining_tokens == 20
+
+    new_tats, decision = acquire(tats, 1000.0, 10, 100, 30)
+    assert not decision.allowed and decision.exceeded == "tokens"
+    assert new_tats == tats
+    assert decision.remaining_requests == 9
+    assert decision.retry_after == pytest.approx(6.0)
+
+
+def test_gcra_charges_several_requests_at_once():
+    tats, decision = acquire((0.0, 0.0), 1000.0, 10, None, 0, requests=4)
+    assert decision.allowed and decision.remaining_requests == 6
+
+    _, decision = acquire(tats, 1000.0, 10, None, 0, requests=7)
+    assert not decision.allowed and decision.remaining_requests == 6
+
+
+def test_gcra_rejects_requests_larger_than_the_limit():
+    _, decision = acquire((0.0, 0.0), 1000.0, None, 100, 101)
+    assert not decision.allowed and not decision.retryable
+    assert decision.exceeded == "tokens" and decision.requested == 101
+
+    _, decision = acquire((0.0, 0.0), 1000.0, 2, 100, 50, requests=3)
+    assert not decision.allowed and not decision.retryable and decision.exceeded == "requests"
+
+
+@pytest.fixture(params=["memory", "shared"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryStore(shards=4, max_keys_per_shard=2)
+    else:
+        store = SharedMemoryStore(str(tmp_path / "ratelimit"), stripes=4, slots_per_stripe=2)
+        yield store
+        store.close()
+
+
+def test_limiter_keeps_keys_and_models_apart(store):
+    limiter, limit = RateLimiter(store), RateLimit(rpm=1)
+    assert limiter.acquire("a", "gpt-4", limit, 1, now=1000.0).allowed
+    assert not limiter.acquire("a", "gpt-4", limit, 1, now=1000.0).allowed
+    assert limiter.acquire("b", "gpt-4", limit, 1, now=1000.0).allowed
+    assert limiter.acquire("a", "gpt-4o", limit, 1, now=1000.0).allowed
+
+
+def test_limiter_evicts_keys_beyond_capacity(store):
+    limiter, limit = RateLimiter(store), RateLimit(rpm=1)
+    for i in range(100):
+        assert limiter.acquire(f"key-{i}", "gpt-4", limit, 1, now=1000.0 + i).allowed
+    assert not limiter.acquire("key-99", "gpt-4", limit, 1, now=1099.0).allowed
+
+
+def test_memory_store_evicts_the_least_recently_charged_key():
+    limiter, limit = RateLimiter(MemoryStore(shards=1, max_keys_per_shard=2)), RateLimit(rpm=1)
+    assert limiter.acquire("a", "gpt-4", limit, 1, now=1000.0).allowed
+    assert limiter.acquire("b", "gpt-4", limit, 1, now=1030.0).allowed
+    assert limiter.acquire("a", "gpt-4", limit, 1, now=1060.0).allowed
+    assert limiter.acquire("c", "gpt-4", limit, 1, now=1060.0).allowed
+    assert limiter.acquire("b", "gpt-4", limit, 1, now=1060.0).allowed
+    assert limiter.acquire("a", "gpt-4", limit, 1, now=1060.0).allowed
+    assert not limiter.acquire("b", "gpt-4", limit, 1, now=1060.0).allowed
+
+
+def test_shared_store_is_seen_by_other_mappings(tmp_path):
+    path = str(tmp_path / "ratelimit")
+    first, second = SharedMemoryStore(path), SharedMemoryStore(path)
+    try:
+        limit = RateLimit(rpm=1)
+        assert RateLimiter(first).acquire("a", "gpt-4", limit, 1, now=1000.0).allowed
+        assert not RateLimiter(second).acquire("a", "gpt-4", limit, 1, now=1000.0).allowed
+    finally:
+        first.close()
+        second.close()
+
+
+def test_rate_limit_resolves_model_then_wildcard():
+    config = LLMConfig(api_key="sk-key", model="gpt-4", rate_limits={"*": {"rpm": 5}, "gpt-4": {"tpm": 100}})
+    assert config.rate_limit() == RateLimit(tpm=100)
+    assert config.model_copy(update={"model": "gpt-4o"}).rate_limit() == RateLimit(rpm=5)
+    assert LLMConfig(api_key="sk-key", model="gpt-4").rate_limit().is_unlimited
+
+
+@pytest.mark.parametrize(
+    "provider,url,body,header,error",
+    [
+        ("openai", "/chat/completions", OPENAI_REQUEST, "x-ratelimit-remaining-requests", "rate_limit_exceeded"),
+        ("anthropic", "/claude/completions", ANTHROPIC_REQUEST, "anthropic-ratelimit-requests-remaining",
+         "rate_limit_error"),
+    ]
+)
+def test_app_returns_429_with_provider_headers(monkeypatch, provider, url, body, header, error):
+    monkeypatch.setattr(server, "limiter", RateLimiter(MemoryStore()))
+    monkeypatch.setattr(server.registry.get(provider, body["model"]), "rate_limit", RateLimit(rpm=1))
+    client = TestClient(server.app)
+
+    allowed = client.post(url, json=body, headers={"Authorization": "Bearer one"})
+    assert allowed.status_code == 200
+    assert allowed.headers[header] == "0"
+
+    denied = client.post(url, json=body, headers={"Authorization": "Bearer one"})
+    assert denied.status_code == 429
+    assert denied.headers["retry-after"] == "60"
+    assert error in denied.text
+
+    assert client.post(url, json=body, headers={"x-api-key": "two"}).status_code == 200
+
+
+@pytest.mark.parametrize(
+    "provider,url,body,error",
+    [
+        ("openai", "/chat/completions", OPENAI_REQUEST, "Request too large"),
+        ("anthropic", "/claude/completions", ANTHROPIC_REQUEST, "request_too_large"),
+    ]
+)
+def test_app_rejects_requests_over_the_token_limit_without_retry(monkeypatch, provider, url, body, error):
+    monkeypatch.setattr(server, "limiter", RateLimiter(MemoryStore()))
+    monkeypatch.setattr(server.registry.get(provider, body["model"]), "rate_limit", RateLimit(tpm=10))
+    client = TestClient(server.app)
+
+    denied = client.post(url, json=body)
+    assert denied.status_code == 400
+    assert "retry-after" not in denied.headers
+    assert error in denied.text
+
+
+def test_bulk_requests_are_charged_together(monkeypatch):
+    monkeypatch.setattr(server, "limiter", RateLimiter(MemoryStore()))
+    monkeypatch.setattr(server.registry.get("openai", "gpt-4"), "rate_limit", RateLimit(rpm=3))
+    client = TestClient(server.app)
+
+    allowed = client.post("/chat/completions/bulk", json=[OPENAI_REQUEST] * 2)
+    assert allowed.status_code == 200
+    assert allowed.headers["x-ratelimit-remaining-requests"] == "1"
+    assert client.post("/chat/completions/bulk", json=[OPENAI_REQUEST] * 2).status_code == 429
+
+
+def test_rejected_bulk_charges_no_group(monkeypatch):
+    monkeypatch.setattr(server, "limiter", RateLimiter(MemoryStore()))
+    monkeypatch.setattr(server.registry.get("openai", "gpt-4"), "rate_limit", RateLimit(rpm=3))
+    monkeypatch.setattr(server.registry.get("openai", "gpt-4o"), "rate_limit", RateLimit(rpm=1))
+    client = TestClient(server.app)
+    other = {**OPENAI_REQUEST, "model": "gpt-4o"}
+
+    assert client.post("/chat/completions", json=other).status_code == 200
+    assert client.post("/chat/completions/bulk", json=[OPENAI_REQUEST, other]).status_code == 429
+    allowed = client.post("/chat/completions", json=OPENAI_REQUEST)
+    assert allowed.headers["x-ratelimit-remaining-requests"] == "2"
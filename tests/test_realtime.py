@@ -0,0 +1,91 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+import app as server
+from app import app
+
+URL = "/v1/realtime?model=gpt-4o-realtime-preview"
+
+
+def user_item(text):
+    item = {"role": "user", "content": [{"type": "input_text", "text": text}]}
+    return {"type": "conversation.item.create", "item": item}
+
+
+def receive_until(websocket, event_type):
+    events = []
+    while not events or events[-1]["type"] != event_type:
+        events.append(websocket.receive_json())
+    return events
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def test_realtime_response(client):
+    with client.websocket_connect(URL) as websocket:
+        assert websocket.receive_json()["type"] == "session.created"
+        websocket.send_json({"type": "session.update", "session": {"max_response_output_tokens": 3}})
+        assert websocket.receive_json()["session"]["max_response_output_tokens"] == 3
+
+        websocket.send_json(user_item("Hello!"))
+        created = websocket.receive_json()
+        assert created["type"] == "conversation.item.created"
+
+        websocket.send_json({"type": "response.create"})
+        events = receive_until(websocket, "response.done")
+        deltas = "".join(event["delta"] for event in events if event["type"] == "response.text.delta")
+        done = events[-1]["response"]
+
+        assert events[0]["type"] == "response.created"
+        assert done["status"] == "completed"
+        assert done["output"][0]["content"][0]["text"] == deltas
+        assert done["usage"]["completion_tokens"] == 3
+
+        websocket.send_json(user_item("Again"))
+        assert websocket.receive_json()["previous_item_id"] == done["output"][0]["id"]
+
+
+def test_realtime_invalid_event(client):
+    with client.websocket_connect(URL) as websocket:
+        websocket.receive_json()
+        websocket.send_json({"type": "input_audio_buffer.append", "audio": ""})
+        error = websocket.receive_json()
+        assert error["type"] == "error"
+        assert error["error"]["code"] == "invalid_event"
+
+
+def test_realtime_rejects_other_models(client):
+    with pytest.raises(WebSocketDisconnect) as error:
+        with client.websocket_connect("/v1/realtime?model=gpt-4") as websocket:
+            websocket.receive_json()
+    assert error.value.code == 1008
+
+
+@pytest.mark.parametrize("tokens", [0, -1])
+def test_realtime_rejects_non_positive_output_tokens(client, tokens):
+    with client.websocket_connect(URL) as websocket:
+        websocket.receive_json()
+        websocket.send_json({"type": "session.update", "session": {"max_response_output_tokens": tokens}})
+        assert websocket.receive_json()["error"]["code"] == "invalid_event"
+        websocket.send_json({"type": "response.create", "response": {"max_response_output_tokens": tokens}})
+        assert websocket.receive_json()["error"]["code"] == "invalid_event"
+
+
+def test_realtime_failed_response(client, monkeypatch):
+    async def broken(self, request):
+        raise RuntimeError("boom")
+        yield
+
+    mock = server.registry.get("openai", "gpt-4o-realtime-preview")
+    monkeypatch.setattr(mock, "astream_response", broken.__get__(mock))
+    with client.websocket_connect(URL) as websocket:
+        websocket.receive_json()
+        websocket.send_json({"type": "response.create"})
+        events = receive_until(websocket, "response.done")
+        error = next(event for event in events if event["type"] == "error")
+        assert error["error"]["type"] == "server_error"
+        assert events[-1]["response"]["status"] == "failed"
@@ -0,0 +1,31 @@
+import pytest
+
+from clients import ClientRegistry, OpenAIMockClient, AnthropicMockClient
+
+LOG_LEVEL = 10
+
+
+@pytest.fixture
+def registry():
+    return ClientRegistry(LOG_LEVEL)
+
+
+def test_client_is_reused(registry):
+    client = registry.get("openai", "gpt-4")
+    assert isinstance(client, OpenAIMockClient)
+    assert registry.get("openai", "gpt-4") is client
+    assert len(registry) == 1
+
+
+def test_clients_are_keyed_by_provider_and_model(registry):
+    gpt4 = registry.get("openai", "gpt-4")
+    gpt4o = registry.get("openai", "gpt-4o")
+    claude = registry.get("anthropic", "claude-3-5-sonnet-20241022")
+    assert gpt4 is not gpt4o
+    assert isinstance(claude, AnthropicMockClient)
+    assert claude.config.model == "claude-3-5-sonnet-20241022"
+
+
+def test_unknown_provider(registry):
+    with pytest.raises(ValueError):
+        registry.get("geppetto", "gpt-4")
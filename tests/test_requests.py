@@ -0,0 +1,90 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+import app as server
+from cassette import fingerprint
+from models.anthropic import AnthropicFastRequest, AnthropicMessageView, AnthropicRequest
+from models.openai import OpenAIFastRequest, OpenAIMessageView, OpenAIRequest
+from utils.requests import is_json
+from utils.responses import adapter
+
+OPENAI_BODY = (
+    b'{"model": "gpt-4", "max_tokens": 42, "messages": [{"role": "system", "content": "Be brief."}, '
+    b'{"role": "user", "content": "Hello!", "name": "ignored"}]}'
+)
+ANTHROPIC_BODY = (
+    b'{"model": "claude-3-5-sonnet-20241022", "max_tokens": 42, "system": "Be brief.", "messages": '
+    b'[{"role": "user", "content": [{"type": "text", "text": "Hello!"}]}, {"role": "assistant", "content": "Hi"}]}'
+)
+
+
+@pytest.mark.parametrize(
+    "fast_type,model,view,body",
+    [
+        (OpenAIFastRequest, OpenAIRequest, OpenAIMessageView, OPENAI_BODY),
+        (AnthropicFastRequest, AnthropicRequest, AnthropicMessageView, ANTHROPIC_BODY),
+    ]
+)
+def test_fast_requests_dump_like_the_models(fast_type, model, view, body):
+    fast = adapter(fast_type).validate_json(body)
+    validated = model.model_validate_json(body)
+
+    assert isinstance(fast, model)
+    assert all(type(message) is view for message in fast.messages)
+    assert fast.model_dump() == validated.model_dump()
+    assert fast.model_dump_json() == validated.model_dump_json()
+    assert fingerprint("any", fast.model_dump(mode="json")) == fingerprint("any", validated.model_dump(mode="json"))
+
+
+def test_endpoints_receive_fast_requests_when_enabled(monkeypatch):
+    received = []
+
+    async def complete(provider, route, request, *args, **kwargs):
+        received.append(type(request.messages[0]))
+        return JSONResponse({})
+
+    monkeypatch.setattr(server, "complete", complete)
+    client = TestClient(server.app)
+    client.post("/chat/completions", content=OPENAI_BODY)
+    monkeypatch.setattr(server.settings, "fast_requests", True)
+    client.post("/chat/completions", content=OPENAI_BODY)
+    plain = client.post("/chat/completions", content=OPENAI_BODY, headers={"content-type": "text/plain"})
+
+    assert plain.status_code == 422
+    assert [cls.__name__ for cls in received] == ["OpenAIMessage", "OpenAIMessageView"]
+
+
+@pytest.mark.parametrize(
+    "url,body",
+    [
+        ("/chat/completions", b'{"model": "gpt-4", "max_tokens": 42, "messages": [{"consent": "Denied!"}]}'),
+        ("/chat/completions", b'{"model": "geppetto-4", "max_tokens": 0, "messages": []}'),
+        ("/chat/completions", b'{"model": "gpt-4", "max_tokens": 42, "messages": [{"role": "user"'),
+        ("/chat/completions/bulk", b'[{"model": "gpt-4", "max_tokens": 42, "messages": [{"role": "robot"}]}]'),
+        ("/claude/completions", b'{"model": "claude-3-5-sonnet-20241022", "max_tokens": 42, "messages": '
+                                b'[{"role": "user", "content": [{"type": "video"}]}]}'),
+    ]
+)
+def test_fast_requests_keep_the_validation_errors(monkeypatch, url, body):
+    client = TestClient(server.app)
+    expected = client.post(url, content=body)
+    monkeypatch.setattr(server.settings, "fast_requests", True)
+    fast = client.post(url, content=body)
+
+    assert fast.status_code == expected.status_code == 422
+    assert fast.json() == expected.json()
+
+
+def test_fast_requests_answer_like_validated_requests(monkeypatch):
+    client = TestClient(server.app)
+    expected = client.post("/claude/completions", content=ANTHROPIC_BODY).json()
+    monkeypatch.setattr(server.settings, "fast_requests", True)
+    fast = client.post("/claude/completions", content=ANTHROPIC_BODY).json()
+
+    assert fast["content"] == expected["content"] and fast["usage"] == expected["usage"]
+
+
+def test_is_json():
+    assert is_json(None) and is_json("application/json; charset=utf-8") and is_json("application/vnd.api+json")
+    assert not is_json("text/plain") and not is_json("multipart/form-data")
@@ -0,0 +1,249 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import app as server
+from scheduler import BatchScheduler, Capacity, Overloaded
+from utils.config import LLMConfig
+from utils.latency import LatencyDistribution, LatencyProfile
+
+OPENAI_REQUEST = {"messages": [{"role": "user", "content": "Hello!"}], "model": "gpt-4", "max_tokens": 42}
+ANTHROPIC_REQUEST = {
+    "messages": [{"role": "user", "content": "Hello!"}], "model": "claude-3-5-sonnet-20241022", "max_tokens": 42
+}
+
+
+def test_capacity_resolves_model_then_wildcard():
+    config = LLMConfig(api_key="sk-key", model="gpt-4", capacity={"*": {"slots": 8}, "gpt-4": {"slots": 2}})
+    assert config.capacity_profile() == Capacity(slots=2)
+    assert config.model_copy(update={"model": "gpt-4o"}).capacity_profile() == Capacity(slots=8)
+    assert LLMConfig(api_key="sk-key", model="gpt-4").capacity_profile().slots is None
+
+
+def test_slots_are_handed_over_in_order():
+    scheduler = BatchScheduler(Capacity(slots=1, max_queue=2))
+    served = []
+
+    async def request(name):
+        await scheduler.acquire()
+        served.append(name)
+        await asyncio.sleep(0.01)
+        scheduler.release()
+
+    async def main():
+        await asyncio.gather(*(request(name) for name in "abc"))
+
+    asyncio.run(main())
+    assert served == ["a", "b", "c"]
+    assert (scheduler.active, scheduler.queued) == (0, 0)
+
+
+def test_full_queue_is_rejected():
+    scheduler = BatchScheduler(Capacity(slots=1, max_queue=1))
+
+    async def main():
+        await scheduler.acquire()
+        waiting = asyncio.ensure_future(scheduler.acquire())
+        await asyncio.sleep(0)
+        assert scheduler.queued == 1
+        with pytest.raises(Overloaded):
+            await scheduler.acquire()
+        scheduler.release()
+        await waiting
+        assert (scheduler.active, scheduler.queued) == (1, 0)
+
+    asyncio.run(main())
+
+
+def test_queue_timeout_and_cancellation_free_the_queue():
+    scheduler = BatchScheduler(Capacity(slots=1, max_queue=2, queue_timeout=0.01))
+
+    async def main():
+        await scheduler.acquire()
+        with pytest.raises(Overloaded):
+            await scheduler.acquire()
+        cancelled = asyncio.ensure_future(scheduler.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        assert scheduler.queued == 0
+        scheduler.release()
+        assert scheduler.active == 0
+
+    asyncio.run(main())
+
+
+def test_batches_are_admitted_atomically():
+    scheduler = BatchScheduler(Capacity(slots=2, max_queue=3))
+    order = []
+
+    async def bulk(name, count):
+        await scheduler.acquire(count)
+        order.append(name)
+        await asyncio.sleep(0.01)
+        scheduler.release(count)
+
+    async def main():
+        with pytest.raises(Overloaded):
+            await scheduler.acquire(3)
+        assert scheduler.active == 0
+        await asyncio.wait_for(asyncio.gather(bulk("a", 2), bulk("b", 2), bulk("c", 1)), 1)
+
+    asyncio.run(main())
+    assert order == ["a", "b", "c"]
+    assert (scheduler.active, scheduler.queued) == (0, 0)
+
+
+def test_cancelled_batch_unblocks_the_queue():
+    scheduler = BatchScheduler(Capacity(slots=2, max_queue=3))
+
+    async def main():
+        await scheduler.acquire()
+        large = asyncio.ensure_future(scheduler.acquire(2))
+        small = asyncio.ensure_future(scheduler.acquire(1))
+        await asyncio.sleep(0)
+        assert scheduler.queued == 3
+        large.cancel()
+        await asyncio.sleep(0)
+        await asyncio.wait_for(small, 1)
+        assert (scheduler.active, scheduler.queued) == (2, 0)
+
+    asyncio.run(main())
+
+
+def test_decoding_slows_down_with_the_batch(monkeypatch):
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    scheduler = BatchScheduler(Capacity(batch_slowdown=0.5))
+    scheduler.active = 3
+    assert scheduler.slowdown() == 2.0
+
+    asyncio.run(scheduler.run(0.1, 0.2))
+    assert delays[0] == 0.1
+    assert sum(delays[1:]) == pytest.approx(0.4)
+    assert max(delays[1:]) <= 0.05
+
+
+async def post_concurrently(url, body, count):
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*(client.post(url, json=body) for _ in range(count)))
+
+
+@pytest.mark.parametrize(
+    "provider,url,body,error_type",
+    [
+        ("openai", "/chat/completions", OPENAI_REQUEST, "server_error"),
+        ("anthropic", "/claude/completions", ANTHROPIC_REQUEST, "overloaded_error"),
+    ]
+)
+def test_endpoint_rejects_when_overloaded(monkeypatch, provider, url, body, error_type):
+    client = server.registry.get(provider, body["model"])
+    monkeypatch.setattr(client, "scheduler", BatchScheduler(Capacity(slots=1, max_queue=1)))
+    monkeypatch.setattr(client, "latency", LatencyProfile(time_to_first_token=LatencyDistribution(value=0.05)))
+
+    responses = asyncio.run(post_concurrently(url, body, 3))
+    assert sorted(response.status_code for response in responses) == [200, 200, 529]
+    rejected = next(response for response in responses if response.status_code == 529)
+    assert error_type in rejected.text
+    assert client.scheduler.active == 0
+
+
+def test_streams_hold_their_slot_until_done(monkeypatch):
+    client = server.registry.get("openai", "gpt-4")
+    monkeypatch.setattr(client, "scheduler", BatchScheduler(Capacity(slots=1)))
+    monkeypatch.setattr(client, "latency", LatencyProfile(time_per_token=LatencyDistribution(value=0.01)))
+
+    responses = asyncio.run(post_concurrently("/chat/completions", {**OPENAI_REQUEST, "stream": True}, 2))
+    assert sorted(response.status_code for response in responses) == [200, 529]
+    assert "[DONE]" in next(response for response in responses if response.status_code == 200).text
+    assert client.scheduler.active == 0
+
+
+def test_queue_wait_is_observed(monkeypatch):
+    client = server.registry.get("openai", "gpt-4")
+    monkeypatch.setattr(client, "scheduler", BatchScheduler(Capacity(slots=1, max_queue=4)))
+    monkeypatch.setattr(client, "latency", LatencyProfile(time_to_first_token=LatencyDistribution(value=0.02)))
+    waited = server.metrics.queue_wait.labels("/chat/completions", "gpt-4")
+    before = waited.sum
+
+    responses = asyncio.run(post_concurrently("/chat/completions", OPENAI_REQUEST, 3))
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert waited.sum - before >= 0.02 + 0.04 - 0.01
+    assert server.metrics.queue_depth.labels("/chat/completions", "gpt-4").value == 0
+
+
+@pytest.mark.parametrize("slots", [1, 2])
+def test_bulk_requests_run_in_waves(monkeypatch, slots):
+    client = server.registry.get("openai", "gpt-4")
+    monkeypatch.setattr(client, "scheduler", BatchScheduler(Capacity(slots=slots)))
+
+    async def main():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.wait_for(http.post("/chat/completions/bulk", json=[OPENAI_REQUEST] * 3), 5)
+
+    response = asyncio.run(main())
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    assert client.scheduler.active == 0
+
+
+def test_stream_closed_before_the_first_chunk_releases_its_slot(monkeypatch):
+    client = server.registry.get("openai", "gpt-4")
+    monkeypatch.setattr(client, "scheduler", BatchScheduler(Capacity(slots=1)))
+    monkeypatch.setattr(client, "latency", LatencyProfile(time_to_first_token=LatencyDistribution(value=1.0)))
+    in_flight = server.metrics.in_flight.labels("/chat/completions", "gpt-4")
+    before = in_flight.value
+    scope = {
+        "type": "http", "method": "POST", "path": "/chat/completions", "raw_path": b"/chat/completions",
+        "query_string": b"", "headers": [(b"content-type", b"application/json")], "root_path": "",
+        "scheme": "http", "server": ("test", 80), "client": ("test", 1234), "http_version": "1.1",
+    }
+    body = json.dumps({**OPENAI_REQUEST, "stream": True}).encode()
+    sent = []
+
+    async def main():
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message["type"])
+
+        await server.app(scope, receive, send)
+
+    asyncio.run(main())
+    assert "http.response.start" in sent
+    assert client.scheduler.active == 0
+    assert in_flight.value == before
+
+
+def test_overloaded_bulk_group_cancels_the_others(monkeypatch):
+    busy = server.registry.get("openai", "gpt-4")
+    slow = server.registry.get("openai", "gpt-4o")
+    monkeypatch.setattr(busy, "scheduler", BatchScheduler(Capacity(slots=1)))
+    monkeypatch.setattr(slow, "scheduler", BatchScheduler(Capacity(slots=4)))
+    monkeypatch.setattr(slow, "latency", LatencyProfile(time_to_first_token=LatencyDistribution(value=5.0)))
+    busy.scheduler.active = 1
+    in_flight = server.metrics.in_flight.labels("/chat/completions/bulk", "gpt-4o")
+    before = in_flight.value
+
+    async def main():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            body = [{**OPENAI_REQUEST, "model": "gpt-4o"}, OPENAI_REQUEST]
+            return await asyncio.wait_for(http.post("/chat/completions/bulk", json=body), 1)
+
+    assert asyncio.run(main()).status_code == 529
+    assert slow.scheduler.active == 0
+    assert in_flight.value == before
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import app as server
+import sdk.client
+from models.anthropic import AnthropicResponse
+from models.openai import OpenAIChunk, OpenAIRequest, OpenAIResponse
+from sdk import APIStatusError, AsyncClient, Client, RetryPolicy
+from sdk.client import retry_after
+
+OPENAI_REQUEST = {"messages": [{"role": "user", "content": "Hello!"}], "model": "gpt-4", "max_tokens": 3}
+ANTHROPIC_REQUEST = {
+    "messages": [{"role": "user", "content": "Hello!"}], "model": "claude-3-5-sonnet-20241022", "max_tokens": 3
+}
+
+
+def asgi_client(provider: str) -> AsyncClient:
+    return AsyncClient("http://mock", "sk-key", provider, transport=httpx.ASGITransport(app=server.app))
+
+
+@pytest.mark.parametrize(
+    "provider,request_body,response_type",
+    [
+        ("openai", OpenAIRequest.model_validate(OPENAI_REQUEST), OpenAIResponse),
+        ("anthropic", ANTHROPIC_REQUEST, AnthropicResponse),
+    ]
+)
+def test_async_create_and_stream(provider, request_body, response_type):
+    async def run():
+        async with asgi_client(provider) as client:
+            response = await client.create(request_body)
+            chunks = [chunk async for chunk in client.stream(request_body)]
+        return response, chunks
+
+    response, chunks = asyncio.run(run())
+    assert isinstance(response, response_type)
+    assert len(chunks) > 3
+    if provider == "openai":
+        assert all(isinstance(chunk, OpenAIChunk) for chunk in chunks)
+        assert chunks[-1].usage.completion_tokens == 3
+    else:
+        assert [chunks[0].type, chunks[-1].type] == ["message_start", "message_stop"]
+
+
+@pytest.mark.parametrize(
+    "headers,expected",
+    [({"retry-after": "2"}, 2.0), ({"retry-after-ms": "250", "retry-after": "2"}, 0.25), ({}, None),
+     ({"retry-after": "soon"}, None)]
+)
+def test_retry_after(headers, expected):
+    assert retry_after(httpx.Headers(headers)) == expected
+
+
+def test_sync_client_retries_honoring_retry_after(monkeypatch):
+    delays, calls = [], []
+    monkeypatch.setattr(sdk.client, "sleep", delays.append)
+    response = OpenAIResponse(
+        id="1", choices=[{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Hi"}}],
+        created=0, model="gpt-4", object="chat.completion",
+        usage={"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content))
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"retry-after": "3"}, json={"error": {"type": "requests"}})
+        if len(calls) == 2:
+            return httpx.Response(503, json={"error": {"type": "server_error"}})
+        return httpx.Response(200, content=response.model_dump_json())
+
+    with Client("http://mock", "sk-key", transport=httpx.MockTransport(handler), seed=1) as client:
+        assert client.create(OPENAI_REQUEST) == response
+    assert len(calls) == 3 and calls[0]["stream"] is False
+    assert delays[0] == 3.0
+    assert 0 <= delays[1] <= 1.0
+
+
+def test_sync_client_gives_up(monkeypatch):
+    monkeypatch.setattr(sdk.client, "sleep", lambda delay: None)
+    transport = httpx.MockTransport(lambda request: httpx.Response(529, json={"type": "error"}))
+    with Client("http://mock", provider="anthropic", transport=transport, retry=RetryPolicy(max_retries=2)) as client:
+        with pytest.raises(APIStatusError) as error:
+            client.create(ANTHROPIC_REQUEST)
+    assert error.value.status_code == 529
+    assert error.value.body == {"type": "error"}
+
+
+def test_async_client_bounds_concurrency():
+    in_flight, peak = 0, 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(400, json={"error": {"type": "invalid_request_error"}})
+
+    async def run():
+        async with AsyncClient("http://mock", transport=httpx.MockTransport(handler), max_concurrency=2) as client:
+            return await asyncio.gather(*(client.create(OPENAI_REQUEST) for _ in range(6)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, APIStatusError) and result.status_code == 400 for result in results)
+    assert peak == 2
@@ -0,0 +1,61 @@
+import os
+
+from launcher import respawn_delay
+from utils.metrics import ServerMetrics
+from utils.shared import SharedCounters
+
+
+def test_counters_sum_across_workers():
+    counters = SharedCounters(workers=2, slots=8)
+    counters.add(counters.slot("requests\t[]"), 2)
+    counters.bind(1)
+    counters.add(counters.slot("requests\t[]"), 3)
+    counters.add(counters.slot("errors\t[]"), 1)
+    assert counters.total("requests\t[]") == 5
+    assert counters.totals("requests") == {"[]": 5}
+
+
+def test_metrics_are_shared_with_forked_workers():
+    counters = SharedCounters(workers=3)
+    metrics = ServerMetrics(shared=counters)
+    for worker in (1, 2):
+        pid = os.fork()
+        if pid == 0:
+            counters.bind(worker)
+            observed = metrics.route("/chat/completions", "gpt-4")
+            observed.finish(observed.start(), 10 * worker, worker)
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+    observed = metrics.route("/chat/completions", "gpt-4")
+    assert observed.requests.value == 2
+    assert observed.input_tokens.value == 30
+    assert observed.in_flight.value == 0
+    exposed = metrics.expose()
+    assert 'llm_output_tokens_total{route="/chat/completions",model="gpt-4"} 3.0' in exposed
+    assert 'llm_request_duration_seconds_count{route="/chat/completions",model="gpt-4"} 2' in exposed
+
+
+def test_dead_worker_gauges_are_reset():
+    counters = SharedCounters(workers=2)
+    metrics = ServerMetrics(shared=counters)
+    pid = os.fork()
+    if pid == 0:
+        counters.bind(1)
+        observed = metrics.route("/chat/completions", "gpt-4")
+        observed.finish(observed.start())
+        observed.start()
+        os._exit(1)
+    os.waitpid(pid, 0)
+
+    observed = metrics.route("/chat/completions", "gpt-4")
+    assert observed.in_flight.value == 1
+    metrics.reset_gauges(1)
+    assert observed.in_flight.value == 0
+    assert observed.requests.value == 1
+
+
+def test_respawn_backs_off_exponentially():
+    assert respawn_delay(0) == 0.0
+    assert [respawn_delay(failures) for failures in (1, 2, 3)] == [0.5, 1.0, 2.0]
+    assert respawn_delay(100) == 30.0
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+import app as server
+import models.openai
+from models.base import build_models, deferred_models
+
+
+def imported_modules(code: str) -> set:
+    output = subprocess.check_output([sys.executable, "-c", f"import sys; {code}; print(' '.join(sys.modules))"])
+    return set(output.decode().split())
+
+
+def test_packages_import_their_modules_on_first_use():
+    modules = imported_modules("from models.openai import OpenAIRequest")
+    assert "models.openai.request" in modules
+    assert "models.openai.realtime" not in modules and "models.openai.batch" not in modules
+
+    modules = imported_modules("import clients, cassette")
+    assert "clients.realtime" not in modules and "cassette.recorder" not in modules and "httpx" not in modules
+
+
+def test_lazy_exports_behave_like_attributes():
+    assert models.openai.OpenAIRequest is models.openai.request.OpenAIRequest
+    assert "REALTIME_MODELS" in dir(models.openai)
+    assert {"OpenAIRequest", "RealtimeItem"} <= set(models.openai.__all__)
+
+
+def test_warmup_builds_models_and_openapi(monkeypatch):
+    monkeypatch.setattr(server.settings, "warmup", True)
+    monkeypatch.setattr(server.app, "openapi_schema", None)
+    with TestClient(server.app):
+        assert server.app.openapi_schema is not None
+    assert all(model.__pydantic_complete__ for model in deferred_models())
+    assert build_models() == 0
@@ -0,0 +1,137 @@
+from random import Random
+
+import pytest
+
+from clients import OpenAIMockClient
+from models.openai import OpenAIRequest, OpenAIMessage
+from tokenization import (
+    BPETokenizer, ReversibleTokenizer, WhitespaceTokenizer, get_tokenizer, save_ranks, train_ranks
+)
+from tokenization.whitespace import CHUNK_SIZE
+from utils.config import LLMConfig
+
+LOG_LEVEL = 10
+CORPUS = [
+    "The quick brown fox jumps over the lazy dog.",
+    "The lazy dog sleeps while the quick fox runs_away, 123 times!",
+] * 10
+
+
+@pytest.fixture(scope="module")
+def ranks():
+    return train_ranks(CORPUS, merges=50)
+
+
+@pytest.fixture(scope="module")
+def merges_file(ranks, tmp_path_factory):
+    path = tmp_path_factory.mktemp("bpe") / "merges.tiktoken"
+    save_ranks(ranks, str(path))
+    return str(path)
+
+
+@pytest.mark.parametrize("text", ["The quick brown fox.", "zebra über 42_000 ✨", "", "  spaced   out  "])
+def test_bpe_round_trip(ranks, text):
+    tokenizer = BPETokenizer(ranks)
+    tokens = tokenizer.encode(text)
+    assert tokenizer.decode(tokens) == text
+    assert tokenizer.count(text) == len(tokens)
+
+
+def test_bpe_merges_reduce_token_count(ranks):
+    tokenizer = BPETokenizer(ranks)
+    text = "the lazy dog"
+    assert tokenizer.count(text) < len(text.encode())
+    assert tokenizer.encode_batch([text, text]) == [tokenizer.encode(text)] * 2
+    assert tokenizer.encode_piece.cache_info().hits > 0
+
+
+def naive_merge(ranks, data):
+    parts = [data[i:i + 1] for i in range(len(data))]
+    while True:
+        pairs = [(ranks[a + b], i) for i, (a, b) in enumerate(zip(parts, parts[1:])) if a + b in ranks]
+        if not pairs:
+            return tuple(ranks[part] for part in parts)
+        _, i = min(pairs)
+        parts[i:i + 2] = [parts[i] + parts[i + 1]]
+
+
+def test_bpe_merges_by_rank(ranks):
+    tokenizer = BPETokenizer(ranks)
+    rng = Random(0)
+    alphabet = "the lazy dog quick fox 123 ü_!"
+    for _ in range(200):
+        piece = "".join(rng.choice(alphabet) for _ in range(rng.randint(2, 40)))
+        assert tokenizer._encode_piece(piece) == naive_merge(ranks, piece.encode())
+
+
+def test_bpe_long_runs_are_not_quadratic(ranks):
+    tokenizer = BPETokenizer(ranks, cache_size=0)
+    text = " " * 50_000 + "7" * 50_000
+    assert tokenizer.decode(tokenizer.encode(text)) == text
+    assert tokenizer.count(text) == len(tokenizer.encode(text))
+
+
+def test_bpe_requires_byte_tokens():
+    with pytest.raises(ValueError, match="single-byte tokens"):
+        BPETokenizer({b"a": 0})
+
+
+def test_bpe_truncate(ranks):
+    tokenizer = BPETokenizer(ranks)
+    truncated = tokenizer.truncate("The quick brown fox jumps", 3)
+    assert tokenizer.count(truncated) == 3
+    assert "The quick brown fox jumps".startswith(truncated)
+
+
+def test_whitespace_tokenizer():
+    tokenizer = WhitespaceTokenizer()
+    assert tokenizer.count_batch(["one two", " three "]) == [2, 1]
+    assert tokenizer.truncate("one  two three", 2) == "one two"
+    assert not isinstance(tokenizer, ReversibleTokenizer)
+    assert isinstance(BPETokenizer({bytes([byte]): byte for byte in range(256)}), ReversibleTokenizer)
+
+
+def test_get_tokenizer(merges_file):
+    assert get_tokenizer("bpe", merges_file) is get_tokenizer("bpe", merges_file)
+    with pytest.raises(ValueError, match="requires a merge table"):
+        get_tokenizer("bpe")
+    with pytest.raises(ValueError, match="Unknown tokenizer"):
+        get_tokenizer("sentencepiece")
+
+
+def test_client_usage_uses_tokenizer(merges_file):
+    config = LLMConfig(api_key="sk-key", model="gpt-4", tokenizer="bpe", tokenizer_path=merges_file)
+    client = OpenAIMockClient(config, LOG_LEVEL)
+    request = OpenAIRequest(messages=[OpenAIMessage(role="user", content="the lazy dog")], model="gpt-4", max_tokens=4)
+    response = client.get_response(request)
+
+    answer = response.choices[0].message.content
+    assert response.usage.completion_tokens == client.tokenizer.count(answer) == 4
+    assert response.usage.prompt_tokens == client.tokenizer.count("the lazy dog") + 6
+
+
+def test_whitespace_counts_long_texts_in_chunks():
+    text = "word " * 50000 + "  tail\twords\n" * 3
+    tokenizer = WhitespaceTokenizer()
+    assert len(text) > CHUNK_SIZE
+    assert tokenizer.count(text) == len(text.split())
+    assert len(list(tokenizer.count_chunks(text))) > 1
+    assert tokenizer.upper_bound(text) >= tokenizer.count(text)
+
+
+def test_count_within_stops_at_the_limit(ranks):
+    for tokenizer in (WhitespaceTokenizer(), BPETokenizer(ranks)):
+        total = tokenizer.count_within(CORPUS)
+        assert total == sum(tokenizer.count_batch(CORPUS))
+        assert tokenizer.upper_bound(" ".join(CORPUS)) >= tokenizer.count(" ".join(CORPUS))
+
+        limited = tokenizer.count_within(CORPUS, limit=30)
+        assert 30 < limited < total
+
+
+def test_context_window_resolves_model_then_wildcard_then_defaults():
+    assert LLMConfig(api_key="sk-key", model="gpt-4").context_window() == 8192
+    assert LLMConfig(api_key="sk-key", model="gpt-4", context_windows={"*": 100}).context_window() == 100
+    config = LLMConfig(api_key="sk-key", model="gpt-4", context_windows={"gpt-4": None, "*": 100})
+    assert config.context_window() is None
+    assert LLMConfig(api_key="sk-key", model="unknown").context_window() is None